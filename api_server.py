@@ -3,23 +3,64 @@
 Flask API server for Policy Navigator React frontend
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
+import atexit
+import csv
+import io
+import json
 import os
 from dotenv import load_dotenv
 from src.agents.policy_agent import PolicyNavigatorAgent
+from src.utils.config import get_config
+from src.utils.job_queue import JobQueue, QueueFullError
+from src.utils.multipart import read_file_upload
+from src.utils.single_flight import SingleFlight
+from src.utils.text import normalize_text
 
 load_dotenv()
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 app = Flask(__name__)
 CORS(app)
 
-# Initialize agent
+# Initialize agent; initial datasets load in the background
 agent = PolicyNavigatorAgent()
+atexit.register(agent.close)
+
+# Identical concurrent queries and status checks share one upstream call
+inflight = SingleFlight()
+
+def run_query(query):
+    """Run an agent query, joining an identical query already in flight"""
+    return inflight.do(('query', normalize_text(query)), lambda: agent.query(query))
+
+# Long agent queries run on a bounded worker pool instead of request threads
+jobs_config = get_config().get('jobs', {})
+def run_query_job(payload):
+    """Run a queued query; agent errors mark the job as failed"""
+    result = run_query(payload['query'])
+    if isinstance(result, dict) and result.get('error'):
+        raise Exception(result['error'])
+    return result
+
+job_queue = JobQueue(
+    run_query_job,
+    max_workers=jobs_config.get('max_workers', 4),
+    max_queue_size=jobs_config.get('max_queue_size', 100),
+    ttl_seconds=jobs_config.get('ttl_seconds', 3600)
+)
 
 @app.route('/api/query', methods=['POST'])
 def query_policies():
-    """Handle policy queries - let agent decide what to do"""
+    """Handle policy queries - let agent decide what to do
+    
+    Set ``"stream": true`` (or send ``Accept: text/event-stream``) to receive
+    retrieval hits, tool-call progress and answer text as server-sent events;
+    ``"stream": "ndjson"`` (or ``Accept: application/x-ndjson``) streams the
+    same events as newline-delimited JSON.
+    """
     try:
         data = request.get_json()
         query = data.get('query', '')
@@ -27,13 +68,66 @@ def query_policies():
         if not query:
             return jsonify({'error': 'Query is required'}), 400
         
+        stream_format = _stream_format(data.get('stream'))
+        if stream_format:
+            return _stream_events(agent.query_stream(query), stream_format)
+        
         # Let the agent intelligently decide what APIs/tools to use
-        result = agent.query(query)
+        result = run_query(query)
         return jsonify(result)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _stream_format(stream_option):
+    """Pick the streaming format from the request, or None for a plain JSON response"""
+    accept = request.headers.get('Accept', '')
+    if stream_option == 'ndjson' or 'application/x-ndjson' in accept:
+        return 'ndjson'
+    if stream_option or 'text/event-stream' in accept:
+        return 'sse'
+    return None
+
+def _stream_events(events, stream_format):
+    """Wrap an event generator in a streaming response"""
+    def generate():
+        for event in events:
+            if stream_format == 'sse':
+                yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+            else:
+                yield json.dumps(event, default=str) + "\n"
+    
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers=headers)
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a policy query to run in the background"""
+    try:
+        data = request.get_json()
+        query = data.get('query', '')
+        
+        if not query:
+            return jsonify({'error': 'Query is required'}), 400
+        
+        job = job_queue.submit({'query': query})
+        job['poll_url'] = f"/api/jobs/{job['id']}"
+        return jsonify(job), 202
+        
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '5'}
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status and result of a queued query"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify(job)
+
 @app.route('/api/status', methods=['POST'])
 def check_status():
     """Check policy status"""
@@ -44,12 +138,55 @@ def check_status():
         if not policy_id:
             return jsonify({'error': 'Policy ID is required'}), 400
         
-        result = agent.check_policy_status(policy_id)
+        result = inflight.do(
+            ('status', agent.policy_key(policy_id)),
+            lambda: agent.check_policy_status(policy_id)
+        )
         return jsonify(result)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/resolve', methods=['POST'])
+def resolve_policy():
+    """Resolve a policy ID to its canonical citation and the local documents citing it"""
+    try:
+        data = request.get_json() or {}
+        policy_id = data.get('policy_id', '')
+        
+        if not policy_id:
+            return jsonify({'error': 'Policy ID is required'}), 400
+        
+        resolution = agent.resolve_policy(policy_id)
+        if resolution is None:
+            return jsonify({'error': f'No citation or known policy name in {policy_id!r}'}), 404
+        return jsonify(resolution)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/related', methods=['POST'])
+def related_policies():
+    """Policies citing, amending or revoking a policy, walked through the local citation graph"""
+    try:
+        data = request.get_json() or {}
+        policy_id = data.get('policy_id', '')
+        
+        if not policy_id:
+            return jsonify({'error': 'Policy ID is required'}), 400
+        
+        try:
+            max_hops = min(max(int(data.get('max_hops', 1)), 1), 10)
+            related = agent.related_policies(policy_id, data.get('direction', 'in'), data.get('relations'), max_hops)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        if related is None:
+            return jsonify({'error': f'No citation or known policy name in {policy_id!r}'}), 404
+        return jsonify(related)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/compliance', methods=['POST'])
 def analyze_compliance():
     """Analyze compliance requirements"""
@@ -64,34 +201,75 @@ def analyze_compliance():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/compliance/batch', methods=['POST'])
+def analyze_compliance_batch():
+    """Analyze compliance requirements for many profiles, streamed as NDJSON"""
+    try:
+        if request.mimetype == 'text/csv':
+            profiles = list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+        else:
+            data = request.get_json() or {}
+            profiles = data.get('profiles', [])
+        
+        if not isinstance(profiles, list) or not profiles or not all(isinstance(p, dict) for p in profiles):
+            return jsonify({'error': 'A non-empty list of profiles is required'}), 400
+        
+        def generate():
+            for result in agent.analyze_compliance_batch(profiles):
+                yield json.dumps(result) + "\n"
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'Policy Navigator API'})
+    """Health check endpoint
+    
+    Liveness means the process is serving requests; readiness means the
+    initial datasets have finished loading. ``?check=ready`` answers 503
+    until the server is ready, for use as a readiness probe.
+    """
+    ready = agent.is_ready()
+    body = {
+        'status': 'healthy',
+        'service': 'Policy Navigator API',
+        'live': True,
+        'ready': ready,
+        'warmup': agent.warmup_status
+    }
+    
+    if request.args.get('check') == 'ready' and not ready:
+        return jsonify(body), 503
+    return jsonify(body)
 
 @app.route('/api/upload', methods=['POST'])
 def upload_document():
-    """Upload and index policy document"""
+    """Upload and index policy document (text, PDF or DOCX)
+    
+    The multipart body is streamed straight into text extraction; nothing
+    is written to disk and the size limit is enforced as bytes arrive.
+    """
     try:
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+        if request.content_length and request.content_length > agent.vector_store.parser.max_file_size:
+            return jsonify({'error': 'File too large'}), 413
         
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        # Save file temporarily
-        file_path = f"temp_{file.filename}"
-        file.save(file_path)
+        body = iter(lambda: request.stream.read(UPLOAD_CHUNK_SIZE), b'')
+        filename, chunks = read_file_upload(body, request.content_type)
         
-        # Index the document
-        result = agent.upload_document(file_path)
-        
-        # Clean up
-        os.remove(file_path)
+        if filename is None:
+            return jsonify({'error': 'No file provided'}), 400
+        if filename == '':
+            return jsonify({'error': 'No file selected'}), 400
         
+        result = agent.upload_stream(chunks, filename)
+        if result['status'] == 'rejected':
+            return jsonify(result), 413
         return jsonify(result)
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -121,9 +299,14 @@ def search_indexed():
         if not query:
             return jsonify({'error': 'Query is required'}), 400
         
-        results = agent.search_indexed_content(query)
-        return jsonify({'results': results})
+        limit = min(int(data.get('limit', 5)), 50)
+        page = agent.search_indexed_page(query, limit, data.get('cursor'), data.get('mode'))
+        if data.get('explain'):
+            page['plan'] = agent.vector_store.explain_query(query)['plan']
+        return jsonify(page)
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -132,11 +315,36 @@ def get_stats():
     """Get system statistics"""
     try:
         stats = agent.get_system_stats()
+        stats['jobs'] = job_queue.get_stats()
+        stats['single_flight'] = inflight.get_stats()
         return jsonify(stats)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/watch', methods=['GET', 'POST'])
+def watch_policy():
+    """Track a policy for amendments and repeals, or list tracked policies"""
+    try:
+        if request.method == 'GET':
+            return jsonify({'watched': agent.policy_watcher.get_watched(), 'stats': agent.policy_watcher.get_stats()})
+        
+        data = request.get_json() or {}
+        result = agent.watch_policy(data.get('policy_id'), data.get('document_number'))
+        status = {'error': 400, 'not_found': 404}.get(result['status'], 200)
+        return jsonify(result), status
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/watch/check', methods=['POST'])
+def check_watched_policies():
+    """Re-check tracked policies now; alerts go out for amendments and repeals"""
+    try:
+        return jsonify(agent.policy_watcher.check_all())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/send-alert', methods=['POST'])
 def send_alert():
     """Send policy alert to external tools"""
@@ -144,9 +352,15 @@ def send_alert():
         data = request.get_json()
         policy_info = data.get('policy_info', {})
         
+        # background=true returns at once and leaves delivery to the dispatcher
+        if data.get('background'):
+            return jsonify(agent.send_policy_alert(policy_info, background=True)), 202
+        
         result = agent.send_policy_alert(policy_info)
         return jsonify(result)
         
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '5'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
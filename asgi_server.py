@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+ASGI API server for Policy Navigator - async serving mode
+
+Exposes the same endpoints as api_server.py on Starlette, but handlers
+never block the event loop: Federal Register, CourtListener and URL
+fetches go through a shared aiohttp connection pool, aiXplain runs are
+started asynchronously and polled with asyncio sleeps, and local work
+(index lookups, cache reads, file parsing) runs in the default executor.
+One process can therefore hold thousands of slow upstream calls open at
+once.
+
+Run with:  uvicorn asgi_server:app --port 8000
+"""
+
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import os
+import aiohttp
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.concurrency import iterate_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+from src.agents.policy_agent import PolicyNavigatorAgent
+from src.tools.async_clients import AsyncPolicyStatusChecker, create_http_client
+from src.utils.asgi import iterate_from_thread, jsonify, mimetype, read_json
+from src.utils.config import get_config
+from src.utils.job_queue import JobQueue, QueueFullError
+from src.utils.multipart import read_file_upload
+from src.utils.single_flight import AsyncSingleFlight
+from src.utils.text import normalize_text
+
+load_dotenv()
+
+# Initialize agent; initial datasets load in the background
+agent = PolicyNavigatorAgent()
+
+# Identical concurrent queries and status checks share one upstream call
+inflight = AsyncSingleFlight()
+
+# Upstream HTTP clients are created on first use, inside the server's event loop
+server_config = get_config().get('async_server', {})
+http_client = None
+status_checker = None
+
+def get_http_client():
+    global http_client
+    if http_client is None:
+        http_client = create_http_client(
+            timeout=server_config.get('upstream_timeout', 30),
+            max_connections=server_config.get('max_connections', 1000)
+        )
+    return http_client
+
+def get_status_checker():
+    global status_checker
+    if status_checker is None:
+        status_checker = AsyncPolicyStatusChecker(get_http_client(), resolver=agent.resolve_policy)
+    return status_checker
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    if http_client is not None:
+        await http_client.close()
+    await run_blocking(agent.close)
+
+# Long agent queries run on a bounded worker pool, as in the threaded server
+jobs_config = get_config().get('jobs', {})
+server_loop = None  # the loop serving requests; set when a job is submitted
+
+def run_query_job(payload):
+    """Run a queued query on the server's loop, joining an identical /api/query
+    in flight; agent errors mark the job as failed"""
+    query = payload['query']
+    coalesced = inflight.do(('query', normalize_text(query)), lambda: agent.aquery(query))
+    result = asyncio.run_coroutine_threadsafe(coalesced, server_loop).result()
+    if isinstance(result, dict) and result.get('error'):
+        raise Exception(result['error'])
+    return result
+
+job_queue = JobQueue(
+    run_query_job,
+    max_workers=jobs_config.get('max_workers', 4),
+    max_queue_size=jobs_config.get('max_queue_size', 100),
+    ttl_seconds=jobs_config.get('ttl_seconds', 3600)
+)
+
+def run_blocking(fn, *args):
+    """Run a blocking call (local indexing, file parsing) in the default executor"""
+    return asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+async def query_policies(request):
+    """Handle policy queries - let agent decide what to do
+
+    Supports the same ``"stream"`` option and Accept headers as the
+    threaded server.
+    """
+    data = await read_json(request) or {}
+    query = data.get('query', '')
+
+    if not query:
+        return jsonify({'error': 'Query is required'}, 400)
+
+    stream_format = _stream_format(request, data.get('stream'))
+    if stream_format:
+        return _stream_events(agent.query_stream(query), stream_format)
+
+    try:
+        result = await inflight.do(('query', normalize_text(query)), lambda: agent.aquery(query))
+    except TimeoutError as e:
+        return jsonify({'error': str(e)}, 504)
+    return jsonify(result)
+
+def _stream_format(request, stream_option):
+    """Pick the streaming format from the request, or None for a plain JSON response"""
+    accept = request.headers.get('accept', '')
+    if stream_option == 'ndjson' or 'application/x-ndjson' in accept:
+        return 'ndjson'
+    if stream_option or 'text/event-stream' in accept:
+        return 'sse'
+    return None
+
+def _stream_events(events, stream_format):
+    """Wrap a blocking event generator in a streaming response"""
+    async def generate():
+        async for event in iterate_in_threadpool(events):
+            if stream_format == 'sse':
+                yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+            else:
+                yield json.dumps(event, default=str) + "\n"
+
+    media_type = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return StreamingResponse(generate(), headers=headers, media_type=media_type)
+
+async def submit_job(request):
+    """Queue a policy query to run in the background"""
+    data = await read_json(request) or {}
+    query = data.get('query', '')
+
+    if not query:
+        return jsonify({'error': 'Query is required'}, 400)
+
+    global server_loop
+    server_loop = asyncio.get_running_loop()
+    try:
+        job = job_queue.submit({'query': query})
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}, 429, {'Retry-After': '5'})
+
+    job['poll_url'] = f"/api/jobs/{job['id']}"
+    return jsonify(job, 202)
+
+async def get_job(request):
+    """Get the status and result of a queued query"""
+    job = job_queue.get(request.path_params['job_id'])
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}, 404)
+    return jsonify(job)
+
+async def check_status(request):
+    """Check policy status"""
+    data = await read_json(request) or {}
+    policy_id = data.get('policy_id', '')
+
+    if not policy_id:
+        return jsonify({'error': 'Policy ID is required'}, 400)
+
+    result = await inflight.do(
+        ('status', agent.policy_key(policy_id)),
+        lambda: get_status_checker().check_policy_status(policy_id)
+    )
+    return jsonify(result)
+
+async def resolve_policy(request):
+    """Resolve a policy ID to its canonical citation and the local documents citing it"""
+    data = await read_json(request) or {}
+    policy_id = data.get('policy_id', '')
+
+    if not policy_id:
+        return jsonify({'error': 'Policy ID is required'}, 400)
+
+    resolution = await run_blocking(agent.resolve_policy, policy_id)
+    if resolution is None:
+        return jsonify({'error': f'No citation or known policy name in {policy_id!r}'}, 404)
+    return jsonify(resolution)
+
+async def related_policies(request):
+    """Policies citing, amending or revoking a policy, walked through the local citation graph"""
+    data = await read_json(request) or {}
+    policy_id = data.get('policy_id', '')
+
+    if not policy_id:
+        return jsonify({'error': 'Policy ID is required'}, 400)
+
+    try:
+        max_hops = min(max(int(data.get('max_hops', 1)), 1), 10)
+        related = await run_blocking(agent.related_policies, policy_id, data.get('direction', 'in'),
+                                     data.get('relations'), max_hops)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}, 400)
+    if related is None:
+        return jsonify({'error': f'No citation or known policy name in {policy_id!r}'}, 404)
+    return jsonify(related)
+
+async def analyze_compliance(request):
+    """Analyze compliance requirements"""
+    data = await read_json(request) or {}
+    business_type = data.get('business_type', 'general')
+    size = data.get('size', 'small_business')
+
+    return jsonify(await run_blocking(agent.analyze_compliance, business_type, size))
+
+async def analyze_compliance_batch(request):
+    """Analyze compliance requirements for many profiles, streamed as NDJSON"""
+    if mimetype(request) == 'text/csv':
+        text = (await request.body()).decode('utf-8', errors='replace')
+        profiles = list(csv.DictReader(io.StringIO(text)))
+    else:
+        profiles = (await read_json(request) or {}).get('profiles', [])
+
+    if not isinstance(profiles, list) or not profiles or not all(isinstance(p, dict) for p in profiles):
+        return jsonify({'error': 'A non-empty list of profiles is required'}, 400)
+
+    async def generate():
+        async for result in iterate_in_threadpool(agent.analyze_compliance_batch(profiles)):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
+
+async def health_check(request):
+    """Health check endpoint, with the same readiness semantics as the threaded server"""
+    ready = agent.is_ready()
+    body = {
+        'status': 'healthy',
+        'service': 'Policy Navigator API',
+        'live': True,
+        'ready': ready,
+        'warmup': agent.warmup_status
+    }
+
+    if request.query_params.get('check') == 'ready' and not ready:
+        return jsonify(body, 503)
+    return jsonify(body)
+
+async def upload_document(request):
+    """Upload and index policy document (text, PDF or DOCX)
+
+    The body is streamed into text extraction on a worker thread, which
+    pulls chunks from the connection as it needs them.
+    """
+    content_length = request.headers.get('content-length', '')
+    if content_length.isdigit() and int(content_length) > agent.vector_store.parser.max_file_size:
+        return jsonify({'error': 'File too large'}, 413)
+
+    loop = asyncio.get_running_loop()
+
+    def extract_and_index():
+        filename, chunks = read_file_upload(iterate_from_thread(request.stream(), loop),
+                                            request.headers.get('content-type', ''))
+        if filename is None:
+            return jsonify({'error': 'No file provided'}, 400)
+        if filename == '':
+            return jsonify({'error': 'No file selected'}, 400)
+
+        result = agent.upload_stream(chunks, filename)
+        return jsonify(result, 413 if result['status'] == 'rejected' else 200)
+
+    try:
+        return await run_blocking(extract_and_index)
+    except ValueError as e:
+        return jsonify({'error': str(e)}, 400)
+
+async def index_url(request):
+    """Index content from URL"""
+    data = await read_json(request) or {}
+    url = data.get('url', '')
+
+    if not url:
+        return jsonify({'error': 'URL is required'}, 400)
+
+    if url in agent.vector_store.indexed_urls:
+        return jsonify({"status": "already_indexed", "url": url})
+
+    try:
+        async with get_http_client().get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            html, headers = await response.read(), response.headers
+    except Exception as e:
+        return jsonify({"status": "error", "url": url, "error": str(e)})
+
+    return jsonify(await run_blocking(agent.vector_store.index_html, url, html, headers))
+
+async def search_indexed(request):
+    """Search indexed documents"""
+    data = await read_json(request) or {}
+    query = data.get('query', '')
+
+    if not query:
+        return jsonify({'error': 'Query is required'}, 400)
+
+    try:
+        limit = min(int(data.get('limit', 5)), 50)
+        page = await run_blocking(agent.search_indexed_page, query, limit, data.get('cursor'),
+                                 data.get('mode'))
+        if data.get('explain'):
+            page['plan'] = (await run_blocking(agent.vector_store.explain_query, query))['plan']
+    except ValueError as e:
+        return jsonify({'error': str(e)}, 400)
+    return jsonify(page)
+
+async def get_stats(request):
+    """Get system statistics"""
+    stats = await run_blocking(agent.get_system_stats)
+    stats['jobs'] = job_queue.get_stats()
+    stats['single_flight'] = inflight.get_stats()
+    return jsonify(stats)
+
+async def watch_policy(request):
+    """Track a policy for amendments and repeals, or list tracked policies"""
+    if request.method == 'GET':
+        watcher = await run_blocking(lambda: agent.policy_watcher)
+        return jsonify({'watched': watcher.get_watched(), 'stats': watcher.get_stats()})
+
+    data = await read_json(request) or {}
+    result = await run_blocking(agent.watch_policy, data.get('policy_id'), data.get('document_number'))
+    return jsonify(result, {'error': 400, 'not_found': 404}.get(result['status'], 200))
+
+async def check_watched_policies(request):
+    """Re-check tracked policies now; alerts go out for amendments and repeals"""
+    return jsonify(await run_blocking(lambda: agent.policy_watcher.check_all()))
+
+async def send_alert(request):
+    """Send policy alert to external tools"""
+    data = await read_json(request) or {}
+    policy_info = data.get('policy_info', {})
+
+    if data.get('background'):
+        try:
+            return jsonify(agent.send_policy_alert(policy_info, background=True), 202)
+        except QueueFullError as e:
+            return jsonify({'error': str(e)}, 429, {'Retry-After': '5'})
+
+    # Slack alerts are only queued here; the outbox delivers them in the background
+    return jsonify(await run_blocking(agent.send_policy_alert, policy_info))
+
+async def http_error(request, exc):
+    return jsonify({'error': exc.detail}, exc.status_code, exc.headers)
+
+async def server_error(request, exc):
+    return jsonify({'error': str(exc)}, 500)
+
+app = Starlette(
+    routes=[
+        Route('/api/query', query_policies, methods=['POST']),
+        Route('/api/jobs', submit_job, methods=['POST']),
+        Route('/api/jobs/{job_id}', get_job, methods=['GET']),
+        Route('/api/status', check_status, methods=['POST']),
+        Route('/api/resolve', resolve_policy, methods=['POST']),
+        Route('/api/related', related_policies, methods=['POST']),
+        Route('/api/compliance', analyze_compliance, methods=['POST']),
+        Route('/api/compliance/batch', analyze_compliance_batch, methods=['POST']),
+        Route('/api/health', health_check, methods=['GET']),
+        Route('/api/upload', upload_document, methods=['POST']),
+        Route('/api/index-url', index_url, methods=['POST']),
+        Route('/api/search-indexed', search_indexed, methods=['POST']),
+        Route('/api/stats', get_stats, methods=['GET']),
+        Route('/api/watch', watch_policy, methods=['GET', 'POST']),
+        Route('/api/watch/check', check_watched_policies, methods=['POST']),
+        Route('/api/send-alert', send_alert, methods=['POST']),
+    ],
+    # Permissive CORS, like flask_cors' defaults in the threaded server
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    exception_handlers={HTTPException: http_error, Exception: server_error},
+    lifespan=lifespan
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    port = int(os.environ.get('PORT', 8000))
+    uvicorn.run(app, host='0.0.0.0', port=port, backlog=server_config.get('backlog', 4096))
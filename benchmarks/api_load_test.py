@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+End-to-end API load test against local stand-ins for every upstream
+
+Starts one local server standing in for the Federal Register, CourtListener
+and the aiXplain agent, each with its own latency distribution (log-normal
+around a median) and error rate, writes a temporary config pointing the
+tool clients at it, and runs the API server in a subprocess under that
+config with its remote agent replaced by a client of the aiXplain
+stand-in. The government websites indexed at startup are also served by
+the stand-in, and load starts once the server reports ready, so the
+indexed corpus is the same on every run. A closed-loop load generator then keeps ``--concurrency``
+requests in flight across a weighted mix of endpoints and reports, per
+endpoint, p50/p95/p99 latency, throughput and error rate. A fixed seed
+makes the upstream behaviour and request mix reproducible.
+
+    python benchmarks/api_load_test.py --concurrency 50 --duration 30 \\
+        --upstream federal_register=latency:0.3,jitter:0.5,error_rate:0.05 --mix status=3,search=2,query=1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import aiohttp
+import requests
+import uvicorn
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from serving_load_test import free_port, wait_for
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse
+from starlette.routing import Route
+from src.utils.asgi import jsonify, read_json
+
+# Default behaviour of each stand-in: median latency (s), log-normal spread, error rate and status
+UPSTREAMS = {
+    "federal_register": {"latency": 0.2, "jitter": 0.3, "error_rate": 0.0, "error_status": 503},
+    "court_listener": {"latency": 0.3, "jitter": 0.3, "error_rate": 0.0, "error_status": 503},
+    "aixplain": {"latency": 1.5, "jitter": 0.4, "error_rate": 0.0, "error_status": 500},
+}
+
+# Pages indexed at startup in place of the live government websites: path -> (title, text)
+SITES = {
+    "federal-register": ("Federal Register", "Rules and notices on digital assets, emissions reporting and "
+                                             "workplace safety published by federal agencies."),
+    "epa-regulations": ("EPA Laws and Regulations", "Greenhouse gas emissions reporting, clean air permits and "
+                                                    "small business compliance assistance."),
+    "cdc-policy": ("CDC Policy", "Public health policy on HIPAA disclosures, vaccination and workplace safety."),
+}
+
+# Endpoint name -> (method, path, request body for the n-th request)
+TOPICS = ["GDPR small business", "Executive Order 14067", "emissions reporting", "Section 230 liability",
+          "overtime pay", "HIPAA disclosures", "digital assets", "workplace safety"]
+ENDPOINTS = {
+    "query": ("POST", "/api/query", lambda n: {"query": f"What does {TOPICS[n % len(TOPICS)]} require? ({n})"}),
+    "status": ("POST", "/api/status", lambda n: {"policy_id": f"EO {13000 + n}"}),
+    "search": ("POST", "/api/search-indexed", lambda n: {"query": TOPICS[n % len(TOPICS)], "limit": 5}),
+    "compliance": ("POST", "/api/compliance", lambda n: {"business_type": ["technology", "healthcare", "retail"][n % 3],
+                                                         "size": "small_business"}),
+    "resolve": ("POST", "/api/resolve", lambda n: {"policy_id": ["GDPR", "E.O. 14067", "HIPAA"][n % 3]}),
+    "stats": ("GET", "/api/stats", None),
+    "health": ("GET", "/api/health", None),
+}
+DEFAULT_MIX = {"status": 3, "search": 3, "query": 1, "compliance": 1, "resolve": 1, "health": 1}
+
+SERVERS = {
+    "flask": "import api_server, sys\n"
+             "from api_load_test import StandInAgent\n"
+             "api_server.agent.agent = StandInAgent(sys.argv[2])\n"
+             "api_server.app.run(port=int(sys.argv[1]), threaded=True)",
+    "asgi": "import asgi_server, sys, uvicorn\n"
+            "from api_load_test import StandInAgent\n"
+            "asgi_server.agent.agent = StandInAgent(sys.argv[2])\n"
+            "uvicorn.run(asgi_server.app, port=int(sys.argv[1]), log_level='warning', backlog=4096)",
+}
+
+class StandInAgent:
+    """Takes the place of the remote aiXplain agent, answering through the stand-in server"""
+
+    def __init__(self, url: str, timeout: float = 60.0):
+        self.id = "stand-in"
+        self.url = url
+        self.timeout = timeout
+
+    def run(self, prompt: str, **kwargs):
+        response = requests.post(self.url, json={"query": prompt}, timeout=self.timeout)
+        response.raise_for_status()
+        return {"data": response.json()}
+
+class StandIns:
+    """Latency and failures for each upstream, drawn from one seeded generator"""
+
+    def __init__(self, profiles: dict, seed: int = 7):
+        self.profiles = profiles
+        self.rng = random.Random(seed)
+        self.counts = {name: {"requests": 0, "errors": 0} for name in profiles}
+
+    def draw(self, name: str):
+        """(delay in seconds, error status or None) for the next call to an upstream"""
+        profile = self.profiles[name]
+        delay = profile["latency"] * math.exp(profile["jitter"] * self.rng.gauss(0, 1))
+        failed = self.rng.random() < profile["error_rate"]
+        self.counts[name]["requests"] += 1
+        self.counts[name]["errors"] += failed
+        return delay, profile["error_status"] if failed else None
+
+    async def respond(self, name: str, body: dict):
+        delay, error_status = self.draw(name)
+        await asyncio.sleep(delay)
+        if error_status:
+            return jsonify({"error": f"{name} stand-in failure"}, error_status)
+        return jsonify(body)
+
+def federal_document(number: str, term: str = "") -> dict:
+    return {
+        "document_number": number,
+        "title": f"Notice on {term or number}",
+        "type": "Rule",
+        "abstract": f"Agency action concerning {term or number}.",
+        "publication_date": "2024-01-15",
+        "html_url": f"https://example.gov/documents/{number}"
+    }
+
+def start_standins(standins: StandIns) -> int:
+    """Serve every stand-in from a background thread; returns its port"""
+    async def federal_search(request):
+        term = request.query_params.get("conditions[term]", "")
+        return await standins.respond("federal_register", {"results": [federal_document("2024-00001", term)]})
+
+    async def federal_documents(request):
+        numbers = request.path_params["numbers"].split(",")
+        if len(numbers) == 1:
+            return await standins.respond("federal_register", federal_document(numbers[0]))
+        return await standins.respond("federal_register", {"results": [federal_document(n) for n in numbers]})
+
+    async def opinions(request):
+        return await standins.respond("court_listener", {"results": [{
+            "caseName": f"Doe v. Agency ({request.query_params.get('q', '')})",
+            "court": "Supreme Court", "dateFiled": "2023-06-30", "absolute_url": "/opinion/1/doe-v-agency/"
+        }]})
+
+    async def agent_run(request):
+        query = (await read_json(request) or {}).get("query", "")
+        return await standins.respond("aixplain", {"output": f"Stand-in answer to: {query[:80]}",
+                                                   "intermediate_steps": []})
+
+    async def site(request):
+        page = SITES.get(request.path_params["page"])
+        if page is None:
+            return HTMLResponse("Not found", 404)
+        title, text = page
+        return HTMLResponse(f"<html><head><title>{title}</title></head><body><p>{text}</p></body></html>")
+
+    async def health(request):
+        return jsonify({"status": "ok"})
+
+    app = Starlette(routes=[
+        Route("/federal/documents.json", federal_search),
+        Route("/federal/documents/{numbers}.json", federal_documents),
+        Route("/courts/search/", opinions),
+        Route("/aixplain/run", agent_run, methods=["POST"]),
+        Route("/sites/{page}", site),
+        Route("/health", health),
+    ])
+
+    port = free_port()
+    config = uvicorn.Config(app, port=port, log_level="warning", backlog=8192)
+    threading.Thread(target=uvicorn.Server(config).run, daemon=True).start()
+    wait_for(f"http://127.0.0.1:{port}/health")
+    return port
+
+def write_config(upstream_port: int) -> str:
+    """Copy config/config.yaml with data sources at the stand-ins and state files in a temp directory"""
+    with open(os.path.join(ROOT, "config", "config.yaml")) as f:
+        config = yaml.safe_load(f)
+
+    base = f"http://127.0.0.1:{upstream_port}"
+    config["data_sources"]["federal_register"]["base_url"] = f"{base}/federal"
+    config["data_sources"]["court_listener"]["base_url"] = f"{base}/courts"
+    config["data_sources"]["government_websites"] = [f"{base}/sites/{page}" for page in SITES]
+    # Cached answers and background refreshes would hide the latency under test
+    config["answer_cache"]["enabled"] = False
+    config["reindex"]["enabled"] = False
+
+    directory = tempfile.mkdtemp()
+    for section in config.values():
+        if isinstance(section, dict):
+            for key, value in section.items():
+                if key.endswith("path") and isinstance(value, str) and value.startswith("data/"):
+                    section[key] = os.path.join(directory, os.path.basename(value))
+
+    path = os.path.join(directory, "config.yaml")
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f)
+    return path
+
+def parse_upstream(text: str):
+    """"federal_register=latency:0.3,error_rate:0.05" -> ("federal_register", {"latency": 0.3, ...})"""
+    name, _, settings = text.partition("=")
+    if name not in UPSTREAMS:
+        raise ValueError(f"Unknown upstream: {name}")
+    profile = {}
+    for setting in filter(None, settings.split(",")):
+        key, _, value = setting.partition(":")
+        if key not in UPSTREAMS[name]:
+            raise ValueError(f"Unknown upstream setting: {key}")
+        profile[key] = int(value) if key == "error_status" else float(value)
+    return name, profile
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in filter(None, text.split(",")):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def percentile(values: list, fraction: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)]
+
+async def generate_load(port: int, mix: dict, concurrency: int, duration: float = None, total: int = None,
+                        timeout: float = 60.0, seed: int = 7) -> tuple:
+    """Keep ``concurrency`` requests in flight until ``duration`` seconds pass or ``total`` are sent
+
+    Returns the samples (endpoint, latency in seconds, ok) and the wall time.
+    A request fails on a transport error, an HTTP error status or a JSON
+    body carrying an "error" (how the API reports a failed agent call).
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = []
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as client:
+        async def worker(index: int):
+            nonlocal sent
+            rng = random.Random(seed * 1000 + index)
+            while (total is None or sent < total) and (deadline is None or time.perf_counter() < deadline):
+                n = sent
+                sent += 1
+                name = rng.choices(names, weights)[0]
+                method, path, body = ENDPOINTS[name]
+                began = time.perf_counter()
+                try:
+                    async with client.request(method, f"http://127.0.0.1:{port}{path}",
+                                              json=body(n) if body else None) as response:
+                        payload = await response.read()
+                        ok = response.status < 400
+                        if ok and payload.startswith(b"{"):
+                            ok = "error" not in json.loads(payload)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    ok = False
+                samples.append((name, time.perf_counter() - began, ok))
+
+        await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+def summarize(samples: list, wall: float) -> dict:
+    """p50/p95/p99 latency (ms), throughput and error rate per endpoint and overall"""
+    def stats(rows):
+        latencies = [latency * 1000 for _, latency, _ in rows]
+        errors = sum(1 for _, _, ok in rows if not ok)
+        return {
+            "requests": len(rows),
+            "errors": errors,
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+            "throughput_rps": round(len(rows) / wall, 2) if wall else 0.0,
+            **{f"p{p}_ms": round(percentile(latencies, p / 100), 1) if latencies else None for p in (50, 95, 99)}
+        }
+
+    endpoints = {name: stats([row for row in samples if row[0] == name]) for name in sorted({s[0] for s in samples})}
+    return {"wall_s": round(wall, 2), "endpoints": endpoints, "overall": stats(samples)}
+
+def run(server: str, profiles: dict, mix: dict, concurrency: int, duration: float = None, total: int = None,
+        timeout: float = 60.0, seed: int = 7) -> dict:
+    """Start the stand-ins and the server, drive the load and return the report"""
+    standins = StandIns(profiles, seed)
+    upstream_port = start_standins(standins)
+    config_path = write_config(upstream_port)
+
+    port = free_port()
+    env = {**os.environ, "POLICY_NAVIGATOR_CONFIG": config_path,
+           "PYTHONPATH": os.pathsep.join([ROOT, os.path.dirname(os.path.abspath(__file__))])}
+    process = subprocess.Popen([sys.executable, "-c", SERVERS[server], str(port),
+                                f"http://127.0.0.1:{upstream_port}/aixplain/run"],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        # Load starts once warm-up has indexed the sample data and the stand-in sites
+        wait_for(f"http://127.0.0.1:{port}/api/health?check=ready")
+        samples, wall = asyncio.run(generate_load(port, mix, concurrency, duration, total, timeout, seed))
+    finally:
+        process.terminate()
+        process.wait()
+
+    report = summarize(samples, wall)
+    report.update({"server": server, "concurrency": concurrency, "seed": seed, "mix": mix,
+                   "upstreams": {name: {**profiles[name], **standins.counts[name]} for name in profiles}})
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=list(SERVERS), default="flask")
+    parser.add_argument("--concurrency", type=int, default=50, help="requests kept in flight")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load (ignored with --requests)")
+    parser.add_argument("--requests", type=int, help="stop after this many requests instead")
+    parser.add_argument("--mix", default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+                        help=f"endpoint weights, from: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--upstream", action="append", default=[],
+                        help="NAME=latency:S,jitter:SIGMA,error_rate:P,error_status:CODE (repeatable)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    profiles = {name: dict(profile) for name, profile in UPSTREAMS.items()}
+    for text in args.upstream:
+        name, profile = parse_upstream(text)
+        profiles[name].update(profile)
+
+    report = run(args.server, profiles, parse_mix(args.mix), args.concurrency,
+                 None if args.requests else args.duration, args.requests, args.timeout, args.seed)
+
+    print(f"{args.server} server, {args.concurrency} concurrent, {report['wall_s']}s\n")
+    print(f"{'endpoint':<12}{'requests':>9}{'errors':>8}{'err %':>7}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, row in [*report["endpoints"].items(), ("overall", report["overall"])]:
+        latencies = "".join(f"{row[key]:>9.1f}" if row[key] is not None else f"{'-':>9}"
+                            for key in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{name:<12}{row['requests']:>9}{row['errors']:>8}{row['error_rate'] * 100:>7.1f}"
+              f"{row['throughput_rps']:>8.1f}{latencies}")
+    print("\nupstream calls: " + ", ".join(f"{name} {counts['requests']} ({counts['errors']} failed)"
+                                          for name, counts in report["upstreams"].items()))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Performance suite: indexing, search, stats, CSV loading and memory at scale
+
+Builds a synthetic regulation corpus (benchmarks/synthetic_corpus.py) of
+each requested size and times bulk loading, single add_document calls,
+search_documents in lexical and hybrid mode, get_document_stats and
+load_csv_dataset, and records the memory the store holds. Each size runs
+in a fresh process so memory readings do not carry over. Results are
+written as JSON and checked against benchmarks/perf_thresholds.json (and,
+optionally, a previous results file), exiting non-zero on a regression.
+
+    python benchmarks/perf_suite.py --sizes 10000,100000 --baseline benchmarks/perf_baseline.json
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_corpus import generate_documents, queries, write_csv
+from src.data_processing.dataset_loader import DatasetLoader
+from src.data_processing.vector_store import VectorStoreManager
+
+THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_thresholds.json")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# Metrics where a larger value is better; every other metric is a cost
+HIGHER_IS_BETTER = ("_per_sec",)
+
+def rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def timings(function, repeats: int) -> list:
+    """Wall-clock seconds of each of ``repeats`` calls"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def run_size(size: int, seed: int = 13, batch: int = 1000, single_adds: int = 1000, search_repeats: int = 5,
+             csv_rows: int = 10000, modes=("lexical", "hybrid")) -> dict:
+    """Every metric for one corpus size, as a flat {name: value} dict"""
+    gc.collect()
+    baseline_rss = rss_bytes()
+    store = VectorStoreManager()
+
+    # Bulk load: documents are generated outside the timed add_documents calls
+    loading = 0.0
+    for start in range(0, size, batch):
+        documents = list(generate_documents(min(batch, size - start), seed, start))
+        began = time.perf_counter()
+        store.add_documents(documents)
+        loading += time.perf_counter() - began
+    gc.collect()
+    memory = rss_bytes() - baseline_rss
+
+    metrics = {
+        "documents": size,
+        "bulk_load_s": round(loading, 3),
+        "bulk_load_docs_per_sec": round(size / loading, 1) if loading else 0.0,
+        "memory_mb": round(memory / 2 ** 20, 1),
+        "memory_bytes_per_document": round(memory / size) if size else 0
+    }
+
+    extra = list(generate_documents(single_adds, seed, size))
+    adds = []
+    for document in extra:
+        began = time.perf_counter()
+        store.add_document(document["content"], document["metadata"])
+        adds.append(time.perf_counter() - began)
+    metrics["add_document_mean_us"] = round(statistics.mean(adds) * 1e6, 1)
+    metrics["add_document_p95_us"] = round(percentile(adds, 0.95) * 1e6, 1)
+
+    for mode in modes:
+        samples = []
+        for query in queries(seed):
+            samples.extend(timings(lambda: store.search_documents(query, 10, mode=mode), search_repeats))
+        metrics[f"search_{mode}_p50_ms"] = round(percentile(samples, 0.5) * 1000, 3)
+        metrics[f"search_{mode}_p95_ms"] = round(percentile(samples, 0.95) * 1000, 3)
+
+    metrics["get_document_stats_ms"] = round(statistics.mean(timings(store.get_document_stats, 3)) * 1000, 3)
+    del store, extra
+    gc.collect()
+
+    # load_csv_dataset indexes into a fresh store; the CSV is capped so the
+    # largest sizes measure row throughput rather than minutes of iterrows
+    rows = min(size, csv_rows)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.csv")
+        write_csv(path, rows, seed)
+        loader = DatasetLoader(VectorStoreManager())
+        began = time.perf_counter()
+        result = loader.load_csv_dataset(path)
+        elapsed = time.perf_counter() - began
+    if result.get("status") != "loaded":
+        raise RuntimeError(f"load_csv_dataset failed: {result.get('error')}")
+    metrics["load_csv_rows"] = rows
+    metrics["load_csv_s"] = round(elapsed, 3)
+    metrics["load_csv_rows_per_sec"] = round(rows / elapsed, 1) if elapsed else 0.0
+    return metrics
+
+def run(sizes, isolate: bool = True, **options) -> dict:
+    """Results for every size; ``isolate`` runs each size in its own process"""
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": options,
+        "sizes": {}
+    }
+    for size in sizes:
+        if isolate:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                report["sizes"][str(size)] = pool.apply(run_size, (size,), options)
+        else:
+            report["sizes"][str(size)] = run_size(size, **options)
+    return report
+
+def check(report: dict, thresholds: dict, baseline: dict = None) -> list:
+    """Regressions: metrics past their absolute limit, or worse than ``baseline`` by more than the tolerance
+
+    Absolute limits are {"max": ...} or {"min": ...} per size and metric;
+    relative ones compare each metric with the same size in a previous
+    report, in whichever direction is worse for that metric.
+    """
+    tolerance = thresholds.get("tolerance", 0.25)
+    failures = []
+    for size, metrics in report["sizes"].items():
+        for metric, limit in thresholds.get("sizes", {}).get(size, {}).items():
+            value = metrics.get(metric)
+            if value is None:
+                continue
+            if "max" in limit and value > limit["max"]:
+                failures.append({"size": size, "metric": metric, "value": value, "limit": limit["max"],
+                                 "kind": "max"})
+            if "min" in limit and value < limit["min"]:
+                failures.append({"size": size, "metric": metric, "value": value, "limit": limit["min"],
+                                 "kind": "min"})
+
+        previous = (baseline or {}).get("sizes", {}).get(size, {})
+        for metric, before in previous.items():
+            value = metrics.get(metric)
+            if value is None or not before or metric in ("documents", "load_csv_rows"):
+                continue
+            if metric.endswith(HIGHER_IS_BETTER):
+                limit = before * (1 - tolerance)
+                worse = value < limit
+            else:
+                limit = before * (1 + tolerance)
+                worse = value > limit
+            if worse:
+                failures.append({"size": size, "metric": metric, "value": value, "limit": round(limit, 3),
+                                 "kind": "baseline"})
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000", help="comma-separated corpus sizes, e.g. 10000,100000")
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--search-repeats", type=int, default=5, help="timed runs of each benchmark query")
+    parser.add_argument("--csv-rows", type=int, default=10000, help="largest CSV timed with load_csv_dataset")
+    parser.add_argument("--output", help="results file (default benchmarks/results/perf-<timestamp>.json)")
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--in-process", action="store_true", help="run every size in this process")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    report = run(sizes, isolate=not args.in_process, seed=args.seed, search_repeats=args.search_repeats,
+                 csv_rows=args.csv_rows)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"perf-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    names = sorted({metric for metrics in report["sizes"].values() for metric in metrics})
+    print(f"{'metric':<28}" + "".join(f"{size:>14}" for size in report["sizes"]))
+    for name in names:
+        print(f"{name:<28}" + "".join(f"{metrics.get(name, ''):>14}" for metrics in report["sizes"].values()))
+    print(f"\nResults written to {output}")
+
+    with open(args.thresholds) as f:
+        thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = check(report, thresholds, baseline)
+    for failure in failures:
+        print(f"REGRESSION {failure['size']} {failure['metric']}: {failure['value']} "
+              f"({failure['kind']} limit {failure['limit']})")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
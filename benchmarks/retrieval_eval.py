@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Retrieval evaluation: recall@k and latency for lexical, dense and hybrid search
+
+Indexes the labelled passages in benchmarks/retrieval_queries.json (plus
+optional random distractor documents, to measure latency at a larger
+corpus size), runs every query through each search configuration and
+reports recall@k, MRR and per-query latency, overall and split into
+exact-citation and paraphrased queries.
+
+    python benchmarks/retrieval_eval.py --distractors 2000 --weights 1:1,2:1,1:2
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.data_processing.vector_store import VectorStoreManager
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "retrieval_queries.json")
+
+def load_dataset(path: str = DATASET) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def build_store(dataset: dict, distractors: int = 0, seed: int = 7) -> VectorStoreManager:
+    """Index the labelled documents (metadata "label") and any distractors"""
+    store = VectorStoreManager()
+    store.add_documents([
+        {"content": document["content"], "metadata": {"label": document["id"], "title": document["title"]}}
+        for document in dataset["documents"]
+    ])
+
+    # Distractors reuse the corpus vocabulary so they compete for the same terms
+    rng = random.Random(seed)
+    words = [word for document in dataset["documents"] for word in document["content"].split()]
+    store.add_documents([
+        {"content": " ".join(rng.choice(words) for _ in range(rng.randint(60, 200))), "metadata": {"label": None}}
+        for _ in range(distractors)
+    ])
+    return store
+
+def configurations(weights: list, methods: list) -> list:
+    """(name, mode, fusion settings) for each configuration to evaluate"""
+    configs = [("lexical", "lexical", None), ("dense", "dense", None)]
+    for method in methods:
+        for lexical, dense in weights:
+            configs.append((f"hybrid {method} {lexical:g}:{dense:g}", "hybrid",
+                            {"method": method, "weights": {"lexical": lexical, "dense": dense}}))
+    return configs
+
+def evaluate(store: VectorStoreManager, queries: list, mode: str, ks=(1, 5, 10)) -> dict:
+    """Recall@k, MRR and latency for one search mode over the labelled queries"""
+    depth = max(ks)
+    rows = []
+    for query in queries:
+        start = time.perf_counter()
+        results = store.search_documents(query["query"], depth, mode=mode)
+        latency = (time.perf_counter() - start) * 1000
+        labels = [result["metadata"].get("label") for result in results]
+        relevant = set(query["relevant"])
+
+        first_hit = next((rank for rank, label in enumerate(labels, 1) if label in relevant), None)
+        rows.append({
+            "kind": query.get("kind", "other"),
+            "latency_ms": latency,
+            "reciprocal_rank": 1.0 / first_hit if first_hit else 0.0,
+            **{f"recall@{k}": len(relevant & set(labels[:k])) / len(relevant) for k in ks}
+        })
+
+    report = summarize(rows, ks)
+    report["by_kind"] = {kind: summarize([row for row in rows if row["kind"] == kind], ks)
+                         for kind in sorted({row["kind"] for row in rows})}
+    return report
+
+def summarize(rows: list, ks) -> dict:
+    latencies = sorted(row["latency_ms"] for row in rows)
+    return {
+        "queries": len(rows),
+        **{f"recall@{k}": round(statistics.mean(row[f"recall@{k}"] for row in rows), 3) for k in ks},
+        "mrr": round(statistics.mean(row["reciprocal_rank"] for row in rows), 3),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies), 3),
+            "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3)
+        }
+    }
+
+def run(distractors: int = 0, weights=((1.0, 1.0),), methods=("rrf", "weighted"), ks=(1, 5, 10),
+        dataset_path: str = DATASET) -> dict:
+    dataset = load_dataset(dataset_path)
+    store = build_store(dataset, distractors)
+    report = {"documents": len(store.documents), "queries": len(dataset["queries"]), "configurations": {}}
+    for name, mode, fusion in configurations(list(weights), list(methods)):
+        if fusion:
+            store.set_fusion(**fusion)
+        report["configurations"][name] = evaluate(store, dataset["queries"], mode, ks)
+    return report
+
+def parse_weights(text: str) -> list:
+    return [tuple(float(part) for part in pair.split(":")) for pair in text.split(",") if pair]
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate lexical, dense and hybrid retrieval")
+    parser.add_argument("--distractors", type=int, default=0, help="random documents added to the corpus")
+    parser.add_argument("--weights", default="1:1,2:1,1:2", help="lexical:dense fusion weights to try")
+    parser.add_argument("--methods", default="rrf,weighted", help="fusion methods to try")
+    parser.add_argument("--k", default="1,5,10", help="cut-offs for recall@k")
+    parser.add_argument("--dataset", default=DATASET)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    ks = tuple(int(k) for k in args.k.split(","))
+    report = run(args.distractors, parse_weights(args.weights), args.methods.split(","), ks, args.dataset)
+
+    print(f"{report['documents']} documents, {report['queries']} queries\n")
+    header = f"{'configuration':<24}" + "".join(f"{f'R@{k}':>7}" for k in ks)
+    print(header + f"{'MRR':>7}{'cite R@1':>10}{'para R@5':>10}{'mean ms':>9}{'p95 ms':>9}")
+    for name, result in report["configurations"].items():
+        by_kind = result["by_kind"]
+        citation = by_kind.get("citation", {}).get("recall@1", 0.0)
+        paraphrase = by_kind.get("paraphrase", {}).get(f"recall@{ks[min(1, len(ks) - 1)]}", 0.0)
+        print(f"{name:<24}" + "".join(f"{result[f'recall@{k}']:>7.3f}" for k in ks)
+              + f"{result['mrr']:>7.3f}{citation:>10.3f}{paraphrase:>10.3f}"
+              + f"{result['latency_ms']['mean']:>9.2f}{result['latency_ms']['p95']:>9.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Load test: threaded Flask server vs. async ASGI server
+
+Starts a local stand-in for the Federal Register and CourtListener APIs that
+answers after a fixed delay, points a temporary config at it, then runs each
+server in its own process and fires concurrent /api/status requests (with
+distinct policy IDs, so nothing is coalesced) at it.
+
+    python benchmarks/serving_load_test.py --concurrency 1000 --delay 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import aiohttp
+import uvicorn
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from starlette.applications import Starlette
+from starlette.routing import Route
+from src.utils.asgi import jsonify
+
+SERVERS = {
+    "flask (threaded)": [sys.executable, "-c",
+                         "import api_server, sys; api_server.app.run(port=int(sys.argv[1]), threaded=True)"],
+    "asgi (uvicorn)": [sys.executable, "-m", "uvicorn", "asgi_server:app", "--log-level", "warning",
+                       "--backlog", "4096", "--port"]
+}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_upstream(delay: float) -> int:
+    """Serve the upstream stand-in from a background thread; returns its port"""
+    async def documents(request):
+        await asyncio.sleep(delay)
+        return jsonify({"results": [{
+            "title": f"Notice on {request.query_params.get('conditions[term]', '')}",
+            "publication_date": "2024-01-15",
+            "html_url": "https://example.gov/doc"
+        }]})
+
+    async def opinions(request):
+        await asyncio.sleep(delay)
+        return jsonify({"results": []})
+
+    upstream = Starlette(routes=[Route("/federal/documents.json", documents), Route("/courts/search/", opinions)])
+
+    port = free_port()
+    config = uvicorn.Config(upstream, port=port, log_level="warning", backlog=8192)
+    threading.Thread(target=uvicorn.Server(config).run, daemon=True).start()
+    wait_for(f"http://127.0.0.1:{port}/courts/search/")
+    return port
+
+def write_config(upstream_port: int) -> str:
+    """Copy config/config.yaml with data sources pointed at the stand-in"""
+    with open(os.path.join(ROOT, "config", "config.yaml")) as f:
+        config = yaml.safe_load(f)
+
+    config["data_sources"]["federal_register"]["base_url"] = f"http://127.0.0.1:{upstream_port}/federal"
+    config["data_sources"]["court_listener"]["base_url"] = f"http://127.0.0.1:{upstream_port}/courts"
+    config["answer_cache"]["enabled"] = False
+
+    path = os.path.join(tempfile.mkdtemp(), "config.yaml")
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f)
+    return path
+
+def wait_for(url: str, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1.0).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+async def fire(port: int, concurrency: int, timeout: float):
+    """Send `concurrency` simultaneous status checks; returns latencies and error count"""
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as client:
+        async def one(n):
+            start = time.perf_counter()
+            try:
+                async with client.post(f"http://127.0.0.1:{port}/api/status",
+                                       json={"policy_id": f"EO {14000 + n}"}) as response:
+                    await response.read()
+                    ok = response.status == 200
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                ok = False
+            return time.perf_counter() - start, ok
+
+        return await asyncio.gather(*(one(n) for n in range(concurrency)))
+
+def run_server(name: str, command, config_path: str, concurrency: int, timeout: float) -> dict:
+    port = free_port()
+    env = {**os.environ, "POLICY_NAVIGATOR_CONFIG": config_path}
+    process = subprocess.Popen(command + [str(port)], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(f"http://127.0.0.1:{port}/api/health")
+        start = time.perf_counter()
+        results = asyncio.run(fire(port, concurrency, timeout))
+        wall = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies = sorted(latency for latency, ok in results if ok)
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        "server": name,
+        "completed": len(latencies),
+        "errors": errors,
+        "wall_s": wall,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "p50_s": statistics.median(latencies) if latencies else None,
+        "p95_s": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--delay", type=float, default=1.0, help="stand-in upstream latency in seconds")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--servers", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+    args = parser.parse_args()
+
+    config_path = write_config(start_upstream(args.delay))
+
+    print(f"{args.concurrency} concurrent /api/status calls, upstream delay {args.delay}s")
+    print(f"{'server':<18} {'ok':>6} {'errors':>6} {'wall s':>8} {'req/s':>8} {'p50 s':>7} {'p95 s':>7}")
+    for name in args.servers:
+        r = run_server(name, SERVERS[name], config_path, args.concurrency, args.timeout)
+        p50 = f"{r['p50_s']:.2f}" if r["p50_s"] is not None else "-"
+        p95 = f"{r['p95_s']:.2f}" if r["p95_s"] is not None else "-"
+        print(f"{r['server']:<18} {r['completed']:>6} {r['errors']:>6} {r['wall_s']:>8.2f} "
+              f"{r['throughput_rps']:>8.1f} {p50:>7} {p95:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,11 @@ setup(
         "feedparser>=6.0.0",
         "click>=8.1.0",
         "tqdm>=4.67.1",
-        "pyyaml>=6.0"
+        "pyyaml>=6.0",
+        "aiohttp>=3.9.0",
+        "uvicorn>=0.23.0",
+        "starlette>=0.27",
+        "pypdf>=3.0.0"
     ],
     entry_points={
         'console_scripts': [
@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+class AgentRegistry:
+    """Local record of created aiXplain agents, keyed by agent name
+
+    Each record stores the remote agent ID and a fingerprint of the definition
+    it was created from, so later processes can reuse the agent instead of
+    creating a new one, and recreate it only when the definition changes.
+    """
+
+    def __init__(self, path: str = "data/agent_registry.json"):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(definition: Dict) -> str:
+        """Stable hash of an agent definition"""
+        encoded = json.dumps(definition, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Get the stored record for an agent name"""
+        with self._lock:
+            return self._read().get(name)
+
+    def save(self, name: str, agent_id: str, fingerprint: str) -> Dict:
+        """Store the agent ID created for a definition fingerprint"""
+        record = {
+            "agent_id": agent_id,
+            "fingerprint": fingerprint,
+            "created": datetime.now().isoformat()
+        }
+
+        with self._lock:
+            records = self._read()
+            records[name] = record
+            self._write(records)
+        return record
+
+    def remove(self, name: str):
+        """Forget the stored record for an agent name"""
+        with self._lock:
+            records = self._read()
+            if records.pop(name, None) is not None:
+                self._write(records)
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, records: Dict):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write then rename so a crash never leaves a half-written registry
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(records, f, indent=2)
+        os.replace(temp_path, self.path)
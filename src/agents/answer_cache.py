@@ -0,0 +1,190 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from ..utils.embeddings import HashingEmbedder
+from ..utils.text import POLARITY_WORDS, normalize_text
+
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)*")
+
+class SemanticAnswerCache:
+    """Cache of agent answers looked up by question similarity
+
+    Questions are normalized and embedded; a lookup returns the stored answer
+    of the most similar cached question when it passes the similarity
+    threshold. Numbers in a question (order numbers, sections, years) and
+    its polarity words ("not", "in effect", "revoked") must match exactly,
+    so "EO 14067" never serves an answer for "EO 14068", nor "is it in
+    effect" one for "is it revoked".
+
+    Recent entries live in an in-memory LRU; when ``persist_path`` is set,
+    every answer is also written to SQLite so it survives restarts and can
+    still be served by exact match after eviction from memory.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.9, ttl_seconds: float = 86400,
+                 max_entries: int = 1000, persist_path: Optional[str] = None,
+                 embedder: Optional[HashingEmbedder] = None):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self.embedder = embedder or HashingEmbedder()
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._stats = {"hits": 0, "semantic_hits": 0, "persistent_hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+        if persist_path:
+            self._open_db()
+
+    def get(self, question: str) -> Optional[Dict]:
+        """Return the cached answer for a question or a close paraphrase of it"""
+        key = normalize_text(question)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            similarity, tier = 1.0, None
+
+            if entry is None:
+                entry = self._load_persisted(key)
+                tier = "persistent_hits"
+                if entry is not None:
+                    self._store(key, entry)
+
+            if entry is None:
+                entry, similarity = self._find_similar(key, now)
+                tier = "semantic_hits"
+
+            if entry is not None and self._is_expired(entry, now):
+                self._remove(entry["key"])
+                self._stats["expired"] += 1
+                entry = None
+
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(entry["key"])
+            self._stats["hits"] += 1
+            if tier:
+                self._stats[tier] += 1
+
+        answer = json.loads(entry["answer"])
+        answer["cache"] = {"hit": True, "similarity": round(similarity, 3), "cached_question": entry["question"]}
+        return answer
+
+    def put(self, question: str, answer: Dict):
+        """Store the answer to a question"""
+        key = normalize_text(question)
+        entry = self._make_entry(key, question, json.dumps(answer, default=str), time.time())
+
+        with self._lock:
+            self._store(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO answers (key, question, answer, created) VALUES (?, ?, ?, ?)",
+                    (key, question, entry["answer"], entry["created"])
+                )
+                self._db.commit()
+
+    def clear(self):
+        """Remove all cached answers"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM answers")
+                self._db.commit()
+
+    def get_stats(self) -> Dict:
+        """Get cache size and hit-rate metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _make_entry(self, key: str, question: str, answer: str, created: float) -> Dict:
+        return {
+            "key": key,
+            "question": question,
+            "answer": answer,
+            "created": created,
+            "vector": self.embedder.embed(key),
+            "exact": self._exact_terms(key)
+        }
+
+    @staticmethod
+    def _exact_terms(key: str) -> frozenset:
+        """Numbers and polarity words, which a similar question must share"""
+        return frozenset(_NUMBER_PATTERN.findall(key)) | (POLARITY_WORDS & set(key.split()))
+
+    def _find_similar(self, key: str, now: float):
+        vector = self.embedder.embed(key)
+        exact = self._exact_terms(key)
+        best, best_similarity = None, self.similarity_threshold
+
+        for entry in self._entries.values():
+            if entry["exact"] != exact or self._is_expired(entry, now):
+                continue
+            similarity = self.embedder.similarity(vector, entry["vector"])
+            if similarity >= best_similarity:
+                best, best_similarity = entry, similarity
+
+        return best, best_similarity
+
+    def _is_expired(self, entry: Dict, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry["created"] > self.ttl_seconds
+
+    def _store(self, key: str, entry: Dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM answers WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _open_db(self):
+        directory = os.path.dirname(self.persist_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(self.persist_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, question TEXT, answer TEXT, created REAL)"
+        )
+        if self.ttl_seconds is not None:
+            self._db.execute("DELETE FROM answers WHERE created < ?", (time.time() - self.ttl_seconds,))
+        self._db.commit()
+
+        # Warm the in-memory tier with the most recent answers
+        rows = self._db.execute(
+            "SELECT key, question, answer, created FROM answers ORDER BY created DESC LIMIT ?",
+            (self.max_entries,)
+        ).fetchall()
+        for key, question, answer, created in reversed(rows):
+            self._entries[key] = self._make_entry(key, question, answer, created)
+
+    def _load_persisted(self, key: str) -> Optional[Dict]:
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT question, answer, created FROM answers WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._make_entry(key, row[0], row[1], row[2])
@@ -0,0 +1,115 @@
+import hashlib
+from typing import Dict, List, Optional
+from ..utils.text import estimate_tokens, tokenize
+
+class ContextBuilder:
+    """Assemble locally indexed passages into grounding context for an agent query
+
+    Candidate passages come from the vector store's lexical, dense or hybrid
+    retrieval (``mode``). Exact and near-duplicate passages are dropped, a
+    diverse subset is picked with maximal marginal relevance (MMR), and the
+    result is packed into a token budget with numbered citations the agent
+    can refer to.
+    """
+
+    def __init__(self, vector_store, token_budget: int = 1500, candidates: int = 20,
+                 max_passages: int = 6, mmr_lambda: float = 0.7, duplicate_threshold: float = 0.8,
+                 mode: str = "lexical"):
+        self.vector_store = vector_store
+        self.token_budget = token_budget
+        self.candidates = candidates
+        self.max_passages = max_passages
+        self.mmr_lambda = mmr_lambda
+        self.duplicate_threshold = duplicate_threshold
+        self.mode = mode
+
+    def build(self, question: str) -> Optional[Dict]:
+        """Build a grounded prompt for a question, or None when nothing relevant is indexed"""
+        passages = self._deduplicate(self.vector_store.retrieve_passages(question, self.candidates, self.mode))
+        if not passages:
+            return None
+
+        selected = self._select_diverse(passages)
+        packed, tokens = self._pack(selected)
+        if not packed:
+            return None
+
+        citations = []
+        sections = []
+        for number, passage in enumerate(packed, 1):
+            metadata = passage["metadata"]
+            citation = {
+                "number": number,
+                "doc_id": passage["doc_id"],
+                "title": metadata.get("title", passage["doc_id"]),
+                "source": metadata.get("url") or metadata.get("source", "local index")
+            }
+            citations.append(citation)
+            sections.append(f"[{number}] {citation['title']} ({citation['source']})\n{passage['text']}")
+
+        prompt = (
+            "Relevant excerpts from the local policy index (cite them by number when used):\n\n"
+            + "\n\n".join(sections)
+            + f"\n\nQuestion: {question}"
+        )
+
+        return {"prompt": prompt, "citations": citations, "context_tokens": tokens}
+
+    def _deduplicate(self, passages: List[Dict]) -> List[Dict]:
+        unique = []
+        seen_hashes = set()
+
+        for passage in passages:
+            terms = set(tokenize(passage["text"]))
+            digest = hashlib.sha1(" ".join(sorted(terms)).encode("utf-8")).hexdigest()
+            if digest in seen_hashes or any(
+                self._similarity(terms, kept["terms"]) >= self.duplicate_threshold for kept in unique
+            ):
+                continue
+
+            seen_hashes.add(digest)
+            unique.append({**passage, "terms": terms})
+
+        return unique
+
+    def _select_diverse(self, passages: List[Dict]) -> List[Dict]:
+        top_score = max(passage["score"] for passage in passages) or 1.0
+        remaining = list(passages)
+        selected = []
+
+        while remaining and len(selected) < self.max_passages:
+            def mmr(passage):
+                redundancy = max((self._similarity(passage["terms"], kept["terms"]) for kept in selected), default=0.0)
+                return self.mmr_lambda * passage["score"] / top_score - (1 - self.mmr_lambda) * redundancy
+
+            best = max(remaining, key=mmr)
+            remaining.remove(best)
+            selected.append(best)
+
+        return selected
+
+    def _pack(self, passages: List[Dict]):
+        packed = []
+        used = 0
+
+        for passage in passages:
+            remaining = self.token_budget - used
+            tokens = estimate_tokens(passage["text"])
+
+            if tokens > remaining:
+                # Trim to the budget when a useful amount of room is left
+                if remaining < 50:
+                    continue
+                passage = {**passage, "text": passage["text"][:(remaining - 1) * 4].rsplit(" ", 1)[0] + " ..."}
+                tokens = estimate_tokens(passage["text"])
+
+            packed.append(passage)
+            used += tokens
+
+        return packed, used
+
+    @staticmethod
+    def _similarity(a: set, b: set) -> float:
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
@@ -0,0 +1,102 @@
+import itertools
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+class LocalAgent:
+    """In-process stand-in for an aiXplain agent"""
+
+    def __init__(self, factory: "LocalAgentFactory", agent_id: str, name: str, definition: Dict):
+        self.factory = factory
+        self.id = agent_id
+        self.name = name
+        self.definition = definition
+
+    def run(self, query: str, **kwargs) -> Dict:
+        """Answer a query with the factory's responder"""
+        self.factory.calls["run"] += 1
+        return {
+            "status": "SUCCESS",
+            "completed": True,
+            "data": {
+                "input": query,
+                "output": self.factory.responder(query),
+                "intermediate_steps": []
+            }
+        }
+
+    def run_async(self, query: str, **kwargs) -> Dict:
+        """Start a run that reveals one intermediate step per poll"""
+        self.factory.calls["run_async"] += 1
+        run_id = f"{self.id}/run_{next(self.factory._ids)}"
+        self.factory.runs[run_id] = {"query": query, "polls": 0}
+        return {"status": "IN_PROGRESS", "url": f"local://{run_id}"}
+
+    def poll(self, poll_url: str) -> Dict:
+        self.factory.calls["poll"] += 1
+        run = self.factory.runs[poll_url[len("local://"):]]
+        run["polls"] += 1
+
+        completed = run["polls"] > len(self.factory.steps)
+        data = {"input": run["query"], "intermediate_steps": self.factory.steps[:run["polls"]]}
+        if completed:
+            data["output"] = self.factory.responder(run["query"])
+        elif self.factory.partial_output:
+            # Reveal the answer a share at a time, as a streaming backend would
+            answer = self.factory.responder(run["query"])
+            data["output"] = answer[:len(answer) * run["polls"] // (len(self.factory.steps) + 1)]
+
+        return {"status": "SUCCESS" if completed else "IN_PROGRESS", "completed": completed, "data": data}
+
+    def deploy(self):
+        self.factory.calls["deploy"] += 1
+
+    def delete(self):
+        self.factory.calls["delete"] += 1
+        self.factory.agents.pop(self.id, None)
+
+class LocalAgentFactory:
+    """Stand-in for aixplain's AgentFactory that keeps agents in memory
+
+    Implements the subset of the AgentFactory API used by PolicyNavigatorAgent
+    and counts calls, so tests and offline runs can exercise agent creation
+    and reuse without the aiXplain platform.
+    """
+
+    def __init__(self, responder: Optional[Callable[[str], str]] = None, steps: Optional[List[Dict]] = None,
+                 partial_output: bool = False):
+        self.responder = responder or (lambda query: f"Local answer for: {query}")
+        self.steps = steps or []
+        self.partial_output = partial_output
+        self.agents = {}
+        self.runs = {}
+        self.calls = Counter()
+        self._ids = itertools.count(1)
+
+    def create(self, name: str, description: str, instructions: str = None,
+               tasks: List = None, tools: List = None, llm_id: str = None, **kwargs) -> LocalAgent:
+        self.calls["create"] += 1
+        agent_id = f"local_agent_{next(self._ids)}"
+        definition = {
+            "description": description,
+            "instructions": instructions,
+            "tasks": tasks or [],
+            "tools": tools or [],
+            "llm_id": llm_id
+        }
+        agent = self.agents[agent_id] = LocalAgent(self, agent_id, name, definition)
+        return agent
+
+    def get(self, agent_id: str) -> LocalAgent:
+        self.calls["get"] += 1
+        if agent_id not in self.agents:
+            raise Exception(f"Agent {agent_id} not found")
+        return self.agents[agent_id]
+
+    def create_task(self, name: str, description: str, expected_output: str, **kwargs) -> Dict:
+        return {"name": name, "description": description, "expected_output": expected_output, **kwargs}
+
+    def create_model_tool(self, model: str = None, **kwargs) -> Dict:
+        return {"type": "model", "model": model}
+
+    def create_python_interpreter_tool(self) -> Dict:
+        return {"type": "python_interpreter"}
@@ -1,72 +1,109 @@
+import asyncio
 import os
-from typing import Dict, List, Any
-from aixplain.factories import AgentFactory
-from aixplain.modules.agent.tool.model_tool import ModelTool
-from aixplain.modules.agent.agent_task import AgentTask
-from ..utils.config import CONFIG
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+from ..utils.config import get_config
+from ..utils.text import normalize_text
 from ..tools.custom_tools import PolicyStatusChecker, ComplianceAnalyzer, PolicySearchTool
-from ..tools.external_integrations import ExternalToolManager
+from ..data_processing.document_parser import DocumentParser
 from ..data_processing.vector_store import VectorStoreManager
 from ..data_processing.dataset_loader import DatasetLoader
+from ..data_processing.reindex_scheduler import ReindexScheduler
+from .answer_cache import SemanticAnswerCache
+from .agent_registry import AgentRegistry
+from .context_builder import ContextBuilder
 
 class PolicyNavigatorAgent:
-    def __init__(self):
-        self.config = CONFIG
-        self.policy_checker = PolicyStatusChecker()
-        self.compliance_analyzer = ComplianceAnalyzer()
-        self.search_tool = PolicySearchTool()
+    def __init__(self, load_data: bool = True, agent_factory=None):
+        self.config = get_config()
         self.agent = None
         
-        # Missing components from PDF requirements
-        self.vector_store = VectorStoreManager()
-        self.dataset_loader = DatasetLoader(self.vector_store)
-        self.external_tools = ExternalToolManager()
+        # aiXplain AgentFactory by default; tests pass a stand-in such as LocalAgentFactory
+        self.agent_factory = agent_factory
+        self.agent_registry = AgentRegistry(self.config['aixplain'].get('agent_registry_path', 'data/agent_registry.json'))
         
-        # Load initial datasets
-        self._load_initial_data()
-    
-    def create_agent(self):
-        """Create the main policy navigator agent"""
+        # Tool components are created on first use; see _component
+        self._components = {}
+        self._components_lock = threading.Lock()
         
-        # Define agent tasks
-        policy_search_task = AgentTask(
-            name="policy_search",
-            description="Search and retrieve policy documents from various sources",
-            expected_output="List of relevant policy documents with metadata"
+        # Missing components from PDF requirements
+        vector_config = self.config['vector_store']
+        self.vector_store = VectorStoreManager(
+            chunk_words=vector_config.get('chunk_words', 120),
+            parser=DocumentParser(
+                max_file_size=vector_config.get('max_file_size', 50 * 1024 * 1024),
+                workers=vector_config.get('extraction_workers'),
+                parallel_min_pages=vector_config.get('parallel_min_pages', 32)
+            ),
+            snippet_words=vector_config.get('snippet_words', 40),
+            fusion=vector_config.get('fusion')
         )
+        self.dataset_loader = DatasetLoader(self.vector_store)
+        self.answer_cache = self._create_answer_cache()
+        self.context_builder = self._create_context_builder()
         
-        status_check_task = AgentTask(
-            name="status_check",
-            description="Check the current status of policies and regulations",
-            expected_output="Current status information with source verification"
-        )
+        # Stale sources are refreshed in the background once warm-up is done,
+        # pausing while foreground requests are arriving
+        self._last_foreground = 0.0
+        self.reindex_scheduler = self._create_reindex_scheduler()
         
-        compliance_task = AgentTask(
-            name="compliance_analysis",
-            description="Analyze compliance requirements for different business types",
-            expected_output="Detailed compliance requirements and deadlines"
-        )
-        
-        # Create tools
-        tools = [
-            # Document processor from marketplace
-            ModelTool(model=self.config['tools']['document_processor']),
-            
-            # Web scraper tool
-            ModelTool(model=self.config['tools']['web_scraper']),
-            
-            # Google search tool
-            ModelTool(model=self.config['tools']['google_search']),
-            
-            # Python interpreter for custom analysis
-            AgentFactory.create_python_interpreter_tool()
-        ]
+        # Initial datasets load on a background thread so construction never waits on the network
+        self._ready = threading.Event()
+        self.warmup_status = {"state": "not_started"}
+        if load_data:
+            self.start_warmup()
+        else:
+            self._ready.set()
+    
+    @property
+    def policy_checker(self) -> PolicyStatusChecker:
+        return self._component('policy_checker', lambda: PolicyStatusChecker(resolver=self.resolve_policy))
+    
+    @property
+    def compliance_analyzer(self) -> ComplianceAnalyzer:
+        return self._component('compliance_analyzer', ComplianceAnalyzer)
+    
+    @property
+    def search_tool(self) -> PolicySearchTool:
+        return self._component('search_tool', PolicySearchTool)
+    
+    @property
+    def external_tools(self):
+        from ..tools.external_integrations import ExternalToolManager
+        return self._component('external_tools', lambda: ExternalToolManager(self.config))
+    
+    @property
+    def policy_watcher(self):
+        return self._component('policy_watcher', self._create_policy_watcher)
+    
+    def start_warmup(self) -> bool:
+        """Start loading initial datasets in the background (no-op if already started)"""
+        with self._components_lock:
+            if self.warmup_status["state"] != "not_started":
+                return False
+            self.warmup_status = {"state": "loading", "started_at": datetime.now().isoformat()}
         
-        # Create the agent
-        self.agent = AgentFactory.create(
-            name="Policy Navigator Agent",
-            description="Expert agent for government regulation and compliance analysis",
-            instructions="""
+        thread = threading.Thread(target=self._load_initial_data, name="policy-navigator-warmup", daemon=True)
+        thread.start()
+        return True
+    
+    def is_ready(self) -> bool:
+        """Whether initial datasets have finished loading"""
+        return self._ready.is_set()
+    
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        """Block until initial datasets have loaded or the timeout expires"""
+        return self._ready.wait(timeout)
+    
+    def agent_definition(self) -> Dict:
+        """Plain description of the agent; its fingerprint decides when to recreate it"""
+        return {
+            "name": "Policy Navigator Agent",
+            "description": "Expert agent for government regulation and compliance analysis",
+            "instructions": """
             You are a specialized agent for analyzing government regulations, policies, and compliance requirements.
             
             Your capabilities include:
@@ -83,45 +120,361 @@ class PolicyNavigatorAgent:
             - Include relevant deadlines and key requirements
             - Cite sources for all information provided
             """,
-            tasks=[policy_search_task, status_check_task, compliance_task],
+            "tasks": [
+                {
+                    "name": "policy_search",
+                    "description": "Search and retrieve policy documents from various sources",
+                    "expected_output": "List of relevant policy documents with metadata"
+                },
+                {
+                    "name": "status_check",
+                    "description": "Check the current status of policies and regulations",
+                    "expected_output": "Current status information with source verification"
+                },
+                {
+                    "name": "compliance_analysis",
+                    "description": "Analyze compliance requirements for different business types",
+                    "expected_output": "Detailed compliance requirements and deadlines"
+                }
+            ],
+            "tools": [
+                # Document processor from marketplace
+                {"type": "model", "model": self.config['tools']['document_processor']},
+                
+                # Web scraper tool
+                {"type": "model", "model": self.config['tools']['web_scraper']},
+                
+                # Google search tool
+                {"type": "model", "model": self.config['tools']['google_search']},
+                
+                # Python interpreter for custom analysis
+                {"type": "python_interpreter"}
+            ],
+            "llm_id": self.config['aixplain']['default_llm_id']
+        }
+    
+    def create_agent(self):
+        """Create the main policy navigator agent
+        
+        An agent created by an earlier process from the same definition is
+        fetched by its stored ID instead of being created again; it is only
+        recreated when the definition fingerprint changes.
+        """
+        factory = self._agent_factory()
+        definition = self.agent_definition()
+        fingerprint = AgentRegistry.fingerprint(definition)
+        record = self.agent_registry.get(definition['name'])
+        
+        if record and record['fingerprint'] == fingerprint:
+            try:
+                self.agent = factory.get(record['agent_id'])
+                return self.agent
+            except Exception as e:
+                print(f"⚠️ Stored agent {record['agent_id']} unavailable, recreating: {e}")
+        
+        # Define agent tasks (through the factory, so stand-in factories need no SDK)
+        tasks = [factory.create_task(**task) for task in definition['tasks']]
+        
+        # Create tools
+        tools = [
+            factory.create_python_interpreter_tool() if tool['type'] == 'python_interpreter'
+            else factory.create_model_tool(model=tool['model'])
+            for tool in definition['tools']
+        ]
+        
+        # Create the agent
+        self.agent = factory.create(
+            name=definition['name'],
+            description=definition['description'],
+            instructions=definition['instructions'],
+            tasks=tasks,
             tools=tools,
-            llm_id=self.config['aixplain']['default_llm_id']
+            llm_id=definition['llm_id']
         )
+        self.agent_registry.save(definition['name'], self.agent.id, fingerprint)
+        
+        # Remove the agent built from the outdated definition so duplicates don't pile up
+        if record and record['agent_id'] != self.agent.id:
+            try:
+                factory.get(record['agent_id']).delete()
+            except Exception as e:
+                print(f"⚠️ Could not delete outdated agent {record['agent_id']}: {e}")
         
         return self.agent
     
     def query(self, question: str, **kwargs):
         """Query the policy agent - let it decide what APIs to use"""
+        self._last_foreground = time.time()
+        # Reworded repeats of a question are answered from the cache
+        use_cache = self.answer_cache is not None and not kwargs
+        if use_cache:
+            cached = self.answer_cache.get(question)
+            if cached is not None:
+                return cached
+        
         if not self.agent:
             self.create_agent()
         
+        # Ground the question in locally indexed passages so the agent needs fewer remote tool hops
+        context = self.context_builder.build(question) if self.context_builder else None
+        prompt = context["prompt"] if context else question
+        
         try:
-            response = self.agent.run(question, **kwargs)
-            return response["data"]
+            response = self.agent.run(prompt, **kwargs)
+            data = response["data"]
+            result = data.to_dict() if hasattr(data, 'to_dict') else data
         except Exception as e:
             return {
                 "output": f"Error processing query: {str(e)}",
                 "error": str(e)
             }
+        
+        return self._finish_query(question, result, context, use_cache)
+    
+    def query_stream(self, question: str, **kwargs) -> Iterator[Dict]:
+        """Query the policy agent, yielding progress events as they become available
+        
+        Events are dicts with an ``event`` key: ``retrieval`` (local passages
+        used as context), ``step`` (agent tool-call progress), ``answer``
+        (chunks of the answer text), ``error`` and a final ``done`` carrying
+        the same result ``query`` would return.
+        
+        Answer chunks are forwarded as soon as a poll response carries partial
+        output. The aiXplain agent only returns its output once the run has
+        completed, so with it every ``answer`` event arrives after the last
+        ``step``; ``done`` always carries the full answer.
+        """
+        self._last_foreground = time.time()
+        stream_config = self.config.get('streaming', {})
+        chunk_chars = stream_config.get('answer_chunk_chars', 80)
+        
+        use_cache = self.answer_cache is not None and not kwargs
+        if use_cache:
+            cached = self.answer_cache.get(question)
+            if cached is not None:
+                yield {"event": "cache", "cache": cached.get("cache")}
+                yield from self._answer_events(cached.get('output', ''), chunk_chars)
+                yield {"event": "done", "result": cached}
+                return
+        
+        context = self.context_builder.build(question) if self.context_builder else None
+        yield {
+            "event": "retrieval",
+            "citations": context["citations"] if context else [],
+            "context_tokens": context["context_tokens"] if context else 0
+        }
+        prompt = context["prompt"] if context else question
+        
+        try:
+            if not self.agent:
+                self.create_agent()
+            
+            streamed = ""
+            if hasattr(self.agent, 'run_async') and hasattr(self.agent, 'poll'):
+                result, streamed = yield from self._poll_agent(prompt, stream_config.get('poll_interval', 0.5),
+                                                               stream_config.get('timeout', 300), chunk_chars,
+                                                               **kwargs)
+            else:
+                response = self.agent.run(prompt, **kwargs)
+                data = response["data"]
+                result = data.to_dict() if hasattr(data, 'to_dict') else data
+        except Exception as e:
+            error = {"output": f"Error processing query: {str(e)}", "error": str(e)}
+            yield {"event": "error", "error": str(e)}
+            yield {"event": "done", "result": error}
+            return
+        
+        result = self._finish_query(question, result, context, use_cache)
+        if isinstance(result, dict):
+            output = result.get('output') or ''
+            # Only what the partial output did not already send
+            rest = output[len(streamed):] if output.startswith(streamed) else ""
+            yield from self._answer_events(rest, chunk_chars)
+        yield {"event": "done", "result": result}
+    
+    def _poll_agent(self, prompt: str, poll_interval: float, timeout: float, chunk_chars: int, **kwargs):
+        """Run the agent asynchronously, yielding new intermediate steps and any partial answer
+        
+        Returns (result data, answer text already sent). Raises TimeoutError
+        if the run has not completed within ``timeout`` seconds.
+        """
+        response = self.agent.run_async(prompt, **kwargs)
+        poll_url = response.get("url")
+        if not poll_url:
+            raise Exception(response.get("error") or "Agent did not return a poll URL")
+        
+        deadline = time.monotonic() + timeout
+        steps_seen, streamed = 0, ""
+        while True:
+            data, completed = self._read_poll(self.agent.poll(poll_url))
+            
+            steps = data.get("intermediate_steps") or []
+            for step in steps[steps_seen:]:
+                yield {"event": "step", "step": step}
+            steps_seen = max(steps_seen, len(steps))
+            
+            if completed:
+                return data, streamed
+            
+            # Partial output is sent up to its last whole word, as long as it extends what was sent
+            partial = data.get("output")
+            if isinstance(partial, str) and partial.startswith(streamed):
+                words_end = partial.rfind(" ") + 1
+                if words_end > len(streamed):
+                    yield from self._answer_events(partial[len(streamed):words_end], chunk_chars)
+                    streamed = partial[:words_end]
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Agent did not finish within {timeout}s")
+            
+            time.sleep(poll_interval)
+    
+    async def aquery(self, question: str, **kwargs):
+        """Async version of query for the ASGI server
+        
+        The remote run is started asynchronously and polled between
+        ``asyncio.sleep`` calls, so no thread is held while the LLM works;
+        the short SDK calls and the local cache and index lookups run in the
+        default executor so they never stall the event loop. Raises
+        TimeoutError if the run outlasts ``streaming.timeout``.
+        """
+        loop = asyncio.get_running_loop()
+        self._last_foreground = time.time()
+        
+        use_cache = self.answer_cache is not None and not kwargs
+        if use_cache:
+            cached = await loop.run_in_executor(None, self.answer_cache.get, question)
+            if cached is not None:
+                return cached
+        
+        context = None
+        if self.context_builder:
+            context = await loop.run_in_executor(None, self.context_builder.build, question)
+        prompt = context["prompt"] if context else question
+        stream_config = self.config.get('streaming', {})
+        poll_interval = stream_config.get('poll_interval', 0.5)
+        timeout = stream_config.get('timeout', 300)
+        
+        try:
+            if not self.agent:
+                await loop.run_in_executor(None, self.create_agent)
+            
+            if hasattr(self.agent, 'run_async') and hasattr(self.agent, 'poll'):
+                response = await loop.run_in_executor(None, partial(self.agent.run_async, prompt, **kwargs))
+                poll_url = response.get("url")
+                if not poll_url:
+                    raise Exception(response.get("error") or "Agent did not return a poll URL")
+                
+                deadline = time.monotonic() + timeout
+                while True:
+                    data, completed = self._read_poll(await loop.run_in_executor(None, self.agent.poll, poll_url))
+                    if completed:
+                        result = data
+                        break
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Agent did not finish within {timeout}s")
+                    await asyncio.sleep(poll_interval)
+            else:
+                response = await loop.run_in_executor(None, partial(self.agent.run, prompt, **kwargs))
+                data = response["data"]
+                result = data.to_dict() if hasattr(data, 'to_dict') else data
+        except TimeoutError:
+            raise
+        except Exception as e:
+            return {
+                "output": f"Error processing query: {str(e)}",
+                "error": str(e)
+            }
+        
+        return await loop.run_in_executor(None, self._finish_query, question, result, context, use_cache)
+    
+    @staticmethod
+    def _read_poll(response) -> tuple:
+        """Extract (data dict, completed) from an agent poll response"""
+        data = response.get("data")
+        data = data.to_dict() if hasattr(data, 'to_dict') else (data or {})
+        
+        completed = bool(response.get("completed"))
+        if completed and str(response.get("status", "")).upper() == "FAILED":
+            raise Exception(response.get("error_message") or response.get("error") or "Agent run failed")
+        return data, completed
+    
+    @staticmethod
+    def _answer_events(output: str, chunk_chars: int) -> Iterator[Dict]:
+        """Split answer text into word-aligned chunks"""
+        chunk = ""
+        for word in output.split(" "):
+            candidate = f"{chunk} {word}" if chunk else word
+            if chunk and len(candidate) > chunk_chars:
+                yield {"event": "answer", "delta": chunk + " "}
+                candidate = word
+            chunk = candidate
+        if chunk:
+            yield {"event": "answer", "delta": chunk}
+    
+    def _finish_query(self, question: str, result, context: Dict, use_cache: bool):
+        """Attach citations to an agent result and cache it"""
+        if context and isinstance(result, dict):
+            result["citations"] = context["citations"]
+        
+        if use_cache and isinstance(result, dict) and result.get('output'):
+            self.answer_cache.put(question, result)
+        return result
+    
+    def resolve_policy(self, policy_id: str) -> Optional[Dict]:
+        """Resolve any spelling of a policy ID to its canonical key and local documents"""
+        return self.vector_store.resolve_policy(policy_id)
+    
+    def related_policies(self, policy_id: str, direction: str = "in", relations: Optional[List[str]] = None,
+                         max_hops: int = 1) -> Optional[Dict]:
+        """Policies citing, amending or revoking a policy (or cited by it), from the local citation graph"""
+        return self.vector_store.related_policies(policy_id, direction, relations, max_hops)
+    
+    def policy_key(self, policy_id: str) -> str:
+        """One key for every spelling of a policy, for coalescing status checks"""
+        return self.vector_store.aliases.canonical_key(policy_id) or normalize_text(policy_id)
     
     def check_policy_status(self, policy_id: str):
         """Check specific policy status using real APIs"""
+        self._last_foreground = time.time()
         result = self.policy_checker.check_policy_status(policy_id)
         return result
     
-    def analyze_compliance(self, business_type: str, size: str):
+    def analyze_compliance(self, business_type: str, size: str, jurisdiction: str = "US"):
         """Analyze compliance requirements with detailed response"""
-        result = self.compliance_analyzer.analyze_compliance_requirements(business_type, size)
+        result = self.compliance_analyzer.analyze_compliance_requirements(business_type, size, jurisdiction)
         
         # Format like PDF examples
         requirements_text = "\n".join([f"• {req}" for reqs in result['requirements'].values() for req in reqs])
         
         return {
             "output": f"Based on current regulations for {size} {business_type}:\n\n{requirements_text}\n\nCompliance deadlines: {', '.join(result['deadlines'])}\n\nSource: Government Compliance Database",
+            "business_type": result['business_type'],
+            "size": result['size'],
+            "jurisdiction": result['jurisdiction'],
             "requirements": result['requirements'],
             "deadlines": result['deadlines']
         }
     
+    def analyze_compliance_batch(self, profiles: Iterable[Dict]) -> Iterator[Dict]:
+        """Analyze many business profiles, running each distinct profile once
+        
+        Results are yielded in input order so callers can stream them. Profiles
+        sharing the same (business type, size, jurisdiction) key reuse the
+        analysis computed for the first of them.
+        """
+        analyses = {}
+        
+        for index, profile in enumerate(profiles):
+            business_type = str(profile.get('business_type') or 'general').strip()
+            size = str(profile.get('size') or 'small_business').strip()
+            jurisdiction = str(profile.get('jurisdiction') or 'US').strip()
+            key = (business_type.lower(), size.lower(), jurisdiction.upper())
+            
+            if key not in analyses:
+                analyses[key] = self.analyze_compliance(business_type, size, jurisdiction)
+            
+            yield {"index": index, "profile": profile, **analyses[key]}
+    
     def search_policies(self, query: str):
         """Search for policies"""
         return self.search_tool.search_policies(query)
@@ -133,39 +486,205 @@ class PolicyNavigatorAgent:
             return f"Policy Navigator Agent deployed with ID: {self.agent.id}"
         return "Agent not created yet"
     
+    def load_local_data(self):
+        """Index the sample dataset and documents from earlier bulk ingest runs, without the network"""
+        # Load sample policy dataset
+        self.dataset_loader.load_sample_policy_dataset()
+        
+        # Load documents from previous bulk ingest runs
+        documents_path = self.config['vector_store'].get('documents_path')
+        if documents_path and os.path.exists(documents_path):
+            self.dataset_loader.load_ingested_documents(documents_path)
+    
     def _load_initial_data(self):
         """Load initial datasets as required by PDF"""
         try:
-            # Load sample policy dataset
-            self.dataset_loader.load_sample_policy_dataset()
+            self.load_local_data()
+            
+            # Resume delivery of Slack alerts queued before a restart
+            outbox_path = self.config.get('slack_outbox', {}).get('path')
+            if outbox_path and os.path.exists(outbox_path):
+                self.external_tools.resume_outbox()
             
             # Load government websites
-            self.dataset_loader.load_government_websites()
+            websites = self.dataset_loader.load_government_websites(
+                self.config['data_sources'].get('government_websites'))
             
+            self.warmup_status.update({
+                "state": "ready",
+                "documents_indexed": self.vector_store.get_document_stats()["total_documents"],
+                "errors": websites.get("errors", [])
+            })
             print("✅ Initial datasets loaded successfully")
         except Exception as e:
+            self.warmup_status.update({"state": "failed", "error": str(e)})
             print(f"⚠️ Dataset loading failed: {e}")
+        finally:
+            self.warmup_status["finished_at"] = datetime.now().isoformat()
+            self._ready.set()
+        
+        if self.reindex_scheduler:
+            self.reindex_scheduler.start()
+    
+    def _create_reindex_scheduler(self):
+        """Create the background reindex scheduler from config, if enabled"""
+        reindex_config = self.config.get('reindex', {})
+        if not reindex_config.get('enabled', True):
+            return None
+        
+        yield_seconds = reindex_config.get('yield_seconds', 2)
+        return ReindexScheduler(
+            max_concurrency=reindex_config.get('max_concurrency', 2),
+            min_interval=reindex_config.get('min_interval', 900),
+            max_interval=reindex_config.get('max_interval', 86400),
+            initial_interval=reindex_config.get('initial_interval', 3600),
+            busy=lambda: time.time() - self._last_foreground < yield_seconds,
+            sources_provider=self._reindex_sources,
+            sources_version=lambda: (len(self.vector_store.indexed_urls), 'policy_watcher' in self._components),
+            discover_interval=reindex_config.get('discover_interval', 300)
+        )
+    
+    def _reindex_sources(self) -> Dict:
+        """Refreshable sources: every indexed URL plus the Federal Register feed"""
+        limit = self.config.get('reindex', {}).get('federal_register_limit', 20)
+        sources = {"federal_register:recent": lambda: self.dataset_loader.refresh_federal_register(limit)}
+        for url in list(self.vector_store.indexed_urls):
+            sources[f"url:{url}"] = lambda url=url: self.vector_store.refresh_url(url)
+        
+        # Tracked policies are re-checked once something is being watched
+        watch_config = self.config.get('policy_watch', {})
+        if watch_config.get('enabled', True) and (
+                'policy_watcher' in self._components or os.path.exists(watch_config.get('path', 'data/policy_watch.db'))):
+            sources["policy_watch:federal_register"] = self.policy_watcher.refresh
+        return sources
+    
+    def _create_policy_watcher(self):
+        from ..tools.federal_register_api import FederalRegisterAPI
+        from ..tools.policy_watcher import PolicyWatcher
+        watch_config = self.config.get('policy_watch', {})
+        return PolicyWatcher(
+            FederalRegisterAPI(),
+            on_change=lambda policy_info: self.external_tools.handle_policy_update(policy_info),
+            path=watch_config.get('path', 'data/policy_watch.db'),
+            batch_size=watch_config.get('batch_size', 50),
+            alert_on=watch_config.get('alert_on', ['amended', 'repealed'])
+        )
+    
+    def _create_context_builder(self):
+        """Create the local retrieval stage from config, if enabled"""
+        retrieval_config = self.config.get('retrieval', {})
+        if not retrieval_config.get('enabled', False):
+            return None
+        
+        return ContextBuilder(
+            self.vector_store,
+            token_budget=retrieval_config.get('token_budget', 1500),
+            candidates=retrieval_config.get('candidates', 20),
+            max_passages=retrieval_config.get('max_passages', 6),
+            mmr_lambda=retrieval_config.get('mmr_lambda', 0.7),
+            mode=retrieval_config.get('mode', 'lexical')
+        )
+    
+    def _agent_factory(self):
+        """Factory used to create and fetch the remote agent"""
+        if self.agent_factory is None:
+            from aixplain.factories import AgentFactory
+            self.agent_factory = AgentFactory
+        return self.agent_factory
+    
+    def _component(self, name: str, factory):
+        """Create a tool component on first use and reuse it afterwards"""
+        component = self._components.get(name)
+        if component is None:
+            with self._components_lock:
+                component = self._components.get(name)
+                if component is None:
+                    component = self._components[name] = factory()
+        return component
     
     def upload_document(self, file_path: str) -> Dict:
         """Upload and index policy document"""
         return self.vector_store.upload_document(file_path)
     
+    def upload_stream(self, chunks, filename: str) -> Dict:
+        """Index a policy document as its bytes arrive (text, PDF or DOCX)"""
+        return self.vector_store.upload_stream(chunks, filename)
+    
     def index_url(self, url: str) -> Dict:
         """Index content from government/regulatory URL"""
         return self.vector_store.index_url(url)
     
-    def search_indexed_content(self, query: str) -> List[Dict]:
+    def search_indexed_content(self, query: str, limit: int = 5, mode: str = None) -> List[Dict]:
         """Search through indexed documents"""
-        return self.vector_store.search_documents(query)
+        return self.vector_store.search_documents(query, limit, mode or self._search_mode())
+    
+    def search_indexed_page(self, query: str, limit: int = 5, cursor: str = None, mode: str = None) -> Dict:
+        """One page of indexed-document results with highlighted snippets, plus the next cursor"""
+        return self.vector_store.search_page(query, limit, cursor, mode or self._search_mode())
     
-    def send_policy_alert(self, policy_info: Dict) -> Dict:
-        """Send policy update to external tools (Slack/Notion/Calendar)"""
+    def _search_mode(self) -> str:
+        return self.config['vector_store'].get('search_mode', 'lexical')
+    
+    def send_policy_alert(self, policy_info: Dict, background: bool = False) -> Dict:
+        """Send policy update to external tools (Slack/Notion/Calendar)
+        
+        With ``background=True`` the update is dispatched and this returns
+        immediately, without the per-integration results; QueueFullError is
+        raised when too many dispatches are already pending.
+        """
+        if background:
+            self.external_tools.dispatch_policy_update(policy_info)
+            return {"status": "dispatched"}
         return self.external_tools.handle_policy_update(policy_info)
     
+    def watch_policy(self, policy_id: str = None, document_number: str = None) -> Dict:
+        """Track a policy for changes; alerts go out when it is amended or repealed"""
+        if not policy_id and not document_number:
+            return {"status": "error", "message": "policy_id or document_number is required"}
+        
+        document_number = document_number or self.policy_watcher.resolve_policy(policy_id)
+        if document_number is None:
+            return {"status": "not_found", "message": f"No Federal Register document found for {policy_id}"}
+        
+        added = self.policy_watcher.track(document_number, policy_id)
+        return {"status": "watching" if added else "already_watching",
+                "policy_id": policy_id or document_number, "document_number": document_number}
+    
     def get_system_stats(self) -> Dict:
         """Get comprehensive system statistics"""
         return {
             "vector_store": self.vector_store.get_document_stats(),
             "datasets": self.dataset_loader.get_loaded_datasets(),
-            "agent_status": "active" if self.agent else "not_created"
-        }
\ No newline at end of file
+            "agent_status": "active" if self.agent else "not_created",
+            "warmup": dict(self.warmup_status),
+            "answer_cache": self.answer_cache.get_stats() if self.answer_cache else None,
+            "external_tools": self._external_tools_stats(),
+            "reindex": self.reindex_scheduler.get_stats() if self.reindex_scheduler else None,
+            "policy_watch": self._components['policy_watcher'].get_stats() if 'policy_watcher' in self._components else None
+        }
+    
+    def close(self, wait: bool = True):
+        """Stop background work: reindexing, alert dispatch and document extraction"""
+        if self.reindex_scheduler:
+            self.reindex_scheduler.stop(wait)
+        tools = self._components.get('external_tools')
+        if tools is not None:
+            tools.close(wait)
+        self.vector_store.parser.close()
+
+    def _external_tools_stats(self):
+        tools = self._components.get('external_tools')
+        return tools.get_stats() if tools is not None else None
+    
+    def _create_answer_cache(self):
+        """Create the semantic answer cache from config, if enabled"""
+        cache_config = self.config.get('answer_cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        
+        return SemanticAnswerCache(
+            similarity_threshold=cache_config.get('similarity_threshold', 0.9),
+            ttl_seconds=cache_config.get('ttl_seconds', 86400),
+            max_entries=cache_config.get('max_entries', 1000),
+            persist_path=cache_config.get('persist_path')
+        )
\ No newline at end of file
@@ -0,0 +1,160 @@
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .document_parser import DocumentParser, iter_file_chunks
+from .document_store import DocumentStore
+
+SUPPORTED_EXTENSIONS = {".txt", ".md", ".pdf", ".docx"}
+
+def _parse_file(path: str, max_file_size: int) -> Dict:
+    """Parse one file (runs in a worker process)"""
+    try:
+        parsed = DocumentParser(max_file_size=max_file_size, workers=1).parse(iter_file_chunks(path), path)
+        return {"path": path, "status": "indexed", **parsed}
+    except Exception as e:
+        return {"path": path, "status": "failed", "error": str(e)}
+
+class BulkIngestor:
+    """Parse a directory tree of documents in a process pool into a DocumentStore
+
+    Files are parsed in parallel with a bounded number in flight, written to
+    the store in batches, and recorded in a JSON Lines manifest after each
+    batch. Files already in the manifest with the same size and modification
+    time are skipped, so an interrupted run resumes where it stopped; files
+    that failed to parse are skipped too unless ``retry_failed`` is set.
+    """
+
+    def __init__(self, store: DocumentStore, manifest_path: str = "data/ingest_manifest.jsonl",
+                 workers: Optional[int] = None, batch_size: int = 200,
+                 max_file_size: int = 50 * 1024 * 1024, doc_type: str = "policy"):
+        self.store = store
+        self.manifest_path = manifest_path
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_file_size = max_file_size
+        self.doc_type = doc_type
+
+    def discover(self, root: str) -> Iterator[Tuple[str, int, float]]:
+        """Yield (path, size, mtime) for supported files under root, in a stable order"""
+        for directory, subdirectories, filenames in os.walk(root):
+            subdirectories.sort()
+            for filename in sorted(filenames):
+                if os.path.splitext(filename)[1].lower() not in SUPPORTED_EXTENSIONS:
+                    continue
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+                yield path, stat.st_size, stat.st_mtime
+
+    def load_manifest(self) -> Dict[str, Tuple[int, float, str]]:
+        """Files already processed, as path -> (size, mtime, status); the latest entry wins"""
+        done = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    done[entry["path"]] = (entry["size"], entry["mtime"], entry.get("status", "indexed"))
+        return done
+
+    def plan(self, root: str, retry_failed: bool = False) -> Tuple[List[Tuple[str, int, float]], int]:
+        """Split discovered files into (pending files, number already done)
+
+        Unchanged files that failed last time count as done unless
+        ``retry_failed`` is set, so a broken file is not re-parsed every run.
+        """
+        done = self.load_manifest()
+        pending, skipped = [], 0
+        for path, size, mtime in self.discover(root):
+            entry = done.get(os.path.abspath(path))
+            if entry and entry[:2] == (size, mtime) and (entry[2] == "indexed" or not retry_failed):
+                skipped += 1
+            else:
+                pending.append((path, size, mtime))
+        return pending, skipped
+
+    def run(self, pending: List[Tuple[str, int, float]],
+            progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """Ingest pending files; progress(files, bytes) is called as each file finishes"""
+        stats = {"indexed": 0, "failed": 0, "bytes": 0, "errors": []}
+        sizes = {path: (size, mtime) for path, size, mtime in pending}
+        batch = []
+        start = time.perf_counter()
+
+        # Results gathered before an interruption are still committed
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                queue = iter(pending)
+                in_flight = set()
+                max_in_flight = self.workers * 4
+
+                while True:
+                    for path, _, _ in queue:
+                        in_flight.add(pool.submit(_parse_file, path, self.max_file_size))
+                        if len(in_flight) >= max_in_flight:
+                            break
+                    if not in_flight:
+                        break
+
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        result = future.result()
+                        size, mtime = sizes[result["path"]]
+                        batch.append((result, size, mtime))
+
+                        stats[result["status"]] += 1
+                        stats["bytes"] += size
+                        if result["status"] == "failed":
+                            stats["errors"].append({"path": result["path"], "error": result["error"]})
+                        if progress:
+                            progress(1, size)
+
+                    if len(batch) >= self.batch_size:
+                        ready, batch = batch, []
+                        self._commit(ready)
+        finally:
+            self._commit(batch)
+
+        elapsed = time.perf_counter() - start
+        stats.update({
+            "elapsed_seconds": elapsed,
+            "docs_per_second": (stats["indexed"] + stats["failed"]) / elapsed if elapsed else 0.0,
+            "mb_per_second": stats["bytes"] / (1024 * 1024) / elapsed if elapsed else 0.0
+        })
+        return stats
+
+    def _commit(self, batch: List[Tuple[Dict, int, float]]):
+        """Write a batch to the store, then checkpoint it in the manifest"""
+        if not batch:
+            return
+
+        self.store.append([
+            {
+                "content": result["content"],
+                "metadata": {
+                    "source": "bulk_ingest",
+                    "type": self.doc_type,
+                    "file_path": os.path.abspath(result["path"]),
+                    "filename": os.path.basename(result["path"]),
+                    "format": result["format"],
+                    "pages": result["pages"],
+                    "bytes": result["bytes"]
+                }
+            }
+            for result, _, _ in batch if result["status"] == "indexed"
+        ])
+
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            for result, size, mtime in batch:
+                entry = {"path": os.path.abspath(result["path"]), "size": size, "mtime": mtime, "status": result["status"]}
+                if result["status"] == "failed":
+                    entry["error"] = result["error"]
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
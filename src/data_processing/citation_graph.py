@@ -0,0 +1,198 @@
+import re
+import threading
+from array import array
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from .citations import extract_citations
+
+RELATIONS = ["cites", "amends", "revokes"]
+_RELATION_IDS = {name: index for index, name in enumerate(RELATIONS)}
+
+# Citations use periods ("E.O. 14067", "42 U.S.C."), so sentences are split on
+# periods only when they end a word of three or more letters or a number
+_SENTENCE_END = re.compile(r"(?<=[a-z]{3}[.!?])\s+(?=[A-Z])|(?<=\d[.!?])\s+(?=[A-Z])|[;\n]+")
+_REVOKE = r"revok\w*|rescind\w*|rescission|repeal\w*|supersed\w*|vacat\w*"
+_AMEND = r"amend\w*|modif\w*|supplement\w*"
+_PASSIVE = re.compile(rf"\b(?:{_REVOKE}|{_AMEND})\s+(?:in\s+(?:part|whole)\s+)?by\b", re.I)
+_REVOKE_WORD = re.compile(rf"\b(?:{_REVOKE})\b", re.I)
+_AMEND_WORD = re.compile(rf"\b(?:{_AMEND})\b", re.I)
+_VERB = re.compile(rf"\b(?:{_REVOKE}|{_AMEND})\b", re.I)
+# "does not revoke", "Nothing in this order amends", "shall not be construed to modify"
+# ("No." alone is part of citations such as "Executive Order No. 14067")
+_NEGATION = re.compile(r"\b(?:not|never|nothing|neither|nor|no\s+(?:provision|part|section))\b|n't\b", re.I)
+
+def sentences(text: str) -> List[str]:
+    return [sentence for sentence in _SENTENCE_END.split(text) if sentence and sentence.strip()]
+
+def extract_edges(self_key: Optional[str], text: str) -> List[Tuple[str, str, str]]:
+    """(source, relation, target) citation edges stated in a document
+
+    Sentence by sentence: "EO 14067 is revoked by EO 14148" gives
+    EO 14148 -revokes-> EO 14067 whichever document says it; otherwise a
+    sentence with a revoking or amending verb makes the document itself
+    (``self_key``) revoke or amend every policy the sentence cites, and any
+    other citation is a plain "cites" edge from the document. Sentences
+    whose verb is negated ("Nothing in this order revokes ...") state no
+    relation and are skipped.
+    """
+    edges = []
+    for sentence in sentences(text):
+        keys = list(dict.fromkeys(extract_citations(sentence)))
+        if not keys:
+            continue
+        verb = _VERB.search(sentence)
+        if verb and _NEGATION.search(sentence, 0, verb.start()):
+            continue
+
+        passive = _PASSIVE.search(sentence)
+        if passive:
+            relation = "revokes" if _REVOKE_WORD.search(passive.group()) else "amends"
+            before = list(dict.fromkeys(extract_citations(sentence[:passive.start()])))
+            after = list(dict.fromkeys(extract_citations(sentence[passive.end():])))
+            targets = before or ([self_key] if self_key else [])
+            edges.extend((source, relation, target) for source in after[:1] for target in targets if source != target)
+            continue
+
+        if self_key is None:
+            continue
+        relation = "revokes" if _REVOKE_WORD.search(sentence) else "amends" if _AMEND_WORD.search(sentence) else "cites"
+        edges.extend((self_key, relation, key) for key in keys if key != self_key)
+    return list(dict.fromkeys(edges))
+
+class CitationGraph:
+    """Directed graph of policies (canonical citation keys) and how they cite each other
+
+    Edges are stored per document, so re-indexing or removing a document
+    replaces exactly its edges. Queries run on a compressed sparse row (CSR)
+    layout in both directions: node IDs are ints, each node's edges are one
+    contiguous slice of flat ``array`` buffers, and a multi-hop traversal
+    is a breadth-first walk over those slices. The CSR arrays are rebuilt
+    lazily, on the first query after a change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._doc_edges = {}  # doc_id -> [(source, relation, target)]
+        self._node_ids = {}  # key -> int
+        self._keys = []  # int -> key
+        self._dirty = False
+        self._out = self._in = None  # (offsets, neighbours, relations, edge index)
+        self._edge_docs = []  # edge index -> doc_id
+
+    def add(self, doc_id: str, edges: Iterable[Tuple[str, str, str]]):
+        with self._lock:
+            self._doc_edges[doc_id] = list(edges)
+            self._dirty = True
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            if self._doc_edges.pop(doc_id, None) is not None:
+                self._dirty = True
+
+    def neighbours(self, key: str, direction: str = "in", relations: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Direct edges: "in" lists who cites/amends/revokes ``key``, "out" what ``key`` does"""
+        return self.traverse(key, direction, relations, max_hops=1)
+
+    def traverse(self, key: str, direction: str = "in", relations: Optional[Iterable[str]] = None,
+                 max_hops: int = 3) -> List[Dict]:
+        """Policies reachable from ``key`` within ``max_hops`` edges of the given relations
+
+        ``traverse(key, "in", ["revokes", "amends"])`` is "what supersedes X",
+        transitively; ``traverse(key, "in")`` is "everything citing X". Each
+        result has the key, its hop count, the relation and the policy it was
+        reached from, and the documents stating that edge.
+        """
+        wanted = {_RELATION_IDS[name] for name in (relations or RELATIONS)}
+        with self._lock:
+            self._rebuild()
+            start = self._node_ids.get(key)
+            if start is None:
+                return []
+            offsets, neighbours, edge_relations, edge_index = self._in if direction == "in" else self._out
+
+            found, seen = [], {start}
+            queue = deque([(start, 0)])
+            while queue:
+                node, hops = queue.popleft()
+                if hops >= max_hops:
+                    continue
+                for position in range(offsets[node], offsets[node + 1]):
+                    if edge_relations[position] not in wanted:
+                        continue
+                    neighbour = neighbours[position]
+                    if neighbour in seen:
+                        continue
+                    seen.add(neighbour)
+                    found.append({
+                        "key": self._keys[neighbour],
+                        "hops": hops + 1,
+                        "relation": RELATIONS[edge_relations[position]],
+                        "via": self._keys[node],
+                        "doc_id": self._edge_docs[edge_index[position]]
+                    })
+                    queue.append((neighbour, hops + 1))
+        return found
+
+    def status(self, key: str) -> Optional[Dict]:
+        """"revoked" or "amended" when an indexed document says so, else "active" (None if unknown)
+
+        "superseded_by" follows revocations transitively, so a chain of
+        replacements ends at the policy currently in force.
+        """
+        incoming = self.neighbours(key, "in", ["revokes", "amends"])
+        if not incoming:
+            with self._lock:
+                known = key in self._node_ids
+            return {"status": "active", "revoked_by": [], "amended_by": [], "superseded_by": []} if known else None
+
+        revoked_by = [edge for edge in incoming if edge["relation"] == "revokes"]
+        return {
+            "status": "revoked" if revoked_by else "amended",
+            "revoked_by": [{"key": edge["key"], "doc_id": edge["doc_id"]} for edge in revoked_by],
+            "amended_by": [{"key": edge["key"], "doc_id": edge["doc_id"]}
+                           for edge in incoming if edge["relation"] == "amends"],
+            "superseded_by": [edge["key"] for edge in self.traverse(key, "in", ["revokes"], max_hops=10)]
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._rebuild()
+            return {"nodes": len(self._keys), "edges": len(self._edge_docs), "documents": len(self._doc_edges)}
+
+    def _node(self, key: str) -> int:
+        node = self._node_ids.get(key)
+        if node is None:
+            node = self._node_ids[key] = len(self._keys)
+            self._keys.append(key)
+        return node
+
+    def _rebuild(self):
+        # Callers hold self._lock
+        if not self._dirty and self._out is not None:
+            return
+        self._node_ids, self._keys = {}, []
+        edges, self._edge_docs = [], []
+        for doc_id, doc_edges in self._doc_edges.items():
+            for source, relation, target in doc_edges:
+                edges.append((self._node(source), _RELATION_IDS[relation], self._node(target), len(self._edge_docs)))
+                self._edge_docs.append(doc_id)
+        self._out = self._csr(edges, len(self._keys), reverse=False)
+        self._in = self._csr(edges, len(self._keys), reverse=True)
+        self._dirty = False
+
+    @staticmethod
+    def _csr(edges, node_count: int, reverse: bool):
+        buckets = defaultdict(list)
+        for source, relation, target, index in edges:
+            if reverse:
+                source, target = target, source
+            buckets[source].append((target, relation, index))
+
+        offsets, neighbours, relations, edge_index = array("I", [0]), array("I"), array("B"), array("I")
+        for node in range(node_count):
+            for target, relation, index in buckets.get(node, ()):
+                neighbours.append(target)
+                relations.append(relation)
+                edge_index.append(index)
+            offsets.append(len(neighbours))
+        return offsets, neighbours, relations, edge_index
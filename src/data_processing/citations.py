@@ -0,0 +1,207 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+# Well-known acronyms; more are learned from "Long Name (ACRONYM)" definitions at ingest
+KNOWN_ACRONYMS = {
+    "ada": "americans with disabilities act",
+    "ccpa": "california consumer privacy act",
+    "cda": "communications decency act",
+    "coppa": "childrens online privacy protection act",
+    "fcpa": "foreign corrupt practices act",
+    "ferpa": "family educational rights and privacy act",
+    "flsa": "fair labor standards act",
+    "gdpr": "general data protection regulation",
+    "glba": "gramm leach bliley act",
+    "hipaa": "health insurance portability and accountability act",
+    "nepa": "national environmental policy act",
+    "osha": "occupational safety and health act",
+    "sox": "sarbanes oxley act",
+}
+
+_EO = re.compile(r"\b(?:executive\s+order|exec\.?\s+order|e\.\s?o\.?|eo)\s*(?:no\.?\s*|#\s*|-\s*)?(\d{4,5})\b", re.I)
+_USC = re.compile(r"\b(\d{1,2})\s*u\.?\s?s\.?\s?c\.?\s*(?:§+\s*|sec(?:tion)?\.?\s*)?(\d+[a-z]?)\b", re.I)
+_CFR = re.compile(r"\b(\d{1,2})\s*c\.?\s?f\.?\s?r\.?\s*(?:part\s*|§+\s*|sec(?:tion)?\.?\s*)?(\d+)(?:\.(\d+))?\b", re.I)
+_PUBLIC_LAW = re.compile(r"\b(?:public\s+law|pub\.?\s*l\.?|p\.\s?l\.)\s*(?:no\.?\s*)?(\d{2,3})\s*[-–]\s*(\d{1,3})\b", re.I)
+_DEFINITION = re.compile(r"\b((?:[A-Z][A-Za-z'’-]+\s+)(?:(?:of|and|for|on|the|[A-Z][A-Za-z'’-]+)\s+){0,7}[A-Z][A-Za-z'’-]+)"
+                         r"\s*\(([A-Z]{2,8})\)")
+_MINOR_WORDS = {"of", "and", "for", "on", "the", "to", "in"}
+
+def normalize_name(text: str) -> str:
+    """Lowercase words only: "Children's Online Privacy Protection Act" -> "childrens online privacy protection act" """
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower().replace("'", "").replace("’", "")))
+
+def extract_citations(text: str) -> List[str]:
+    """Canonical keys for every legal citation in text, in order of appearance
+
+    "EO-14067", "E.O. 14067" and "Executive Order 14067" all become
+    ``eo:14067``; "42 U.S.C. § 7401" becomes ``usc:42:7401``; "45 CFR
+    164.502" becomes ``cfr:45:164`` and ``cfr:45:164.502``; "Pub. L.
+    117-58" becomes ``pl:117-58``.
+    """
+    found = []
+    for match in _EO.finditer(text):
+        found.append((match.start(), f"eo:{int(match.group(1))}"))
+    for match in _USC.finditer(text):
+        found.append((match.start(), f"usc:{int(match.group(1))}:{match.group(2).lower()}"))
+    for match in _CFR.finditer(text):
+        title, part, section = int(match.group(1)), int(match.group(2)), match.group(3)
+        found.append((match.start(), f"cfr:{title}:{part}"))
+        if section:
+            found.append((match.start(), f"cfr:{title}:{part}.{section}"))
+    for match in _PUBLIC_LAW.finditer(text):
+        found.append((match.start(), f"pl:{int(match.group(1))}-{int(match.group(2))}"))
+    return [key for _, key in sorted(found)]
+
+def display_name(key: str) -> str:
+    """A readable form of a canonical key, suitable as a remote search term"""
+    kind, _, rest = key.partition(":")
+    if kind == "eo":
+        return f"Executive Order {rest}"
+    if kind == "usc":
+        return "{} U.S.C. {}".format(*rest.split(":"))
+    if kind == "cfr":
+        return "{} CFR {}".format(*rest.split(":"))
+    if kind == "pl":
+        return f"Public Law {rest}"
+    return rest.upper()
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class AliasIndex:
+    """Map the many spellings of a policy to one canonical key, and keys to documents
+
+    Citations (executive orders, U.S.C. and CFR sections, public laws) and
+    acronyms are extracted when a document is indexed. ``resolve`` turns a
+    lookup string into its canonical key with a regex pass and a dict
+    lookup, independent of corpus size; names that do not resolve exactly
+    fall back to trigram similarity against known names, so "Genral Data
+    Protection Regulaton" still finds GDPR. Numbered citations are never
+    matched fuzzily: EO 14076 is not a typo for EO 14067.
+    """
+
+    def __init__(self, acronyms: Optional[Dict[str, str]] = None, min_similarity: float = 0.5):
+        self.min_similarity = min_similarity
+        self.acronyms = dict(KNOWN_ACRONYMS if acronyms is None else acronyms)  # acronym -> long name
+        self.long_names = {name: acronym for acronym, name in self.acronyms.items()}
+        self.documents = defaultdict(set)  # canonical key -> {doc_id}
+        self._doc_keys = {}  # doc_id -> [key, ...]
+        self._trigrams = defaultdict(set)  # trigram -> {name}
+        self._name_trigrams = {}  # name -> its trigrams
+        for acronym, name in self.acronyms.items():
+            self._add_name(acronym)
+            self._add_name(name)
+
+    def add(self, doc_id: str, text: str):
+        """Index a document's citations and acronyms (title and content together)"""
+        for long_name, acronym in _DEFINITION.findall(text):
+            self._learn(acronym, long_name)
+
+        keys = set(extract_citations(text))
+        words = normalize_name(text)
+        padded = f" {words} "
+        for acronym, name in self.acronyms.items():
+            if f" {acronym} " in padded or f" {name} " in padded:
+                keys.add(f"name:{acronym}")
+
+        self._doc_keys[doc_id] = sorted(keys)
+        for key in keys:
+            self.documents[key].add(doc_id)
+
+    def remove(self, doc_id: str):
+        for key in self._doc_keys.pop(doc_id, []):
+            documents = self.documents.get(key)
+            if documents is not None:
+                documents.discard(doc_id)
+                if not documents:
+                    del self.documents[key]
+
+    def keys_for(self, doc_id: str) -> List[str]:
+        return list(self._doc_keys.get(doc_id, []))
+
+    def canonical_key(self, query: str) -> Optional[str]:
+        """The canonical key of the first citation or name in a lookup string, or None"""
+        citations = extract_citations(query)
+        return citations[0] if citations else self.exact_key(query)
+
+    def exact_key(self, text: str) -> Optional[str]:
+        """The canonical key when text is nothing but one citation or policy name"""
+        stripped = text.strip()
+        for pattern in (_EO, _USC, _CFR, _PUBLIC_LAW):
+            if pattern.fullmatch(stripped):
+                return extract_citations(stripped)[-1]
+        name = normalize_name(stripped)
+        if name in self.acronyms:
+            return f"name:{name}"
+        if name in self.long_names:
+            return f"name:{self.long_names[name]}"
+        return None
+
+    def resolve(self, query: str) -> Optional[Dict]:
+        """{"key", "name", "match": "exact" | "fuzzy", "similarity", "doc_ids"} for a lookup string, or None"""
+        key = self.canonical_key(query)
+        if key is not None:
+            return self._resolution(key, "exact", 1.0)
+
+        name = normalize_name(query)
+        if not name or any(character.isdigit() for character in name):
+            return None
+        best, similarity = self._closest_name(name)
+        if best is None:
+            return None
+        acronym = best if best in self.acronyms else self.long_names[best]
+        return self._resolution(f"name:{acronym}", "fuzzy", similarity)
+
+    def display_name(self, key: str) -> str:
+        kind, _, rest = key.partition(":")
+        if kind == "name":
+            return self.acronyms.get(rest, rest).title()
+        return display_name(key)
+
+    def get_stats(self) -> Dict:
+        return {"keys": len(self.documents), "documents": len(self._doc_keys), "acronyms": len(self.acronyms)}
+
+    def _resolution(self, key: str, match: str, similarity: float) -> Dict:
+        return {"key": key, "name": self.display_name(key), "match": match, "similarity": round(similarity, 3),
+                "doc_ids": sorted(self.documents.get(key, ()))}
+
+    def _closest_name(self, name: str):
+        grams = trigrams(name)
+        overlaps = defaultdict(int)
+        for gram in grams:
+            for candidate in self._trigrams.get(gram, ()):
+                overlaps[candidate] += 1
+
+        best, best_similarity = None, 0.0
+        for candidate, overlap in overlaps.items():
+            similarity = overlap / (len(grams) + len(self._name_trigrams[candidate]) - overlap)
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+        return (best, best_similarity) if best_similarity >= self.min_similarity else (None, 0.0)
+
+    def _learn(self, acronym: str, long_name: str):
+        words = normalize_name(long_name).split()
+        # Trim leading words until the initials line up with the acronym ("The General Data ... (GDPR)")
+        letters = acronym.lower()
+        while words and words[0] in _MINOR_WORDS:
+            words = words[1:]
+        while words:
+            initials = "".join(word[0] for word in words if word not in _MINOR_WORDS)
+            if initials == letters:
+                break
+            words = words[1:]
+        if not words or letters in self.acronyms:
+            return
+        name = " ".join(words)
+        self.acronyms[letters] = name
+        self.long_names.setdefault(name, letters)
+        self._add_name(letters)
+        self._add_name(name)
+
+    def _add_name(self, name: str):
+        grams = trigrams(name)
+        self._name_trigrams[name] = grams
+        for gram in grams:
+            self._trigrams[gram].add(name)
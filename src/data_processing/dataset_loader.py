@@ -1,13 +1,18 @@
 import os
-import pandas as pd
-import requests
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .vector_store import VectorStoreManager
 
+GOVERNMENT_WEBSITES = [
+    "https://www.federalregister.gov/",
+    "https://www.epa.gov/laws-regulations",
+    "https://www.cdc.gov/policy/"
+]
+
 class DatasetLoader:
     def __init__(self, vector_store: VectorStoreManager):
         self.vector_store = vector_store
         self.loaded_datasets = []
+        self.federal_register_documents = set()  # document numbers already indexed
     
     def load_sample_policy_dataset(self) -> Dict:
         """Load sample policy dataset"""
@@ -58,13 +63,9 @@ class DatasetLoader:
             "status": "loaded"
         }
     
-    def load_government_websites(self) -> Dict:
-        """Load content from government websites"""
-        gov_urls = [
-            "https://www.federalregister.gov/",
-            "https://www.epa.gov/laws-regulations",
-            "https://www.cdc.gov/policy/"
-        ]
+    def load_government_websites(self, urls: Optional[List[str]] = None) -> Dict:
+        """Load content from government websites (``GOVERNMENT_WEBSITES`` unless ``urls`` is given)"""
+        gov_urls = GOVERNMENT_WEBSITES if urls is None else urls
         
         indexed_count = 0
         errors = []
@@ -91,6 +92,8 @@ class DatasetLoader:
     
     def load_csv_dataset(self, file_path: str) -> Dict:
         """Load policy data from CSV file"""
+        import pandas as pd
+        
         try:
             df = pd.read_csv(file_path)
             indexed_count = 0
@@ -124,6 +127,55 @@ class DatasetLoader:
                 "error": str(e)
             }
     
+    def refresh_federal_register(self, limit: int = 20) -> bool:
+        """Index Federal Register documents published since the last refresh; returns whether any were new"""
+        from ..tools.federal_register_api import FederalRegisterAPI
+        
+        new_documents = [
+            document for document in FederalRegisterAPI().get_recent_documents(limit)
+            if document.get('document_number') not in self.federal_register_documents
+        ]
+        
+        self.vector_store.add_documents([
+            {
+                "content": f"{document.get('title', '')}\n\n{document.get('abstract') or ''}",
+                "metadata": {
+                    "source": "federal_register",
+                    "title": document.get('title', ''),
+                    "url": document.get('html_url'),
+                    "type": document.get('type', 'federal_register_document'),
+                    "document_number": document.get('document_number'),
+                    "publication_date": document.get('publication_date')
+                }
+            }
+            for document in new_documents
+        ])
+        self.federal_register_documents.update(document.get('document_number') for document in new_documents)
+        return bool(new_documents)
+    
+    def load_ingested_documents(self, store_path: str, batch_size: int = 1000) -> Dict:
+        """Load documents written by the bulk ingest command"""
+        from .document_store import DocumentStore
+        
+        store = DocumentStore(store_path)
+        indexed_count = 0
+        batch = []
+        
+        for document in store.iter_documents():
+            batch.append(document)
+            if len(batch) >= batch_size:
+                indexed_count += len(self.vector_store.add_documents(batch))
+                batch = []
+        indexed_count += len(self.vector_store.add_documents(batch))
+        
+        self.loaded_datasets.append("ingested_documents")
+        
+        return {
+            "dataset": "ingested_documents",
+            "documents_indexed": indexed_count,
+            "status": "loaded"
+        }
+    
     def get_loaded_datasets(self) -> List[str]:
         """Get list of loaded datasets"""
         return self.loaded_datasets
\ No newline at end of file
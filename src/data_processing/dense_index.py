@@ -0,0 +1,76 @@
+import heapq
+from array import array
+from typing import List, Optional, Tuple
+from ..utils.embeddings import HashingEmbedder
+
+class DenseIndex:
+    """Embedding index over the same passages as the lexical index
+
+    Each passage is embedded once when it is added. Vectors are sparse, so
+    they are stored inverted and a query only visits the dimensions it
+    has. Each dimension's postings are two parallel flat arrays (chunk IDs
+    as ``array("I")``, weights as ``array("f")``), about 8 bytes per
+    posting instead of a dict entry. Removed passages are tombstoned and
+    dropped from the arrays once they make up a quarter of the index.
+    Passages below ``min_similarity`` are not returned, so unrelated
+    queries come back empty.
+    """
+
+    def __init__(self, embedder: Optional[HashingEmbedder] = None, min_similarity: float = 0.1):
+        self.embedder = embedder or HashingEmbedder()
+        self.min_similarity = min_similarity
+        self.postings = {}  # dimension -> (array of chunk IDs, array of weights)
+        self._chunk_count = 0
+        self._id_limit = 0  # one past the highest chunk ID added
+        self._removed = set()  # tombstoned chunk IDs still in the posting arrays
+
+    def add(self, chunk_id: int, text: str):
+        for dimension, weight in self.embedder.embed(text).items():
+            postings = self.postings.get(dimension)
+            if postings is None:
+                postings = self.postings[dimension] = (array("I"), array("f"))
+            postings[0].append(chunk_id)
+            postings[1].append(weight)
+        self._chunk_count += 1
+        self._id_limit = max(self._id_limit, chunk_id + 1)
+
+    def remove(self, chunk_id: int):
+        # Chunk IDs are never reused, so a tombstone cannot hide a later passage
+        if chunk_id in self._removed:
+            return
+        self._removed.add(chunk_id)
+        if len(self._removed) * 4 > self._chunk_count:
+            self._compact()
+
+    def _compact(self):
+        removed = self._removed
+        for dimension, (chunk_ids, weights) in list(self.postings.items()):
+            kept = [i for i, chunk_id in enumerate(chunk_ids) if chunk_id not in removed]
+            if not kept:
+                del self.postings[dimension]
+            elif len(kept) < len(chunk_ids):
+                self.postings[dimension] = (array("I", (chunk_ids[i] for i in kept)),
+                                            array("f", (weights[i] for i in kept)))
+        self._chunk_count -= len(removed)
+        self._removed = set()
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Tuple[int, float]]:
+        """Rank passages by cosine similarity to the query, as (chunk_id, similarity) pairs"""
+        # Chunk IDs are dense, so scores accumulate in a list indexed by ID
+        scores = [0.0] * self._id_limit
+        for dimension, weight in self.embedder.embed(query).items():
+            postings = self.postings.get(dimension)
+            if postings is None:
+                continue
+            for chunk_id, chunk_weight in zip(*postings):
+                scores[chunk_id] += weight * chunk_weight
+
+        removed, threshold = self._removed, self.min_similarity
+        matches = ((chunk_id, score) for chunk_id, score in enumerate(scores)
+                   if score >= threshold and chunk_id not in removed)
+        if limit is None:
+            return sorted(matches, key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(limit, matches, key=lambda item: item[1])
+
+    def __len__(self) -> int:
+        return self._chunk_count - len(self._removed)
@@ -0,0 +1,159 @@
+import codecs
+import io
+import itertools
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+from xml.etree.ElementTree import iterparse
+
+CHUNK_SIZE = 64 * 1024
+
+DOCX_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+class DocumentTooLargeError(Exception):
+    """Raised while streaming an upload once it exceeds the size limit"""
+
+class UnsupportedDocumentError(Exception):
+    """Raised when an upload's format cannot be extracted"""
+
+def iter_file_chunks(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a file as a stream of byte chunks"""
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            yield chunk
+
+def limit_size(chunks: Iterable[bytes], max_bytes: int) -> Iterator[bytes]:
+    """Pass chunks through, raising DocumentTooLargeError as soon as max_bytes is exceeded"""
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        if total > max_bytes:
+            raise DocumentTooLargeError(f"Document exceeds the {max_bytes} byte upload limit")
+        yield chunk
+
+def _extract_pdf_pages(path: str, start: int, end: int) -> List[str]:
+    """Extract text from pages [start, end) of a PDF file (runs in a worker process)"""
+    from pypdf import PdfReader
+    with open(path, "rb") as f:
+        reader = PdfReader(f)
+        return [reader.pages[number].extract_text() or "" for number in range(start, end)]
+
+class DocumentParser:
+    """Extract text from uploaded documents as their bytes stream in
+
+    Plain text is decoded chunk by chunk. PDF and DOCX keep their index at
+    the end of the file, so their bytes are gathered first (never more than
+    ``max_file_size``): DOCX in memory, its paragraphs read with an
+    incremental XML parser; PDFs in a temporary file that pypdf reads
+    pages from. PDFs with at least ``parallel_min_pages`` pages are split
+    into page ranges extracted in a shared process pool, each worker
+    opening the same file rather than receiving a copy of it.
+    """
+
+    def __init__(self, max_file_size: int = 50 * 1024 * 1024, workers: Optional[int] = None,
+                 parallel_min_pages: int = 32):
+        self.max_file_size = max_file_size
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min_pages = parallel_min_pages
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def parse(self, chunks: Iterable[bytes], filename: str) -> Dict:
+        """Extract {"content", "format", "pages", "bytes"} from a stream of byte chunks"""
+        chunks = iter(limit_size(chunks, self.max_file_size))
+        first = next(chunks, b"")
+        doc_format = self.detect_format(filename, first)
+        chunks = itertools.chain([first], chunks)
+
+        if doc_format == "text":
+            return self._parse_text(chunks)
+        if doc_format == "pdf":
+            return self._parse_pdf(chunks)
+
+        data = b"".join(chunks)
+        return {"content": self._parse_docx(data), "format": doc_format, "pages": None, "bytes": len(data)}
+
+    @staticmethod
+    def detect_format(filename: str, head: bytes) -> str:
+        """Detect the document format from its leading bytes and filename"""
+        extension = os.path.splitext(filename or "")[1].lower()
+        if head.startswith(b"%PDF") or extension == ".pdf":
+            return "pdf"
+        if head.startswith(b"PK") or extension == ".docx":
+            if extension not in ("", ".docx"):
+                raise UnsupportedDocumentError(f"Unsupported document type: {extension}")
+            return "docx"
+        return "text"
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _parse_text(self, chunks: Iterable[bytes]) -> Dict:
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        parts = []
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+        return {"content": "".join(parts), "format": "text", "pages": None, "bytes": size}
+
+    def _parse_pdf(self, chunks: Iterable[bytes]) -> Dict:
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise UnsupportedDocumentError("PDF uploads require the pypdf package")
+
+        size = 0
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    size += len(chunk)
+                    f.write(chunk)
+
+            with open(path, "rb") as f:
+                page_count = len(PdfReader(f).pages)
+            if page_count < self.parallel_min_pages or self.workers == 1:
+                texts = _extract_pdf_pages(path, 0, page_count)
+            else:
+                step = -(-page_count // self.workers)
+                ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+                pool = self._get_pool()
+                futures = [pool.submit(_extract_pdf_pages, path, start, end) for start, end in ranges]
+                texts = [text for future in futures for text in future.result()]
+        finally:
+            os.remove(path)
+
+        content = "\n\n".join(text.strip() for text in texts if text.strip())
+        return {"content": content, "format": "pdf", "pages": page_count, "bytes": size}
+
+    @staticmethod
+    def _parse_docx(data: bytes) -> str:
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(data))
+            document = archive.open("word/document.xml")
+        except (zipfile.BadZipFile, KeyError):
+            raise UnsupportedDocumentError("Not a valid DOCX document")
+
+        paragraphs = []
+        with archive, document:
+            for _, element in iterparse(document):
+                if element.tag == f"{DOCX_NAMESPACE}p":
+                    text = "".join(node.text or "" for node in element.iter(f"{DOCX_NAMESPACE}t"))
+                    if text.strip():
+                        paragraphs.append(text)
+                    element.clear()
+        return "\n".join(paragraphs)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
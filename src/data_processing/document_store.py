@@ -0,0 +1,47 @@
+import json
+import os
+from typing import Dict, Iterator, List
+
+class DocumentStore:
+    """Append-only JSON Lines file of ingested documents
+
+    Each line holds one document's content and metadata. Appends are
+    flushed and fsynced, so everything written before a crash is kept;
+    a partially written last line is ignored when reading. When a file
+    is ingested more than once, the latest copy wins.
+    """
+
+    def __init__(self, path: str = "data/documents.jsonl"):
+        self.path = path
+
+    def append(self, documents: List[Dict]):
+        """Durably append documents ({"content", "metadata"})"""
+        if not documents:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            for document in documents:
+                f.write(json.dumps({"content": document["content"], "metadata": document["metadata"]}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def iter_documents(self) -> Iterator[Dict]:
+        """Yield stored documents, one per source file"""
+        if not os.path.exists(self.path):
+            return
+
+        latest = {}
+        with open(self.path, encoding="utf-8") as f:
+            for number, line in enumerate(f):
+                try:
+                    document = json.loads(line)
+                except ValueError:
+                    continue
+                key = document["metadata"].get("file_path") or number
+                latest.pop(key, None)
+                latest[key] = document
+
+        yield from latest.values()
@@ -0,0 +1,96 @@
+import bisect
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+from ..utils.text import tokenize
+
+# Metadata fields that can be queried, and how their values are matched
+FIELDS = {
+    "title": "text",
+    "type": "keyword",
+    "jurisdiction": "keyword",
+    "source": "keyword",
+    "agency": "keyword",
+    "status": "keyword",
+    "effective_date": "date",
+    "publication_date": "date"
+}
+
+def keyword(value) -> str:
+    """Normalize a keyword value: case and spacing do not matter ("Executive Order" == "executive_order")"""
+    return "_".join(str(value).lower().replace("-", " ").replace("_", " ").split())
+
+class FieldIndex:
+    """Per-field lookups over document metadata for query filters
+
+    Keyword fields map each normalized value to its documents, text fields
+    (titles) map each word to its documents and keep the word sequence for
+    phrase checks, and date fields keep (date, doc_id) pairs sorted so a
+    range costs two binary searches.
+    """
+
+    def __init__(self, fields: Optional[Dict[str, str]] = None):
+        self.fields = fields or FIELDS
+        self.values = defaultdict(lambda: defaultdict(set))  # field -> value or word -> {doc_id}
+        self.words = defaultdict(dict)  # text field -> {doc_id: [word, ...]}
+        self.dates = defaultdict(list)  # date field -> sorted [(date, doc_id)]
+        self._documents = {}  # doc_id -> the indexed {field: value}
+
+    def add(self, doc_id: str, metadata: Dict):
+        indexed = {field: metadata[field] for field in self.fields if metadata.get(field) not in (None, "")}
+        self._documents[doc_id] = indexed
+        for field, value in indexed.items():
+            kind = self.fields[field]
+            if kind == "keyword":
+                self.values[field][keyword(value)].add(doc_id)
+            elif kind == "text":
+                words = tokenize(str(value), drop_stopwords=False)
+                self.words[field][doc_id] = words
+                for word in set(words):
+                    self.values[field][word].add(doc_id)
+            else:
+                bisect.insort(self.dates[field], (str(value), doc_id))
+
+    def remove(self, doc_id: str):
+        for field, value in self._documents.pop(doc_id, {}).items():
+            kind = self.fields[field]
+            if kind == "date":
+                entries = self.dates[field]
+                position = bisect.bisect_left(entries, (str(value), doc_id))
+                if position < len(entries) and entries[position] == (str(value), doc_id):
+                    del entries[position]
+                continue
+            keys = [keyword(value)] if kind == "keyword" else set(self.words[field].pop(doc_id, []))
+            for key in keys:
+                documents = self.values[field].get(key)
+                if documents is not None:
+                    documents.discard(doc_id)
+                    if not documents:
+                        del self.values[field][key]
+
+    def kind(self, field: str) -> str:
+        if field not in self.fields:
+            raise ValueError(f"Unknown field: {field} (supported: {', '.join(sorted(self.fields))})")
+        return self.fields[field]
+
+    def lookup(self, field: str, value: str) -> Set[str]:
+        """Documents whose keyword field equals value, or whose text field contains the word"""
+        key = keyword(value) if self.fields[field] == "keyword" else value
+        return self.values[field].get(key, set())
+
+    def field_words(self, field: str, doc_id: str) -> List[str]:
+        return self.words[field].get(doc_id, [])
+
+    def date_range(self, field: str, low: Optional[str], high: Optional[str]) -> List[str]:
+        """Documents with low <= date <= high (ISO strings; None is open-ended)"""
+        start, end = self._date_bounds(field, low, high)
+        return [doc_id for _, doc_id in self.dates[field][start:end]]
+
+    def date_count(self, field: str, low: Optional[str], high: Optional[str]) -> int:
+        start, end = self._date_bounds(field, low, high)
+        return max(0, end - start)
+
+    def _date_bounds(self, field: str, low: Optional[str], high: Optional[str]):
+        entries = self.dates[field]
+        start = bisect.bisect_left(entries, (low,)) if low else 0
+        end = bisect.bisect_right(entries, (high, "\uffff")) if high else len(entries)
+        return start, end
@@ -0,0 +1,40 @@
+from collections import defaultdict
+from typing import Dict, Hashable, List, Tuple
+
+Ranking = List[Tuple[Hashable, float]]
+
+def reciprocal_rank_fusion(rankings: Dict[str, Ranking], weights: Dict[str, float], k: int = 60) -> Ranking:
+    """Combine rankings by weighted reciprocal rank: sum of weight / (k + rank)
+
+    Only ranks are used, so retrievers with incomparable score scales
+    (BM25, cosine similarity) can be fused without calibration.
+    """
+    fused = defaultdict(float)
+    for name, ranking in rankings.items():
+        weight = weights.get(name, 1.0)
+        for rank, (item, _) in enumerate(ranking, 1):
+            fused[item] += weight / (k + rank)
+    return sorted(fused.items(), key=lambda entry: entry[1], reverse=True)
+
+def normalized_score_fusion(rankings: Dict[str, Ranking], weights: Dict[str, float], k: int = 60) -> Ranking:
+    """Combine rankings by weighted sum of min-max normalized scores
+
+    Keeps how far ahead a top result is, which rank fusion discards. ``k``
+    is accepted for symmetry with ``reciprocal_rank_fusion`` and unused.
+    """
+    fused = defaultdict(float)
+    for name, ranking in rankings.items():
+        if not ranking:
+            continue
+        weight = weights.get(name, 1.0)
+        scores = [score for _, score in ranking]
+        low, high = min(scores), max(scores)
+        spread = high - low
+        for item, score in ranking:
+            fused[item] += weight * ((score - low) / spread if spread else 1.0)
+    return sorted(fused.items(), key=lambda entry: entry[1], reverse=True)
+
+FUSION_METHODS = {
+    "rrf": reciprocal_rank_fusion,
+    "weighted": normalized_score_fusion
+}
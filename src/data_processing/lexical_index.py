@@ -0,0 +1,136 @@
+import math
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..utils.text import STOPWORDS, iter_tokens, tokenize
+
+class LexicalIndex:
+    """Inverted index over fixed-size passages of each document, ranked with BM25
+
+    Documents are split into passages of ``chunk_words`` words. Passages keep
+    only character offsets into their document, so the text itself is stored
+    once, by the vector store.
+
+    The index is positional: each posting holds the word positions of the
+    term within the document, and every document keeps the character offset
+    of each of its words, so matches can be located and highlighted without
+    re-scanning the text.
+    """
+
+    def __init__(self, chunk_words: int = 120, k1: float = 1.2, b: float = 0.75):
+        self.chunk_words = chunk_words
+        self.k1 = k1
+        self.b = b
+
+        self.postings = defaultdict(dict)  # term -> {chunk_id: array of word positions in the document}
+        self.chunks = {}  # chunk_id -> (doc_id, start, end, length)
+        self.doc_chunks = {}  # doc_id -> [chunk_id, ...]
+        self.word_offsets = {}  # doc_id -> array of each word's character offset
+        self._next_chunk_id = 0
+        self._total_length = 0
+
+    def add(self, doc_id: str, content: str) -> List[int]:
+        """Split a document into passages and index them"""
+        chunk_ids = []
+        offsets = array("I")
+        terms, start, end, length = defaultdict(lambda: array("I")), None, 0, 0
+
+        for position, (token, token_start, end_offset) in enumerate(iter_tokens(content)):
+            offsets.append(token_start)
+            if start is None:
+                start = token_start
+            end, length = end_offset, length + 1
+            if token not in STOPWORDS:
+                terms[token].append(position)
+
+            if length >= self.chunk_words:
+                chunk_ids.append(self._add_chunk(doc_id, start, end, length, terms))
+                terms, start, length = defaultdict(lambda: array("I")), None, 0
+
+        if length:
+            chunk_ids.append(self._add_chunk(doc_id, start, end, length, terms))
+
+        self.doc_chunks[doc_id] = chunk_ids
+        self.word_offsets[doc_id] = offsets
+        return chunk_ids
+
+    def remove(self, doc_id: str, content: str):
+        """Remove a document's passages; content must be the text it was added with"""
+        self.word_offsets.pop(doc_id, None)
+        for chunk_id in self.doc_chunks.pop(doc_id, []):
+            _, start, end, length = self.chunks.pop(chunk_id)
+            self._total_length -= length
+            for term in set(tokenize(content[start:end])):
+                chunk_postings = self.postings.get(term)
+                if chunk_postings is not None:
+                    chunk_postings.pop(chunk_id, None)
+                    if not chunk_postings:
+                        del self.postings[term]
+    
+    def search(self, query: str, limit: Optional[int] = 20,
+               stats: Optional[Dict] = None) -> List[Tuple[int, float]]:
+        """Rank passages for a query, returning (chunk_id, score) pairs (all of them if limit is None)
+
+        ``stats`` from an earlier ``corpus_stats`` call pins the BM25
+        statistics, so scores stay comparable while documents come and go.
+        """
+        if not self.chunks:
+            return []
+
+        stats = stats or self.corpus_stats(query)
+        total, average_length = stats["total"], stats["average_length"]
+        scores = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            chunk_postings = self.postings.get(term)
+            if not chunk_postings:
+                continue
+
+            frequency_in_corpus = stats["document_frequency"].get(term, len(chunk_postings))
+            idf = math.log(1 + (total - frequency_in_corpus + 0.5) / (frequency_in_corpus + 0.5))
+            for chunk_id, positions in chunk_postings.items():
+                frequency = len(positions)
+                length = self.chunks[chunk_id][3]
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[chunk_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked if limit is None else ranked[:limit]
+
+    def corpus_stats(self, query: str) -> Dict:
+        """The collection statistics BM25 uses to score a query"""
+        total = len(self.chunks)
+        return {
+            "total": total,
+            "average_length": self._total_length / total if total else 1.0,
+            "document_frequency": {term: len(self.postings.get(term, ())) for term in set(tokenize(query))}
+        }
+
+    def get_chunk(self, chunk_id: int) -> Tuple[str, int, int]:
+        """Get (doc_id, start, end) for a passage"""
+        doc_id, start, end, _ = self.chunks[chunk_id]
+        return doc_id, start, end
+
+    def term_positions(self, doc_id: str, terms: Iterable[str]) -> List[Tuple[int, str]]:
+        """(word position, term) for every occurrence of the terms in a document, in order"""
+        chunk_ids = self.doc_chunks.get(doc_id, [])
+        matches = []
+        for term in set(terms):
+            chunk_postings = self.postings.get(term)
+            if not chunk_postings:
+                continue
+            for chunk_id in chunk_ids:
+                for position in chunk_postings.get(chunk_id, ()):
+                    matches.append((position, term))
+        matches.sort()
+        return matches
+
+    def _add_chunk(self, doc_id: str, start: int, end: int, length: int, terms: Dict[str, array]) -> int:
+        chunk_id = self._next_chunk_id
+        self._next_chunk_id += 1
+
+        self.chunks[chunk_id] = (doc_id, start, end, length)
+        self._total_length += length
+        for term, positions in terms.items():
+            self.postings[term][chunk_id] = positions
+        return chunk_id
@@ -0,0 +1,461 @@
+import re
+from typing import Dict, List, Optional, Set
+from ..utils.text import STOPWORDS, tokenize
+
+# Lexer: parentheses, field clauses (value, "phrase" or [low TO high]), quoted phrases, words.
+# A leading "-" negates the clause it is attached to.
+_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\() | (?P<rparen>\)) |
+        (?P<minus>-)(?=\S) |
+        (?P<field>[A-Za-z_]+):(?:
+            \[\s*(?P<low>[^\s\]]+)\s+TO\s+(?P<high>[^\s\]]+)\s*\] |
+            "(?P<field_phrase>[^"]*)" |
+            (?P<field_value>[^\s()"]+)
+        ) |
+        "(?P<phrase>[^"]*)" |
+        (?P<unterminated>") |
+        (?P<word>[^\s()"]+)
+    )''', re.VERBOSE)
+
+OPERATORS = {"AND", "OR", "NOT"}
+
+def word_variants(word: str) -> List[str]:
+    """The word plus its singular/plural forms, so "business" also finds "businesses"
+
+    Quoted phrases do not use this; they match words exactly.
+    """
+    if not word.isalpha() or len(word) < 3:
+        return [word]
+    variants = [word, word + "s", word + "es"]
+    if word.endswith("ies"):
+        variants.append(word[:-3] + "y")
+    elif word.endswith("es"):
+        variants.extend([word[:-2], word[:-1]])
+    elif word.endswith("s") and not word.endswith("ss"):
+        variants.append(word[:-1])
+    if word.endswith("y"):
+        variants.append(word[:-1] + "ies")
+    return variants
+
+class Node:
+    """A query clause that evaluates to a set of document IDs
+
+    ``estimate`` is a cheap upper bound on the number of matches, used to
+    order intersections. ``evaluate(context, candidates)`` returns the
+    matches, restricted to ``candidates`` when given: that lets rarer
+    clauses run first and every later clause only probe the survivors.
+    """
+
+    def estimate(self, context) -> int:
+        raise NotImplementedError
+
+    def evaluate(self, context, candidates: Optional[Set[str]] = None) -> Set[str]:
+        raise NotImplementedError
+
+    def terms(self) -> List[str]:
+        """Indexed words that contribute to ranking and highlighting"""
+        return []
+
+    def words(self) -> List[str]:
+        """The words as written, for retrievers that take free text"""
+        return []
+
+    def describe(self, context) -> Dict:
+        raise NotImplementedError
+
+class Term(Node):
+    """A word anywhere in the document (in any of its ``word_variants`` unless ``exact``)"""
+
+    def __init__(self, term: str, exact: bool = False):
+        self.term = term
+        self.variants = [term] if exact else word_variants(term)
+
+    def postings(self, context) -> List[Dict]:
+        return [context.index.postings[variant] for variant in self.variants if variant in context.index.postings]
+
+    def estimate(self, context) -> int:
+        return sum(len(chunk_postings) for chunk_postings in self.postings(context))
+
+    def evaluate(self, context, candidates=None):
+        postings = self.postings(context)
+        if candidates is None:
+            chunks = context.index.chunks
+            return {chunks[chunk_id][0] for chunk_postings in postings for chunk_id in chunk_postings}
+        doc_chunks = context.index.doc_chunks
+        return {doc_id for doc_id in candidates
+                if any(chunk_id in chunk_postings
+                       for chunk_id in doc_chunks.get(doc_id, ()) for chunk_postings in postings)}
+
+    def terms(self):
+        return self.variants
+
+    def words(self):
+        return [self.term]
+
+    def describe(self, context):
+        return {"term": self.term, "estimate": self.estimate(context)}
+
+class Phrase(Node):
+    """Words at consecutive positions; stopwords inside the phrase keep their place but are not checked"""
+
+    def __init__(self, words: List[str]):
+        self.sequence = words
+        self.parts = [(offset, word) for offset, word in enumerate(words) if word not in STOPWORDS]
+
+    def estimate(self, context):
+        return min(Term(word, exact=True).estimate(context) for _, word in self.parts)
+
+    def evaluate(self, context, candidates=None):
+        # Documents holding every word, rarest first, then a position check
+        ordered = sorted(self.parts, key=lambda part: Term(part[1], exact=True).estimate(context))
+        for _, word in ordered:
+            candidates = Term(word, exact=True).evaluate(context, candidates)
+            if not candidates:
+                return set()
+
+        anchor_offset, anchor = ordered[0]
+        matches = set()
+        for doc_id in candidates:
+            positions = {word: {position for position, _ in context.index.term_positions(doc_id, [word])}
+                         for _, word in self.parts}
+            if any(all(start - anchor_offset + offset in positions[word] for offset, word in self.parts)
+                   for start in positions[anchor]):
+                matches.add(doc_id)
+        return matches
+
+    def terms(self):
+        return [word for _, word in self.parts]
+
+    def words(self):
+        return self.terms()
+
+    def describe(self, context):
+        return {"phrase": " ".join(self.sequence), "estimate": self.estimate(context)}
+
+class Field(Node):
+    """field:value on a keyword field, or field:word / field:"phrase" on a text field"""
+
+    def __init__(self, field: str, value: str, words: Optional[List[str]] = None):
+        self.field = field
+        self.value = value
+        self.sequence = words
+
+    def estimate(self, context):
+        if self.sequence is None:
+            return len(context.fields.lookup(self.field, self.value))
+        return min(len(context.fields.lookup(self.field, word)) for word in self.sequence)
+
+    def evaluate(self, context, candidates=None):
+        if self.sequence is None:
+            found = context.fields.lookup(self.field, self.value)
+            return set(found) if candidates is None else candidates & found
+
+        for word in sorted(set(self.sequence), key=lambda word: len(context.fields.lookup(self.field, word))):
+            found = context.fields.lookup(self.field, word)
+            candidates = set(found) if candidates is None else candidates & found
+            if not candidates:
+                return set()
+        if len(self.sequence) == 1:
+            return candidates
+
+        size = len(self.sequence)
+        return {doc_id for doc_id in candidates
+                if any(words[i:i + size] == self.sequence
+                       for words in [context.fields.field_words(self.field, doc_id)]
+                       for i in range(len(words) - size + 1))}
+
+    def describe(self, context):
+        return {"field": self.field, "value": self.value, "estimate": self.estimate(context)}
+
+class DateRange(Node):
+    def __init__(self, field: str, low: Optional[str], high: Optional[str]):
+        self.field = field
+        self.low = low
+        self.high = high
+
+    def estimate(self, context):
+        return context.fields.date_count(self.field, self.low, self.high)
+
+    def evaluate(self, context, candidates=None):
+        found = context.fields.date_range(self.field, self.low, self.high)
+        return set(found) if candidates is None else candidates.intersection(found)
+
+    def describe(self, context):
+        return {"field": self.field, "range": [self.low, self.high], "estimate": self.estimate(context)}
+
+class Alias(Node):
+    """Documents citing a policy under any of its names (see ``AliasIndex``)"""
+
+    def __init__(self, key: Optional[str]):
+        self.key = key
+
+    def found(self, context) -> Set[str]:
+        return context.aliases.documents.get(self.key, set()) if self.key else set()
+
+    def estimate(self, context):
+        return len(self.found(context))
+
+    def evaluate(self, context, candidates=None):
+        found = self.found(context)
+        return set(found) if candidates is None else candidates & found
+
+    def describe(self, context):
+        return {"cite": self.key, "estimate": self.estimate(context)}
+
+class Not(Node):
+    def __init__(self, child: Node):
+        self.child = child
+
+    def estimate(self, context):
+        return len(context.all_documents())
+
+    def evaluate(self, context, candidates=None):
+        candidates = set(context.all_documents()) if candidates is None else candidates
+        return candidates - self.child.evaluate(context, candidates)
+
+    def describe(self, context):
+        return {"not": self.child.describe(context)}
+
+class And(Node):
+    """Intersection, starting from the rarest clause; negated clauses are applied last"""
+
+    def __init__(self, children: List[Node]):
+        self.children = children
+
+    def plan(self, context) -> List[Node]:
+        positive = [child for child in self.children if not isinstance(child, Not)]
+        negative = [child for child in self.children if isinstance(child, Not)]
+        return sorted(positive, key=lambda child: child.estimate(context)) + negative
+
+    def estimate(self, context):
+        positive = [child.estimate(context) for child in self.children if not isinstance(child, Not)]
+        return min(positive) if positive else len(context.all_documents())
+
+    def evaluate(self, context, candidates=None):
+        for child in self.plan(context):
+            candidates = child.evaluate(context, candidates)
+            if not candidates:
+                return set()
+        return candidates
+
+    def terms(self):
+        return [term for child in self.children for term in child.terms()]
+
+    def words(self):
+        return [word for child in self.children for word in child.words()]
+
+    def describe(self, context):
+        return {"and": [child.describe(context) for child in self.plan(context)], "estimate": self.estimate(context)}
+
+class Or(Node):
+    def __init__(self, children: List[Node]):
+        self.children = children
+
+    def estimate(self, context):
+        return sum(child.estimate(context) for child in self.children)
+
+    def evaluate(self, context, candidates=None):
+        matches = set()
+        for child in self.children:
+            remaining = None if candidates is None else candidates - matches
+            if remaining is not None and not remaining:
+                break
+            matches |= child.evaluate(context, remaining)
+        return matches
+
+    def terms(self):
+        return [term for child in self.children for term in child.terms()]
+
+    def words(self):
+        return [word for child in self.children for word in child.words()]
+
+    def describe(self, context):
+        return {"or": [child.describe(context) for child in self.children], "estimate": self.estimate(context)}
+
+def expand_date(value: str, upper: bool) -> Optional[str]:
+    """Open bounds ("*") become None; a year or year-month as an upper bound covers the whole period"""
+    if value == "*":
+        return None
+    if upper and len(value) == 4:
+        return f"{value}-12-31"
+    if upper and len(value) == 7:
+        return f"{value}-31"
+    return value
+
+def words_node(text: str) -> Optional[Node]:
+    """One word is a term; text that splits into several words ("Dodd-Frank") is a phrase"""
+    words = tokenize(text, drop_stopwords=False)
+    if not any(word not in STOPWORDS for word in words):
+        return None
+    return Term(words[0]) if len(words) == 1 else Phrase(words)
+
+class QueryParser:
+    """Parse the indexed-search query language into a tree of ``Node`` clauses
+
+    Plain words are ranked with BM25 as before (see ``is_boolean``); once
+    the query uses the language, words are ANDed together unless joined by
+    ``OR``; ``NOT`` or a leading
+    ``-`` excludes a clause; ``"..."`` is a phrase; parentheses group.
+    ``field:value``, ``field:"..."`` and ``field:[low TO high]`` (dates,
+    ``*`` for open ends) filter on metadata, and ``cite:`` matches any
+    spelling of a citation or policy name. A query or word that is itself
+    a citation ("E.O. 14067", "GDPR") also matches documents citing it
+    another way. Operators must be uppercase: a lowercase "and" is just a
+    word. Raises ValueError on bad syntax or an unknown field.
+    """
+
+    def __init__(self, fields, aliases=None):
+        self.fields = fields
+        self.aliases = aliases
+
+    def is_boolean(self, query: str) -> bool:
+        """Whether the query uses the query language (operators, phrases, ``-``,
+        parentheses or field clauses) rather than being plain words"""
+        return any({"lparen", "minus", "field", "phrase"} & set(token) or token.get("word") in OPERATORS
+                   for token in self._lex(query))
+
+    def parse(self, query: str) -> Optional[Node]:
+        return self._with_alias(_Parse(self, self._lex(query)).parse(), query)
+
+    def _with_alias(self, node: Optional[Node], text: str) -> Optional[Node]:
+        key = self.aliases.exact_key(text) if self.aliases else None
+        if key is None:
+            return node
+        return Alias(key) if node is None else Or([node, Alias(key)])
+
+    def _lex(self, query: str) -> List[Dict]:
+        tokens, position = [], 0
+        query = query.rstrip()
+        while position < len(query):
+            match = _TOKEN.match(query, position)
+            if match is None or match.group("unterminated"):
+                raise ValueError("Unterminated phrase in query")
+            position = match.end()
+            tokens.append({name: value for name, value in match.groupdict().items() if value is not None})
+        return tokens
+
+class _Parse:
+    """One pass of ``QueryParser`` over the tokens of a query
+
+    Each ``parse`` call gets its own, so one parser can be shared by
+    concurrent searches.
+    """
+
+    def __init__(self, parser: QueryParser, tokens: List[Dict]):
+        self.parser = parser
+        self.fields = parser.fields
+        self.aliases = parser.aliases
+        self.tokens = tokens
+        self.position = 0
+
+    def parse(self) -> Optional[Node]:
+        node = self._or()
+        if self.position < len(self.tokens):
+            raise ValueError("Unexpected ')' in query")
+        return node
+
+    def _peek(self) -> Dict:
+        return self.tokens[self.position] if self.position < len(self.tokens) else {}
+
+    def _or(self) -> Optional[Node]:
+        children = [self._and()]
+        while self._peek().get("word") == "OR":
+            self.position += 1
+            start = self.position
+            children.append(self._and())
+            if self.position == start:
+                raise ValueError("Missing operand for OR")
+        children = [child for child in children if child is not None]
+        if len(children) < 2:
+            return children[0] if children else None
+        return Or(children)
+
+    def _and(self) -> Optional[Node]:
+        children = []
+        while True:
+            token = self._peek()
+            if not token or "rparen" in token or token.get("word") == "OR":
+                break
+            if token.get("word") == "AND":
+                self.position += 1
+                continue
+            child = self._unary()
+            if child is not None:
+                children.append(child)
+        if len(children) < 2:
+            return children[0] if children else None
+        return And(children)
+
+    def _unary(self) -> Optional[Node]:
+        token = self._peek()
+        if "minus" in token or token.get("word") == "NOT":
+            self.position += 1
+            child = self._unary()
+            return Not(child) if child is not None else None
+        return self._primary()
+
+    def _primary(self) -> Optional[Node]:
+        token = self._peek()
+        if not token or "rparen" in token:
+            raise ValueError("Missing operand for NOT")
+        self.position += 1
+        if "lparen" in token:
+            node = self._or()
+            if "rparen" not in self._peek():
+                raise ValueError("Missing ')' in query")
+            self.position += 1
+            return node
+        if "field" in token:
+            return self._field(token)
+        if "phrase" in token:
+            return words_node(token["phrase"])
+        if token.get("word") in OPERATORS:
+            raise ValueError(f"Missing operand for {token['word']}")
+        return self.parser._with_alias(words_node(token["word"]), token["word"])
+
+    def _field(self, token: Dict) -> Optional[Node]:
+        field = token["field"].lower()
+        if field == "cite" and self.aliases is not None:
+            resolution = self.aliases.resolve(token.get("field_phrase", token.get("field_value", "")))
+            return Alias(resolution["key"] if resolution else None)
+        kind = self.fields.kind(field)
+        if "low" in token:
+            if kind != "date":
+                raise ValueError(f"Ranges are only supported on date fields, not {field}")
+            return DateRange(field, expand_date(token["low"], False), expand_date(token["high"], True))
+
+        value = token.get("field_phrase", token.get("field_value", ""))
+        if kind == "date":
+            return DateRange(field, value, expand_date(value, True))
+        if kind == "text":
+            words = tokenize(value, drop_stopwords=False)
+            return Field(field, value, words) if words else None
+        return Field(field, value)
+
+FILTERS = (Field, DateRange, Alias, Not)
+
+def alias_nodes(node: Optional[Node]) -> List[Alias]:
+    """Every citation clause in the tree"""
+    if isinstance(node, Alias):
+        return [node]
+    return [alias for child in getattr(node, "children", ()) for alias in alias_nodes(child)]
+
+def split_filters(node: Optional[Node]):
+    """(filter clause or None, free text) for retrievers that cannot run boolean queries
+
+    Top-level field clauses and exclusions become a filter on the results;
+    the words of the remaining clauses are the text to retrieve with.
+    """
+    if node is None:
+        return None, ""
+    if isinstance(node, FILTERS):
+        return node, ""
+    if not isinstance(node, And):
+        return None, " ".join(node.words())
+
+    filters = [child for child in node.children if isinstance(child, FILTERS)]
+    text = " ".join(word for child in node.children if not isinstance(child, FILTERS) for word in child.words())
+    if not filters:
+        return None, text
+    return (filters[0] if len(filters) == 1 else And(filters)), text
@@ -0,0 +1,228 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+class _Source:
+    def __init__(self, key: str, refresh: Callable[[], bool], interval: float):
+        self.key = key
+        self.refresh = refresh
+        self.interval = interval
+        self.due = 0.0
+        self.last_refreshed = None
+        self.change_rate = 0.0  # smoothed fraction of refreshes that found changes
+        self.refreshes = 0
+        self.last_error = None  # message of the most recent failed refresh, cleared on success
+        self.running = False
+
+class ReindexScheduler:
+    """Revisit indexed sources in the background, most likely stale first
+
+    Each source has a refresh function that returns True when its content
+    changed. Sources wait in a heap ordered by when they are next due. The
+    revisit interval adapts per source: it halves when a refresh finds a
+    change and grows by half when nothing changed, within
+    [min_interval, max_interval]. A smoothed change rate over all past
+    refreshes shortens the wait by up to half, so of two sources with the
+    same interval the one with the longer record of changes comes first.
+    Sources that change often are therefore revisited often, and static
+    ones rarely. First visits are spread randomly over one interval so
+    sources are never reloaded all at once.
+
+    New sources are picked up from ``sources_provider`` when
+    ``sources_version`` reports a different value, and otherwise at most
+    every ``discover_interval`` seconds, not on every scheduler tick.
+
+    At most ``max_concurrency`` refreshes run at a time. No new refresh
+    starts while ``busy()`` reports foreground load.
+    """
+
+    def __init__(self, max_concurrency: int = 2, min_interval: float = 900, max_interval: float = 86400,
+                 initial_interval: float = 3600, busy: Optional[Callable[[], bool]] = None,
+                 sources_provider: Optional[Callable[[], Dict[str, Callable[[], bool]]]] = None,
+                 sources_version: Optional[Callable[[], object]] = None, discover_interval: float = 300,
+                 idle_wait: float = 1.0, smoothing: float = 0.3):
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.busy = busy or (lambda: False)
+        self.sources_provider = sources_provider
+        self.sources_version = sources_version
+        self.discover_interval = discover_interval
+        self.idle_wait = idle_wait
+        self.smoothing = smoothing
+
+        self._sources = {}
+        self._heap = []  # (due, sequence, key)
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._running = 0
+        self._discovered = None  # (sources_version, time) of the last discovery
+        self._stats = {"refreshed": 0, "changed": 0, "failed": 0, "deferred": 0}
+
+    def add_source(self, key: str, refresh: Callable[[], bool], interval: Optional[float] = None,
+                   due_in: Optional[float] = None) -> bool:
+        """Schedule a source; returns False if it is already scheduled"""
+        with self._lock:
+            if key in self._sources:
+                return False
+            source = self._sources[key] = _Source(key, refresh, interval or self.initial_interval)
+            if due_in is None:
+                due_in = random.uniform(0, source.interval)
+            self._push(source, time.time() + due_in)
+        self._wake.set()
+        return True
+
+    def remove_source(self, key: str):
+        """Stop revisiting a source; a refresh already running still finishes"""
+        with self._lock:
+            self._sources.pop(key, None)
+
+    def start(self):
+        """Start the scheduler thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="reindex")
+            self._thread = threading.Thread(target=self._loop, name="reindex-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop the scheduler thread and its refresh workers, waiting for running refreshes if ``wait``"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Start refreshes for due sources, up to the concurrency limit; returns how many started"""
+        self._discover_sources()
+        if self.busy():
+            with self._lock:
+                if self._heap and self._heap[0][0] <= (now or time.time()):
+                    self._stats["deferred"] += 1
+            return 0
+
+        now = now or time.time()
+        started = []
+        with self._lock:
+            while self._heap and self._running < self.max_concurrency and self._heap[0][0] <= now:
+                due, _, key = heapq.heappop(self._heap)
+                source = self._sources.get(key)
+                if source is None or source.running or source.due != due:
+                    continue  # removed, or an outdated entry
+                source.running = True
+                self._running += 1
+                started.append(source)
+
+        for source in started:
+            if self._executor is not None:
+                self._executor.submit(self._refresh, source)
+            else:
+                self._refresh(source)
+        return len(started)
+
+    def get_stats(self) -> Dict:
+        """Queue state: sizes, counters, the next sources due and sources whose last refresh failed"""
+        now = time.time()
+        with self._lock:
+            upcoming = sorted(
+                (source for source in self._sources.values() if not source.running),
+                key=lambda source: source.due
+            )[:5]
+            failing = sorted((source for source in self._sources.values() if source.last_error),
+                             key=lambda source: source.last_refreshed, reverse=True)[:10]
+            return {
+                **self._stats,
+                "sources": len(self._sources),
+                "running": self._running,
+                "max_concurrency": self.max_concurrency,
+                "active": self._thread is not None and not self._stop.is_set(),
+                "next_due": [
+                    {
+                        "source": source.key,
+                        "due_in_seconds": round(max(0.0, source.due - now), 1),
+                        "interval_seconds": round(source.interval),
+                        "change_rate": round(source.change_rate, 3)
+                    }
+                    for source in upcoming
+                ],
+                "failing": [
+                    {"source": source.key, "error": source.last_error,
+                     "failed_seconds_ago": round(now - source.last_refreshed, 1)}
+                    for source in failing
+                ]
+            }
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            self.run_pending()
+
+            with self._lock:
+                next_due = self._heap[0][0] if self._heap else None
+                saturated = self._running >= self.max_concurrency
+            if next_due is None or saturated or self.busy():
+                timeout = self.idle_wait
+            else:
+                timeout = min(max(0.0, next_due - time.time()), self.idle_wait * 60)
+            self._wake.wait(timeout)
+
+    def _refresh(self, source: _Source):
+        changed, error = False, None
+        try:
+            changed = bool(source.refresh())
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"⚠️ Reindexing {source.key} failed: {error}")
+
+        with self._lock:
+            self._running -= 1
+            source.running = False
+            source.refreshes += 1
+            source.last_refreshed = time.time()
+            self._stats["refreshed"] += 1
+            if changed:
+                self._stats["changed"] += 1
+            if error:
+                self._stats["failed"] += 1
+            source.last_error = error
+
+            if changed:
+                source.interval = max(self.min_interval, source.interval / 2)
+            else:
+                source.interval = min(self.max_interval, source.interval * 1.5)
+            source.change_rate += self.smoothing * ((1.0 if changed else 0.0) - source.change_rate)
+
+            if source.key in self._sources:
+                wait = max(self.min_interval, source.interval * (1 - source.change_rate / 2))
+                self._push(source, source.last_refreshed + wait)
+        self._wake.set()
+
+    def _push(self, source: _Source, due: float):
+        source.due = due
+        heapq.heappush(self._heap, (due, next(self._sequence), source.key))
+
+    def _discover_sources(self):
+        if self.sources_provider is None:
+            return
+        version = self.sources_version() if self.sources_version else None
+        now = time.time()
+        if self._discovered is not None:
+            last_version, last_time = self._discovered
+            if version == last_version and now - last_time < self.discover_interval:
+                return
+        self._discovered = (version, now)
+        for key, refresh in self.sources_provider().items():
+            if key not in self._sources:
+                self.add_source(key, refresh)
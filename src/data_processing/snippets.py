@@ -0,0 +1,58 @@
+from typing import Dict, List, Tuple
+from ..utils.text import token_end
+
+def best_window(matches: List[Tuple[int, str]], window_words: int) -> Tuple[int, int]:
+    """Word positions (first, last) of the densest run of matches within window_words
+
+    Windows are compared by how many distinct query terms they contain, then
+    by total matches, then by how tightly the matches cluster. ``matches``
+    is a sorted list of (position, term); one pass with two pointers.
+    """
+    best, best_key = (matches[0][0], matches[0][0]), None
+    counts = {}
+    left = 0
+    for right, (position, term) in enumerate(matches):
+        counts[term] = counts.get(term, 0) + 1
+        while position - matches[left][0] >= window_words:
+            left_term = matches[left][1]
+            counts[left_term] -= 1
+            if not counts[left_term]:
+                del counts[left_term]
+            left += 1
+
+        first = matches[left][0]
+        key = (len(counts), right - left + 1, -(position - first))
+        if best_key is None or key > best_key:
+            best, best_key = (first, position), key
+    return best
+
+def build_snippet(word_offsets, content: str, matches: List[Tuple[int, str]], window_words: int) -> Dict:
+    """The best window of a document, with highlight spans relative to the snippet
+
+    Returns {"content", "offset", "highlights"}: ``offset`` is where the
+    snippet starts in the document and each highlight is a [start, end]
+    character span within the snippet.
+    """
+    word_count = len(word_offsets)
+    if not word_count:
+        return {"content": content[:500], "offset": 0, "highlights": []}
+
+    if matches:
+        first, last = best_window(matches, window_words)
+    else:
+        first, last = 0, 0
+
+    # Center the matched run in a window of window_words words
+    slack = max(0, window_words - (last - first + 1))
+    start = max(0, first - slack // 2)
+    end = min(word_count - 1, start + window_words - 1)
+    start = max(0, min(start, end - window_words + 1))
+
+    char_start = word_offsets[start]
+    char_end = token_end(content, word_offsets[end])
+    highlights = [
+        [word_offsets[position] - char_start, token_end(content, word_offsets[position]) - char_start]
+        for position, _ in matches
+        if start <= position <= end
+    ]
+    return {"content": content[char_start:char_end], "offset": char_start, "highlights": highlights}
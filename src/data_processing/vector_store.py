@@ -1,38 +1,185 @@
 import os
 import json
-import requests
-from typing import List, Dict, Any
-import pandas as pd
-from bs4 import BeautifulSoup
+import hashlib
+import heapq
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from .citation_graph import RELATIONS, CitationGraph, extract_edges
+from .citations import AliasIndex
+from .dense_index import DenseIndex
+from .document_parser import DocumentParser, DocumentTooLargeError, iter_file_chunks
+from .field_index import FieldIndex
+from .fusion import FUSION_METHODS
+from .lexical_index import LexicalIndex
+from .query_parser import QueryParser, alias_nodes, split_filters
+from .snippets import build_snippet
+from ..utils.pagination import decode_cursor, encode_cursor
+
+SEARCH_MODES = ("lexical", "dense", "hybrid")
 
 class VectorStoreManager:
-    def __init__(self):
+    def __init__(self, chunk_words: int = 120, parser: Optional[DocumentParser] = None, snippet_words: int = 40,
+                 embedder=None, fusion: Optional[Dict] = None):
         self.documents = []
         self.embeddings = {}
         self.indexed_urls = set()
+        self._url_documents = {}  # url -> {"doc_id", "etag", "last_modified", "hash"}
+        self.index = LexicalIndex(chunk_words=chunk_words)
+        self._documents_by_id = {}
+        self._lock = threading.Lock()
+        self.parser = parser or DocumentParser()
+        self.snippet_words = snippet_words
+        self.fields = FieldIndex()
+        self.aliases = AliasIndex()
+        self.query_parser = QueryParser(self.fields, self.aliases)
+        self.citation_graph = CitationGraph()
+        
+        # Passages are also embedded for dense and hybrid search
+        self.dense = DenseIndex(embedder)
+        self.fusion = {"method": "rrf", "weights": {"lexical": 1.0, "dense": 1.0}, "rrf_k": 60, "candidates": 100}
+        self.set_fusion(**(fusion or {}))
+    
+    def set_fusion(self, method: Optional[str] = None, weights: Optional[Dict[str, float]] = None,
+                   rrf_k: Optional[int] = None, candidates: Optional[int] = None) -> Dict:
+        """Tune hybrid search: fusion method ("rrf" or "weighted"), per-retriever weights,
+        the RRF constant and how many candidates each retriever contributes"""
+        if method is not None:
+            if method not in FUSION_METHODS:
+                raise ValueError(f"Unknown fusion method: {method}")
+            self.fusion["method"] = method
+        if weights:
+            unknown = set(weights) - {"lexical", "dense"}
+            if unknown:
+                raise ValueError(f"Unknown retrievers: {', '.join(sorted(unknown))}")
+            self.fusion["weights"] = {**self.fusion["weights"], **{name: float(w) for name, w in weights.items()}}
+        if rrf_k is not None:
+            self.fusion["rrf_k"] = int(rrf_k)
+        if candidates is not None:
+            self.fusion["candidates"] = int(candidates)
+        return {**self.fusion, "weights": dict(self.fusion["weights"])}
     
     def add_document(self, content: str, metadata: Dict) -> str:
         """Add document to vector store"""
-        doc_id = f"doc_{len(self.documents)}"
+        return self.add_documents([{"content": content, "metadata": metadata}])[0]
+    
+    def add_documents(self, documents: List[Dict]) -> List[str]:
+        """Add many documents ({"content", "metadata"}) under one lock acquisition"""
+        indexed_at = datetime.now().isoformat()
+        doc_ids = []
         
-        document = {
-            "id": doc_id,
-            "content": content,
-            "metadata": metadata,
-            "indexed_at": pd.Timestamp.now().isoformat()
-        }
+        with self._lock:
+            for item in documents:
+                doc_id = f"doc_{len(self.documents)}"
+                
+                document = {
+                    "id": doc_id,
+                    "content": item["content"],
+                    "metadata": item["metadata"],
+                    "indexed_at": indexed_at
+                }
+                
+                self.documents.append(document)
+                self._documents_by_id[doc_id] = document
+                self._index_document(doc_id, item["content"])
+                self.fields.add(doc_id, item["metadata"])
+                self.aliases.add(doc_id, self._alias_text(item["content"], item["metadata"]))
+                self._add_citation_edges(doc_id, item["content"], item["metadata"])
+                doc_ids.append(doc_id)
+        return doc_ids
+    
+    def replace_document(self, doc_id: str, content: str, metadata: Optional[Dict] = None):
+        """Replace a document's content in place, re-indexing its passages"""
+        with self._lock:
+            document = self._documents_by_id[doc_id]
+            for chunk_id in self.index.doc_chunks.get(doc_id, []):
+                self.dense.remove(chunk_id)
+            self.index.remove(doc_id, document["content"])
+            document["content"] = content
+            if metadata:
+                document["metadata"].update(metadata)
+                self.fields.remove(doc_id)
+                self.fields.add(doc_id, document["metadata"])
+            document["indexed_at"] = datetime.now().isoformat()
+            self._index_document(doc_id, content)
+            self.aliases.remove(doc_id)
+            self.aliases.add(doc_id, self._alias_text(content, document["metadata"]))
+            self._add_citation_edges(doc_id, content, document["metadata"])
+    
+    @staticmethod
+    def _alias_text(content: str, metadata: Dict) -> str:
+        return "\n".join([str(metadata.get("policy_id") or ""), str(metadata.get("title") or ""), content])
+    
+    def _add_citation_edges(self, doc_id: str, content: str, metadata: Dict):
+        # A document speaks for the policy its ID or title names; otherwise for itself
+        own_key = None
+        for name in (metadata.get("policy_id"), metadata.get("title")):
+            if name and own_key is None:
+                own_key = self.aliases.canonical_key(str(name))
+        self.citation_graph.add(doc_id, extract_edges(own_key or f"doc:{doc_id}", content))
+    
+    def _index_document(self, doc_id: str, content: str):
+        for chunk_id in self.index.add(doc_id, content):
+            _, start, end = self.index.get_chunk(chunk_id)
+            self.dense.add(chunk_id, content[start:end])
+    
+    def refresh_url(self, url: str) -> bool:
+        """Re-fetch an indexed URL and re-index it if it changed; returns whether it changed
+        
+        Uses conditional requests (ETag / Last-Modified) so unchanged pages
+        cost a 304 instead of a download. Raises on fetch errors.
+        """
+        import requests
+        from bs4 import BeautifulSoup
+        
+        state = self._url_documents.get(url)
+        if state is None:
+            return self.index_url(url)["status"] == "indexed"
+        
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        
+        response = requests.get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            return False
+        response.raise_for_status()
+        
+        soup = BeautifulSoup(response.content, 'html.parser')
+        content = soup.get_text()
+        state.update(etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+        
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if digest == state["hash"]:
+            return False
         
-        self.documents.append(document)
-        return doc_id
+        title = soup.find('title').text if soup.find('title') else url
+        self.replace_document(state["doc_id"], content, {"title": title})
+        state["hash"] = digest
+        return True
     
     def index_url(self, url: str) -> Dict:
         """Index content from URL"""
         if url in self.indexed_urls:
             return {"status": "already_indexed", "url": url}
         
+        # Only URL indexing needs the HTTP stack
+        import requests
+        
         try:
             response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            return self.index_html(url, response.content, response.headers)
+        except Exception as e:
+            return {"status": "error", "url": url, "error": str(e)}
+    
+    def index_html(self, url: str, html: bytes, headers: Optional[Dict] = None) -> Dict:
+        """Index an already fetched web page"""
+        from bs4 import BeautifulSoup
+        
+        try:
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Extract text content
             content = soup.get_text()
@@ -46,6 +193,13 @@ class VectorStoreManager:
             })
             
             self.indexed_urls.add(url)
+            headers = headers or {}
+            self._url_documents[url] = {
+                "doc_id": doc_id,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "hash": hashlib.sha256(content.encode("utf-8")).hexdigest()
+            }
             
             return {
                 "status": "indexed",
@@ -59,44 +213,246 @@ class VectorStoreManager:
     
     def upload_document(self, file_path: str, doc_type: str = "policy") -> Dict:
         """Upload and index document file"""
+        result = self.upload_stream(iter_file_chunks(file_path), os.path.basename(file_path), doc_type)
+        if result["status"] == "uploaded":
+            self._documents_by_id[result["doc_id"]]["metadata"]["file_path"] = file_path
+        return result
+    
+    def upload_stream(self, chunks: Iterable[bytes], filename: str, doc_type: str = "policy") -> Dict:
+        """Extract and index a document from a stream of byte chunks
+        
+        Text, PDF and DOCX are supported. The size limit is enforced while
+        the stream is read; oversized uploads are rejected without reading
+        the rest.
+        """
+        filename = os.path.basename(filename or "")
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            doc_id = self.add_document(content, {
-                "source": "upload",
-                "file_path": file_path,
-                "type": doc_type,
-                "filename": os.path.basename(file_path)
-            })
-            
-            return {
-                "status": "uploaded",
-                "doc_id": doc_id,
-                "filename": os.path.basename(file_path)
-            }
-            
+            parsed = self.parser.parse(chunks, filename)
+        except DocumentTooLargeError as e:
+            return {"status": "rejected", "filename": filename, "error": str(e)}
         except Exception as e:
-            return {"status": "error", "file_path": file_path, "error": str(e)}
+            return {"status": "error", "filename": filename, "error": str(e)}
+        
+        doc_id = self.add_document(parsed["content"], {
+            "source": "upload",
+            "type": doc_type,
+            "filename": filename,
+            "format": parsed["format"],
+            "pages": parsed["pages"],
+            "bytes": parsed["bytes"]
+        })
+        
+        return {
+            "status": "uploaded",
+            "doc_id": doc_id,
+            "filename": filename,
+            "format": parsed["format"],
+            "pages": parsed["pages"]
+        }
     
-    def search_documents(self, query: str, limit: int = 5) -> List[Dict]:
-        """Search documents (simple text matching)"""
-        results = []
-        query_lower = query.lower()
+    def search_documents(self, query: str, limit: int = 5, mode: str = "lexical") -> List[Dict]:
+        """Search documents, returning the best-matching snippet of each"""
+        return self.search_page(query, limit, mode=mode)["results"]
+    
+    def search_page(self, query: str, limit: int = 5, cursor: Optional[str] = None, mode: str = "lexical") -> Dict:
+        """One page of document search results, plus the cursor for the next page
         
-        for doc in self.documents:
-            if query_lower in doc["content"].lower():
-                score = doc["content"].lower().count(query_lower)
+        The query is parsed with ``QueryParser``. Plain words are ranked by
+        BM25 with any word counting, plus documents citing the query another
+        way ("EO-14067" also finds "Executive Order 14067"), in every mode.
+        A query using the language (operators, phrases, ``-``, field filters) runs in
+        lexical mode as a boolean query, all words required unless joined by
+        OR; dense and hybrid modes apply its field filters and exclusions
+        and retrieve with the remaining words.
+        
+        Matching documents are ranked by their best passage (BM25), ties broken by
+        document ID, and each page continues strictly after the last result
+        of the previous one. Each result carries the densest window of query
+        matches as ``content``, where it starts in the document (``offset``)
+        and the matched words as [start, end] spans within it
+        (``highlights``). Raises ValueError for a cursor from another query.
+        
+        The cursor also carries the BM25 statistics of the first page, so
+        documents added or removed mid-pagination do not reshuffle the scores
+        of the ones already paged past. ``mode`` picks the retriever (see
+        ``rank_passages``); in hybrid mode fused scores depend on ranks, so
+        only lexical pages are fully stable under concurrent inserts. Dense
+        and hybrid search rank ``fusion["candidates"]`` passages per
+        retriever, deepening by one page for each page already returned.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        after = decode_cursor(query, cursor) if cursor else None
+        if after is not None and not {"score", "doc_id", "stats"} <= set(after):
+            raise ValueError("Invalid cursor")
+        if after is not None and after.get("mode", "lexical") != mode:
+            raise ValueError("Cursor belongs to a different search mode")
+        after_key = (-after["score"], after["doc_id"]) if after else None
+        node = self.query_parser.parse(query)
+        terms = node.terms() if node else []
+        
+        boolean = self.query_parser.is_boolean(query)
+        
+        with self._lock:
+            if mode == "lexical" and not boolean:
+                text, matches = query, None
+            elif mode == "lexical":
+                text = " ".join(terms)
+                matches = node.evaluate(self) if node else set()
+            else:
+                query_filter, text = split_filters(node)
+                matches = query_filter.evaluate(self) if query_filter else None
+            
+            # Lexical pages rank every match; the other retrievers rank only the
+            # fusion candidates plus the results paged past so far
+            seen = after.get("seen", 0) if after else 0
+            depth = None if mode == "lexical" else self.fusion["candidates"] + seen + limit + 1
+            stats = after["stats"] if after else self.index.corpus_stats(text)
+            best_scores = {}
+            for chunk_id, score in (self._rank_passages(text, depth, mode, stats) if text else []):
+                doc_id = self.index.chunks[chunk_id][0]
+                if (matches is None or doc_id in matches) and score > best_scores.get(doc_id, 0.0):
+                    best_scores[doc_id] = score
+            
+            # Documents matched only by filters, citations or words no retriever scores rank last
+            if matches is not None and (mode == "lexical" or not text):
+                for doc_id in matches:
+                    best_scores.setdefault(doc_id, 0.0)
+            # Lexical boolean queries already evaluated their citation clauses
+            if mode != "lexical" or not boolean:
+                for alias in alias_nodes(node):
+                    for doc_id in alias.found(self):
+                        if matches is None or doc_id in matches:
+                            best_scores.setdefault(doc_id, 0.0)
+            
+            # Keyset pagination on (score, doc_id): later inserts never shift earlier pages
+            candidates = ((-score, doc_id) for doc_id, score in best_scores.items())
+            if after_key is not None:
+                candidates = (key for key in candidates if key > after_key)
+            page = heapq.nsmallest(limit + 1, candidates)
+            
+            results = []
+            for negative_score, doc_id in page[:limit]:
+                document = self._documents_by_id[doc_id]
+                snippet = build_snippet(
+                    self.index.word_offsets[doc_id], document["content"],
+                    self.index.term_positions(doc_id, terms), self.snippet_words
+                )
                 results.append({
-                    "doc_id": doc["id"],
-                    "content": doc["content"][:500] + "...",
-                    "metadata": doc["metadata"],
+                    "doc_id": doc_id,
+                    **snippet,
+                    "document_length": len(document["content"]),
+                    "metadata": document["metadata"],
+                    "score": -negative_score
+                })
+        
+        next_cursor = None
+        if len(page) > limit:
+            last_score, last_doc_id = page[limit - 1]
+            next_cursor = encode_cursor(query, {"score": -last_score, "doc_id": last_doc_id, "mode": mode,
+                                                "seen": seen + limit, "stats": stats})
+        return {"results": results, "next_cursor": next_cursor}
+    
+    def resolve_policy(self, policy_id: str) -> Optional[Dict]:
+        """Resolve any spelling of a policy ("EO-14067", "E.O. 14067", "GDPR", ...) to its
+        canonical key and the local documents citing it, without a remote search"""
+        with self._lock:
+            resolution = self.aliases.resolve(policy_id)
+            if resolution is None:
+                return None
+            resolution["graph_status"] = self.citation_graph.status(resolution["key"])
+            resolution["documents"] = [
+                {"doc_id": doc_id, "title": self._documents_by_id[doc_id]["metadata"].get("title"),
+                 "metadata": self._documents_by_id[doc_id]["metadata"]}
+                for doc_id in resolution.pop("doc_ids")
+            ]
+        return resolution
+    
+    def related_policies(self, policy_id: str, direction: str = "in", relations: Optional[List[str]] = None,
+                         max_hops: int = 1) -> Optional[Dict]:
+        """Policies linked to ``policy_id`` in the citation graph, up to ``max_hops`` away
+
+        ``direction="in"`` answers "what cites, amends or revokes X" and
+        ``"out"`` "what does X cite"; ``relations`` narrows the edge types
+        (e.g. ``["revokes"]`` with several hops is the chain of orders that
+        superseded X). None when ``policy_id`` names no known policy.
+        """
+        if direction not in ("in", "out"):
+            raise ValueError(f"Unknown direction: {direction}")
+        unknown = set(relations or ()) - set(RELATIONS)
+        if unknown:
+            raise ValueError(f"Unknown relations: {', '.join(sorted(unknown))}")
+        with self._lock:
+            key = self.aliases.canonical_key(policy_id)
+            if key is None:
+                return None
+            
+            related = self.citation_graph.traverse(key, direction, relations, max_hops)
+            for edge in related:
+                edge["name"] = self._policy_name(edge["key"])
+            return {"key": key, "name": self._policy_name(key), "direction": direction, "related": related}
+    
+    def _policy_name(self, key: str) -> str:
+        kind, _, doc_id = key.partition(":")
+        if kind == "doc" and doc_id in self._documents_by_id:
+            return self._documents_by_id[doc_id]["metadata"].get("title") or doc_id
+        return self.aliases.display_name(key)
+    
+    def explain_query(self, query: str) -> Dict:
+        """The execution plan of a lexical query: clauses in evaluation order with their estimated sizes"""
+        node = self.query_parser.parse(query)
+        with self._lock:
+            return {"plan": node.describe(self) if node else None,
+                    "matches": len(node.evaluate(self)) if node else 0}
+    
+    def all_documents(self):
+        return self._documents_by_id.keys()
+    
+    def retrieve_passages(self, query: str, limit: int = 20, mode: str = "lexical") -> List[Dict]:
+        """Retrieve the best-matching passages for a query (BM25, embeddings or both)"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        with self._lock:
+            ranked = self._rank_passages(query, limit, mode)
+            
+            passages = []
+            for chunk_id, score in ranked:
+                doc_id, start, end = self.index.get_chunk(chunk_id)
+                document = self._documents_by_id[doc_id]
+                passages.append({
+                    "passage_id": chunk_id,
+                    "doc_id": doc_id,
+                    "text": document["content"][start:end],
+                    "metadata": document["metadata"],
                     "score": score
                 })
         
-        # Sort by relevance score
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:limit]
+        return passages
+    
+    def rank_passages(self, query: str, limit: Optional[int] = 20, mode: str = "lexical") -> List[Tuple[int, float]]:
+        """(chunk_id, score) pairs from the lexical (BM25) or dense (embedding) retriever,
+        or from both fused with the current ``fusion`` settings ("hybrid")"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        with self._lock:
+            return self._rank_passages(query, limit, mode)
+    
+    def _rank_passages(self, query: str, limit: Optional[int], mode: str,
+                       stats: Optional[Dict] = None) -> List[Tuple[int, float]]:
+        # Callers hold self._lock
+        if mode == "lexical":
+            return self.index.search(query, limit, stats=stats)
+        if mode == "dense":
+            return self.dense.search(query, limit)
+        
+        # Each retriever contributes its top candidates. Both are pure Python
+        # and hold the GIL, so they run one after the other
+        fusion = self.fusion
+        depth = None if limit is None else max(limit, fusion["candidates"])
+        rankings = {"lexical": self.index.search(query, depth, stats=stats), "dense": self.dense.search(query, depth)}
+        
+        fused = FUSION_METHODS[fusion["method"]](rankings, fusion["weights"], fusion["rrf_k"])
+        return fused if limit is None else fused[:limit]
     
     def get_document_stats(self) -> Dict:
         """Get vector store statistics"""
@@ -108,5 +464,10 @@ class VectorStoreManager:
         return {
             "total_documents": len(self.documents),
             "sources": sources,
-            "indexed_urls": len(self.indexed_urls)
+            "indexed_urls": len(self.indexed_urls),
+            "indexed_passages": len(self.index.chunks),
+            "embedded_passages": len(self.dense),
+            "aliases": self.aliases.get_stats(),
+            "citation_graph": self.citation_graph.get_stats(),
+            "fusion": self.set_fusion()
         }
\ No newline at end of file
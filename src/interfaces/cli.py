@@ -1,8 +1,13 @@
 import click
+import csv
+import json
 import os
 from dotenv import load_dotenv
-from ..agents.policy_agent import PolicyNavigatorAgent
-from ..data_processing.ingestion import DataIngestion
+
+# Commands import the agent and data modules themselves: they pull in aixplain,
+# pandas, bs4 and requests, which --help and local commands should not pay for.
+# Agent commands index the local datasets first so answers are grounded, but
+# skip the website crawl the servers run at startup.
 
 load_dotenv()
 
@@ -22,7 +27,9 @@ def search(query, verbose):
     
     click.echo(f"Searching for: {query}")
     
-    agent = PolicyNavigatorAgent()
+    from ..agents.policy_agent import PolicyNavigatorAgent
+    agent = PolicyNavigatorAgent(load_data=False)
+    agent.load_local_data()
     response = agent.query(query)
     
     click.echo("\n" + "="*50)
@@ -47,7 +54,9 @@ def status(policy_id):
     
     click.echo(f"Checking status for: {policy_id}")
     
-    agent = PolicyNavigatorAgent()
+    from ..agents.policy_agent import PolicyNavigatorAgent
+    agent = PolicyNavigatorAgent(load_data=False)
+    agent.load_local_data()
     status_info = agent.check_policy_status(policy_id)
     
     click.echo("\n" + "="*50)
@@ -69,9 +78,19 @@ def status(policy_id):
 @click.option('--business-type', '-t', default='general', help='Type of business')
 @click.option('--size', '-s', type=click.Choice(['small_business', 'large_business']), 
               default='small_business', help='Business size')
-def compliance(business_type, size):
+@click.option('--input', '-i', 'input_path', type=click.Path(exists=True, dir_okay=False),
+              help='CSV of profiles (business_type, size, jurisdiction); results are printed as NDJSON')
+def compliance(business_type, size, input_path):
     """Analyze compliance requirements"""
-    agent = PolicyNavigatorAgent()
+    from ..agents.policy_agent import PolicyNavigatorAgent
+    agent = PolicyNavigatorAgent(load_data=False)
+    
+    if input_path:
+        with open(input_path, newline='', encoding='utf-8') as f:
+            for result in agent.analyze_compliance_batch(csv.DictReader(f)):
+                click.echo(json.dumps(result))
+        return
+    
     analysis = agent.analyze_compliance(business_type, size)
     
     click.echo("\n" + "="*50)
@@ -100,6 +119,7 @@ def setup():
     os.makedirs('data/scraped', exist_ok=True)
     
     # Initialize data ingestion
+    from ..data_processing.ingestion import DataIngestion
     ingestion = DataIngestion()
     
     click.echo("Loading sample policy data...")
@@ -112,6 +132,71 @@ def setup():
     
     click.echo("Setup complete!")
 
+@cli.command()
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--workers', '-w', type=int, default=None, help='Parser processes (default: one per CPU)')
+@click.option('--batch-size', '-b', type=int, default=None, help='Documents per store write and checkpoint')
+@click.option('--manifest', '-m', 'manifest_path', default=None, help='Manifest used to resume interrupted runs')
+@click.option('--store', '-o', 'store_path', default=None, help='Document store the files are ingested into')
+@click.option('--retry-failed', is_flag=True, help='Parse files that failed in an earlier run again')
+def ingest(directory, workers, batch_size, manifest_path, store_path, retry_failed):
+    """Bulk ingest a directory tree of .txt, .md, .pdf and .docx documents"""
+    from tqdm import tqdm
+    from ..data_processing.bulk_ingest import BulkIngestor
+    from ..data_processing.document_store import DocumentStore
+    from ..utils.config import get_config
+
+    config = get_config()
+    ingest_config = config.get('ingest', {})
+    store = DocumentStore(store_path or config['vector_store'].get('documents_path', 'data/documents.jsonl'))
+    ingestor = BulkIngestor(
+        store,
+        manifest_path=manifest_path or ingest_config.get('manifest_path', 'data/ingest_manifest.jsonl'),
+        workers=workers,
+        batch_size=batch_size or ingest_config.get('batch_size', 200),
+        max_file_size=config['vector_store'].get('max_file_size', 50 * 1024 * 1024)
+    )
+
+    pending, skipped = ingestor.plan(directory, retry_failed=retry_failed)
+    click.echo(f"Found {len(pending) + skipped} documents ({skipped} already ingested, {len(pending)} to go)")
+    if not pending:
+        return
+
+    with tqdm(total=sum(size for _, size, _ in pending), unit='B', unit_scale=True, unit_divisor=1024) as bar:
+        stats = ingestor.run(pending, progress=lambda files, size: bar.update(size))
+
+    click.echo(f"Ingested {stats['indexed']} documents into {store.path} ({stats['failed']} failed)")
+    click.echo(f"Throughput: {stats['docs_per_second']:.1f} docs/s, {stats['mb_per_second']:.2f} MB/s "
+               f"in {stats['elapsed_seconds']:.1f}s")
+    for error in stats['errors'][:10]:
+        click.echo(f"  • {error['path']}: {error['error']}")
+
+@cli.command('notion-sync')
+@click.argument('policies_path', type=click.Path(exists=True, dir_okay=False))
+def notion_sync(policies_path):
+    """Upsert tracked policies (JSON list or JSON Lines) into the Notion database"""
+    from ..tools.external_integrations import ExternalToolManager
+    from ..utils.config import get_config
+
+    with open(policies_path, encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        policies = json.loads(text)
+    else:
+        policies = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    click.echo(f"Syncing {len(policies)} policies to Notion...")
+    result = ExternalToolManager(get_config()).sync_notion(policies)
+    if not result['success']:
+        click.echo(f"Error: {result['message']}. Set NOTION_TOKEN and NOTION_DATABASE_ID.")
+        return
+
+    click.echo(f"Created {result['created']}, updated {result['updated']}, failed {result['failed']} "
+               f"({result['requests']} requests, {result['requests_per_second']:.2f} req/s "
+               f"in {result['elapsed_seconds']:.1f}s)")
+    for error in result['errors'][:10]:
+        click.echo(f"  • {error['policy_id']}: {error['error']}")
+
 @cli.command()
 def interactive():
     """Start interactive policy query session"""
@@ -123,6 +208,7 @@ def interactive():
     click.echo("Type 'quit' to exit, 'help' for commands")
     click.echo("-" * 40)
     
+    from ..agents.policy_agent import PolicyNavigatorAgent
     agent = PolicyNavigatorAgent()
     
     while True:
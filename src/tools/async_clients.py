@@ -0,0 +1,89 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+import aiohttp
+from ..utils.config import get_config
+from .court_listener_api import CourtListenerAPI
+from .custom_tools import graph_status, status_result
+from .federal_register_api import FederalRegisterAPI
+
+# Async counterparts of the tool clients, used by the ASGI server. They share
+# request building and response formatting with the synchronous clients and
+# return the same shapes, but never block a thread while waiting on upstream.
+
+def create_http_client(timeout: float = 30.0, max_connections: int = 1000) -> aiohttp.ClientSession:
+    """Shared HTTP session with a connection pool sized for many concurrent slow calls
+
+    Must be called from within the event loop that will use it.
+    """
+    connector = aiohttp.TCPConnector(limit=max_connections)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+
+class AsyncFederalRegisterAPI:
+    def __init__(self, client: aiohttp.ClientSession, base_url: Optional[str] = None):
+        self.client = client
+        self.base_url = base_url or get_config()['data_sources']['federal_register']['base_url']
+
+    async def search_documents(self, query: str, limit: int = 10) -> List[Dict]:
+        """Search Federal Register documents"""
+        try:
+            async with self.client.get(
+                f"{self.base_url}/documents.json",
+                params=FederalRegisterAPI.search_params(query, limit)
+            ) as response:
+                response.raise_for_status()
+                return (await response.json()).get('results', [])
+        except Exception as e:
+            print(f"Error searching Federal Register: {e}")
+            return []
+
+    async def check_policy_status(self, policy_id: str) -> Dict:
+        """Check if a policy is still in effect"""
+        documents = await self.search_documents(policy_id, limit=5)
+        return FederalRegisterAPI.summarize_status(policy_id, documents)
+
+class AsyncCourtListenerAPI:
+    def __init__(self, client: aiohttp.ClientSession, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        self.client = client
+        self.base_url = base_url or get_config()['data_sources']['court_listener']['base_url']
+        self.headers = {'Authorization': f'Token {api_key}'} if api_key else {}
+
+    async def search_opinions(self, query: str, limit: int = 10) -> List[Dict]:
+        """Search court opinions"""
+        try:
+            async with self.client.get(
+                f"{self.base_url}/search/",
+                params=CourtListenerAPI.search_params(query),
+                headers=self.headers
+            ) as response:
+                response.raise_for_status()
+                return (await response.json()).get('results', [])[:limit]
+        except Exception as e:
+            print(f"Error searching CourtListener: {e}")
+            return []
+
+    async def get_case_law_for_policy(self, policy_name: str) -> List[Dict]:
+        """Get case law related to a specific policy"""
+        return CourtListenerAPI.format_cases(await self.search_opinions(policy_name, limit=5))
+
+class AsyncPolicyStatusChecker:
+    def __init__(self, client: aiohttp.ClientSession, resolver: Optional[Callable[[str], Optional[Dict]]] = None):
+        self.federal_api = AsyncFederalRegisterAPI(client)
+        self.court_api = AsyncCourtListenerAPI(client)
+        self.resolver = resolver
+
+    async def check_policy_status(self, policy_id: str) -> Dict:
+        """Check comprehensive policy status, querying both sources concurrently"""
+        # The resolver reads the local index under its lock, so it runs off the event loop
+        loop = asyncio.get_running_loop()
+        resolution = await loop.run_in_executor(None, self.resolver, policy_id) if self.resolver else None
+        search_id = resolution["name"] if resolution else policy_id
+        federal_status = graph_status(resolution)
+        if federal_status is not None:
+            case_law = await self.court_api.get_case_law_for_policy(search_id)
+        else:
+            federal_status, case_law = await asyncio.gather(
+                self.federal_api.check_policy_status(search_id),
+                self.court_api.get_case_law_for_policy(search_id)
+            )
+
+        return status_result(policy_id, federal_status, case_law, resolution)
@@ -1,9 +1,10 @@
 import requests
 from typing import Dict, List, Optional
+from ..utils.config import get_config
 
 class CourtListenerAPI:
-    def __init__(self, api_key: Optional[str] = None):
-        self.base_url = "https://www.courtlistener.com/api/rest/v4"
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        self.base_url = base_url or get_config()['data_sources']['court_listener']['base_url']
         self.headers = {}
         if api_key:
             self.headers['Authorization'] = f'Token {api_key}'
@@ -11,12 +12,7 @@ class CourtListenerAPI:
     def search_opinions(self, query: str, limit: int = 10) -> List[Dict]:
         """Search court opinions"""
         url = f"{self.base_url}/search/"
-        params = {
-            'q': query,
-            'type': 'o',  # opinions
-            'format': 'json',
-            'order_by': 'score desc'
-        }
+        params = self.search_params(query)
         
         try:
             response = requests.get(url, params=params, headers=self.headers)
@@ -30,7 +26,21 @@ class CourtListenerAPI:
     def get_case_law_for_policy(self, policy_name: str) -> List[Dict]:
         """Get case law related to a specific policy"""
         cases = self.search_opinions(policy_name, limit=5)
-        
+        return self.format_cases(cases)
+    
+    @staticmethod
+    def search_params(query: str) -> Dict:
+        """Query parameters for an opinion search"""
+        return {
+            'q': query,
+            'type': 'o',  # opinions
+            'format': 'json',
+            'order_by': 'score desc'
+        }
+    
+    @staticmethod
+    def format_cases(cases: List[Dict]) -> List[Dict]:
+        """Format opinion search results as case summaries"""
         formatted_cases = []
         for case in cases:
             formatted_cases.append({
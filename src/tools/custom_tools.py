@@ -1,31 +1,57 @@
-import sqlite3
-import pandas as pd
-from typing import Dict, List, Any
-from .federal_register_api import FederalRegisterAPI
-from .court_listener_api import CourtListenerAPI
+from typing import Callable, Dict, List, Any, Optional
+
+# API clients pull in requests, so they are imported when a checker is created
 
 class PolicyStatusChecker:
-    def __init__(self):
+    def __init__(self, resolver: Optional[Callable[[str], Optional[Dict]]] = None):
+        from .federal_register_api import FederalRegisterAPI
+        from .court_listener_api import CourtListenerAPI
         self.federal_api = FederalRegisterAPI()
         self.court_api = CourtListenerAPI()
+        self.resolver = resolver
     
     def check_policy_status(self, policy_id: str) -> Dict[str, Any]:
-        """Check comprehensive policy status"""
-        federal_status = self.federal_api.check_policy_status(policy_id)
-        case_law = self.court_api.get_case_law_for_policy(policy_id)
+        """Check comprehensive policy status
         
-        return {
-            "policy_id": policy_id,
-            "federal_status": federal_status,
-            "related_cases": case_law,
-            "summary": f"Policy {policy_id} status: {federal_status.get('status', 'unknown')}"
-        }
+        With a resolver (the local alias index), every spelling of a policy
+        is searched upstream under its canonical name and the result lists
+        the local documents that cite it. When an indexed document revokes or
+        amends the policy, the citation graph answers without the remote
+        full-text search.
+        """
+        resolution = self.resolver(policy_id) if self.resolver else None
+        search_id = resolution["name"] if resolution else policy_id
+        federal_status = graph_status(resolution) or self.federal_api.check_policy_status(search_id)
+        case_law = self.court_api.get_case_law_for_policy(search_id)
+        
+        return status_result(policy_id, federal_status, case_law, resolution)
+
+def graph_status(resolution: Optional[Dict]) -> Optional[Dict]:
+    """The federal status from the local citation graph, when it says the policy was revoked or amended"""
+    status = (resolution or {}).get("graph_status")
+    if not status or status["status"] not in ("revoked", "amended"):
+        return None
+    return {"status": status["status"], "source": "citation_graph",
+            "revoked_by": status["revoked_by"], "amended_by": status["amended_by"],
+            "superseded_by": status["superseded_by"]}
+
+def status_result(policy_id: str, federal_status: Dict, case_law: List[Dict], resolution: Optional[Dict]) -> Dict:
+    """The response of a policy status check, shared with the async checker"""
+    result = {
+        "policy_id": policy_id,
+        "federal_status": federal_status,
+        "related_cases": case_law,
+        "summary": f"Policy {policy_id} status: {federal_status.get('status', 'unknown')}"
+    }
+    if resolution:
+        result["resolution"] = resolution
+    return result
 
 class ComplianceAnalyzer:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or "data/compliance.db"
     
-    def analyze_compliance_requirements(self, business_type: str, size: str) -> Dict[str, Any]:
+    def analyze_compliance_requirements(self, business_type: str, size: str, jurisdiction: str = "US") -> Dict[str, Any]:
         """Analyze compliance requirements for business type and size"""
         # Simplified compliance analysis
         requirements = {
@@ -44,12 +70,14 @@ class ComplianceAnalyzer:
         return {
             "business_type": business_type,
             "size": size,
+            "jurisdiction": jurisdiction,
             "requirements": requirements.get(size, {}),
             "deadlines": ["Annual review required", "Quarterly assessments"]
         }
 
 class PolicySearchTool:
     def __init__(self):
+        from .federal_register_api import FederalRegisterAPI
         self.federal_api = FederalRegisterAPI()
     
     def search_policies(self, query: str, source: str = "federal") -> List[Dict]:
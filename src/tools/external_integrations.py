@@ -1,12 +1,20 @@
 import os
 import json
+import threading
+import time
+import sqlite3
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+from ..utils.job_queue import QueueFullError
+from ..utils.rate_limit import TokenBucket
+from .reminders import ReminderIndex, parse_deadline
 
 class SlackIntegration:
-    def __init__(self, webhook_url: Optional[str] = None):
+    def __init__(self, webhook_url: Optional[str] = None, timeout: float = 10):
         self.webhook_url = webhook_url or os.getenv('SLACK_WEBHOOK_URL')
+        self.timeout = timeout
     
     def send_policy_alert(self, policy_info: Dict) -> bool:
         """Send policy update to Slack"""
@@ -14,7 +22,23 @@ class SlackIntegration:
             print("Slack webhook not configured")
             return False
         
-        message = {
+        try:
+            response = self.post(self.build_message(policy_info))
+            if response.status_code != 200:
+                print(f"Slack notification failed: HTTP {response.status_code}")
+            return response.status_code == 200
+        except Exception as e:
+            print(f"Slack notification failed: {e}")
+            return False
+    
+    def post(self, message: Dict) -> requests.Response:
+        """Post a message to the webhook; raises on connection errors"""
+        return requests.post(self.webhook_url, json=message, timeout=self.timeout)
+    
+    @staticmethod
+    def build_message(policy_info: Dict) -> Dict:
+        """Build the Slack message for a policy update"""
+        return {
             "text": f"🏛️ Policy Update Alert",
             "blocks": [
                 {
@@ -26,55 +50,149 @@ class SlackIntegration:
                 }
             ]
         }
-        
-        try:
-            print(f"Sending to webhook: {self.webhook_url[:50]}...")
-            print(f"Message: {message}")
-            
-            response = requests.post(self.webhook_url, json=message)
-            
-            print(f"Response status: {response.status_code}")
-            print(f"Response text: {response.text}")
-            
-            return response.status_code == 200
-        except Exception as e:
-            print(f"Slack notification failed: {e}")
-            return False
+    
+    @staticmethod
+    def build_digest(policy_infos: List[Dict]) -> Dict:
+        """Build one Slack message summarizing several policy updates"""
+        blocks = [{
+            "type": "header",
+            "text": {"type": "plain_text", "text": f"🏛️ {len(policy_infos)} Policy Updates"}
+        }]
+        for policy_info in policy_infos:
+            blocks.append({"type": "divider"})
+            blocks.append(SlackIntegration.build_message(policy_info)["blocks"][0])
+        return {"text": f"🏛️ Policy Update Digest ({len(policy_infos)} alerts)", "blocks": blocks}
 
 class CalendarIntegration:
-    def __init__(self):
-        self.reminders = []
+    """Compliance deadline reminders in a time-ordered, persistent index
+    
+    Deadlines are parsed when scheduled (see ``parse_deadline``); recurring
+    ones such as "Quarterly assessments" expand lazily. Reminders are kept in
+    SQLite at ``path`` when one is given and reloaded on startup.
+    "Due in the next N days" is a range query over the index.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.reminders = {}
+        self.index = ReminderIndex()
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._db = None
+        if path:
+            self._open_db()
     
     def schedule_compliance_reminder(self, policy_name: str, deadline: str) -> Dict:
         """Schedule compliance deadline reminder"""
-        reminder = {
-            "id": len(self.reminders) + 1,
-            "policy": policy_name,
-            "deadline": deadline,
-            "created": datetime.now().isoformat(),
-            "type": "compliance_deadline"
-        }
+        due, recurrence = parse_deadline(deadline)
+        if due is None:
+            return {"success": False, "message": f"Could not understand deadline: {deadline}"}
         
-        self.reminders.append(reminder)
+        with self._lock:
+            reminder = {
+                "id": self._next_id,
+                "policy": policy_name,
+                "deadline": deadline,
+                "due": due.isoformat(),
+                "recurrence": recurrence,
+                "created": datetime.now().isoformat(),
+                "type": "compliance_deadline"
+            }
+            if self._db is not None:
+                # AUTOINCREMENT never hands out the ID of a cancelled reminder again
+                cursor = self._db.execute(
+                    "INSERT INTO reminders (policy, deadline, due, recurrence, created, type) "
+                    "VALUES (:policy, :deadline, :due, :recurrence, :created, :type)",
+                    reminder
+                )
+                self._db.commit()
+                reminder["id"] = cursor.lastrowid
+            self._next_id = reminder["id"] + 1
+            self.reminders[reminder["id"]] = reminder
+            self.index.add(reminder["id"], due, recurrence)
         
+        schedule = f"{recurrence} from {due.date().isoformat()}" if recurrence else due.date().isoformat()
         return {
             "success": True,
-            "message": f"Reminder scheduled for {policy_name} deadline: {deadline}",
+            "message": f"Reminder scheduled for {policy_name} deadline: {deadline} ({schedule})",
             "reminder_id": reminder["id"]
         }
     
+    def cancel_reminder(self, reminder_id: int) -> bool:
+        with self._lock:
+            reminder = self.reminders.pop(reminder_id, None)
+            if reminder is None:
+                return False
+            self.index.remove(reminder_id, datetime.fromisoformat(reminder["due"]), reminder["recurrence"])
+            if self._db is not None:
+                self._db.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+                self._db.commit()
+            return True
+    
     def get_upcoming_reminders(self, days: int = 30) -> List[Dict]:
         """Get upcoming compliance reminders"""
-        return [r for r in self.reminders if r["type"] == "compliance_deadline"]
+        now = datetime.now()
+        return self.get_reminders_between(now, now + timedelta(days=days))
+    
+    def get_reminders_between(self, start: datetime, end: datetime) -> List[Dict]:
+        """Reminder occurrences due in [start, end], soonest first"""
+        with self._lock:
+            return [
+                {**self.reminders[reminder_id], "due": due.isoformat()}
+                for due, reminder_id in self.index.between(start, end)
+            ]
+    
+    def _open_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reminders (id INTEGER PRIMARY KEY AUTOINCREMENT, policy TEXT, deadline TEXT, "
+            "due TEXT, recurrence TEXT, created TEXT, type TEXT)"
+        )
+        self._db.commit()
+        
+        columns = ["id", "policy", "deadline", "due", "recurrence", "created", "type"]
+        for row in self._db.execute(f"SELECT {', '.join(columns)} FROM reminders ORDER BY id"):
+            reminder = dict(zip(columns, row))
+            self.reminders[reminder["id"]] = reminder
+        self.index.add_many([
+            (reminder["id"], datetime.fromisoformat(reminder["due"]), reminder["recurrence"])
+            for reminder in self.reminders.values()
+        ])
 
 class NotionIntegration:
-    def __init__(self, token: Optional[str] = None):
+    """Upsert policy tracking pages into a Notion database
+    
+    Every request goes through one token bucket, so any number of threads
+    together stay under Notion's rate limit (about 3 requests/second). A 429
+    pauses the bucket for Retry-After and the request is retried. Pages are
+    keyed by policy ID: an existing page is updated instead of duplicated.
+    """
+    
+    PROPERTY_POLICY_ID = "Policy ID"
+    
+    def __init__(self, token: Optional[str] = None, database_id: Optional[str] = None,
+                 base_url: str = "https://api.notion.com/v1", rate_per_second: float = 3.0, burst: int = 3,
+                 timeout: float = 10, max_retries: int = 5):
         self.token = token or os.getenv('NOTION_TOKEN')
+        self.database_id = database_id or os.getenv('NOTION_DATABASE_ID')
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
             "Notion-Version": "2022-06-28"
         } if self.token else {}
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.session = requests.Session()
+        self._page_ids = {}  # policy ID -> page ID
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "rate_limited": 0, "retries": 0, "created": 0, "updated": 0}
     
     def create_policy_page(self, policy_data: Dict) -> Dict:
         """Create a policy tracking page in Notion"""
@@ -86,30 +204,299 @@ class NotionIntegration:
                 "page_id": f"notion_page_{len(policy_data.get('title', ''))}"
             }
         
-        # Real Notion API implementation would go here
-        return {"success": False, "message": "Notion integration not fully configured"}
+        if not self.database_id:
+            return {"success": False, "message": "Notion integration not fully configured"}
+        return self.upsert_policy_page(policy_data)
+    
+    def upsert_policy_page(self, policy_data: Dict) -> Dict:
+        """Create or update the page for a policy, keyed by its policy ID"""
+        policy_id = self.policy_key(policy_data)
+        properties = self.build_properties(policy_data, policy_id)
+        
+        # Concurrent upserts of one policy must not both create a page
+        with self._key_lock(policy_id):
+            try:
+                page_id = self._page_ids.get(policy_id) or self._find_page(policy_id)
+                if page_id:
+                    self._request("PATCH", f"/pages/{page_id}", {"properties": properties})
+                    action = "updated"
+                else:
+                    page_id = self._request("POST", "/pages", {
+                        "parent": {"database_id": self.database_id},
+                        "properties": properties
+                    })["id"]
+                    action = "created"
+            except Exception as e:
+                return {"success": False, "policy_id": policy_id, "message": f"Notion sync failed: {e}"}
+            self._page_ids[policy_id] = page_id
+        
+        with self._lock:
+            self._stats[action] += 1
+        return {
+            "success": True,
+            "message": f"Policy page {action} for {policy_data.get('title', policy_id)}",
+            "page_id": page_id,
+            "policy_id": policy_id,
+            "action": action
+        }
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['rate_limit'] = self.bucket.get_stats()
+        return stats
+    
+    @staticmethod
+    def policy_key(policy_data: Dict) -> str:
+        return str(policy_data.get('policy_id') or policy_data.get('id') or policy_data.get('title', 'Unknown Policy'))
+    
+    @classmethod
+    def build_properties(cls, policy_data: Dict, policy_id: str) -> Dict:
+        """Notion page properties for a policy (database columns: Name, Policy ID, Status, Source, Deadline, URL)"""
+        def text(value):
+            return {"rich_text": [{"text": {"content": str(value)[:2000]}}]}
+        
+        properties = {
+            "Name": {"title": [{"text": {"content": str(policy_data.get('title', policy_id))[:2000]}}]},
+            cls.PROPERTY_POLICY_ID: text(policy_id),
+            "Status": {"select": {"name": str(policy_data.get('status', 'Unknown'))[:100]}},
+            "Source": text(policy_data.get('source', 'Federal Register'))
+        }
+        if policy_data.get('deadline'):
+            properties["Deadline"] = text(policy_data['deadline'])
+        if policy_data.get('url'):
+            properties["URL"] = {"url": policy_data['url']}
+        return properties
+    
+    def _find_page(self, policy_id: str) -> Optional[str]:
+        results = self._request("POST", f"/databases/{self.database_id}/query", {
+            "filter": {"property": self.PROPERTY_POLICY_ID, "rich_text": {"equals": policy_id}},
+            "page_size": 1
+        }).get("results", [])
+        return results[0]["id"] if results else None
+    
+    def _request(self, method: str, path: str, payload: Dict) -> Dict:
+        """Send one rate-limited request, retrying 429s and server errors"""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            with self._lock:
+                self._stats["requests"] += 1
+            try:
+                response = self.session.request(method, self.base_url + path, json=payload,
+                                                headers=self.headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = str(e)
+                delay = min(30, 2 ** attempt)
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code == 429:
+                    with self._lock:
+                        self._stats["rate_limited"] += 1
+                    try:
+                        delay = float(response.headers.get("Retry-After", 1))
+                    except ValueError:
+                        delay = 1.0
+                    # Everyone sharing the bucket backs off, not just this request
+                    self.bucket.pause(delay)
+                    delay = 0
+                elif response.status_code >= 500:
+                    delay = min(30, 2 ** attempt)
+                else:
+                    raise RuntimeError(error)
+            
+            if attempt < self.max_retries:
+                with self._lock:
+                    self._stats["retries"] += 1
+                if delay:
+                    time.sleep(delay)
+        raise RuntimeError(f"giving up after {self.max_retries + 1} attempts: {error}")
+    
+    def _key_lock(self, policy_id: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(policy_id, threading.Lock())
 
 class ExternalToolManager:
-    def __init__(self):
-        self.slack = SlackIntegration()
-        self.calendar = CalendarIntegration()
-        self.notion = NotionIntegration()
+    """Dispatch policy updates to Slack, Notion and Calendar concurrently
     
-    def handle_policy_update(self, policy_info: Dict) -> Dict:
-        """Handle policy updates across all external tools"""
-        results = {}
+    Each integration runs in its own worker thread with its own timeout, so
+    a slow or failing integration neither delays nor breaks the others. An
+    integration that times out keeps its worker until it returns; the pool
+    is bounded so stuck calls cannot pile up threads. A call that times out
+    before a worker picked it up is cancelled, so it cannot still send an
+    alert or reminder after being reported as failed.
+    
+    Background dispatches are capped at ``max_dispatch_queue`` waiting or
+    running; beyond that ``dispatch_policy_update`` raises QueueFullError.
+    ``close()`` stops both pools.
+    """
+    
+    DEFAULT_TIMEOUTS = {'slack': 5.0, 'notion': 10.0, 'calendar': 5.0}
+    
+    def __init__(self, config: Optional[Dict] = None):
+        config = config or {}
+        outbox_config = config.get('slack_outbox', {})
+        tools_config = config.get('external_tools', {})
+        self.slack = SlackIntegration(timeout=outbox_config.get('timeout', 10))
+        self.calendar = CalendarIntegration(config.get('calendar', {}).get('path'))
+        notion_config = config.get('notion', {})
+        self.notion = NotionIntegration(
+            base_url=notion_config.get('base_url', 'https://api.notion.com/v1'),
+            rate_per_second=notion_config.get('rate_per_second', 3.0),
+            burst=notion_config.get('burst', 3),
+            timeout=notion_config.get('timeout', 10),
+            max_retries=notion_config.get('max_retries', 5)
+        )
+        self.notion_writer = None
+        self._notion_config = notion_config
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **tools_config.get('timeouts', {})}
         
-        # Send Slack notification
-        results['slack'] = self.slack.send_policy_alert(policy_info)
+        # Alerts are queued and delivered in the background unless the outbox is disabled
+        self.slack_outbox = None
+        if outbox_config.get('enabled', False):
+            from .slack_outbox import SlackOutbox
+            self.slack_outbox = SlackOutbox(
+                self.slack,
+                path=outbox_config.get('path', 'data/slack_outbox.db'),
+                batch_size=outbox_config.get('batch_size', 20),
+                batch_window=outbox_config.get('batch_window', 2.0),
+                max_backoff=outbox_config.get('max_backoff', 300),
+                max_attempts=outbox_config.get('max_attempts', 10)
+            )
         
-        # Create Notion page
-        results['notion'] = self.notion.create_policy_page(policy_info)
+        # Fan-out calls and fire-and-forget dispatches use separate pools, so a
+        # backlog of dispatches can never starve the calls they wait on
+        self._pool = ThreadPoolExecutor(max_workers=tools_config.get('max_workers', 8),
+                                        thread_name_prefix="external-tool")
+        self._dispatch_pool = ThreadPoolExecutor(max_workers=tools_config.get('dispatch_workers', 2),
+                                                 thread_name_prefix="alert-dispatch")
+        self.max_dispatch_queue = tools_config.get('max_dispatch_queue', 100)
+        self._dispatches = 0  # dispatches waiting or running
+        self._lock = threading.Lock()
+        self._stats = {"dispatched": 0, "completed": 0, "failures": 0, "timeouts": 0, "cancelled": 0,
+                       "rejected": 0}
+    
+    def handle_policy_update(self, policy_info: Dict) -> Dict:
+        """Handle policy updates across all external tools
+        
+        Returns each integration's result under its name, plus
+        ``latency_ms`` per integration. A failed or timed-out integration
+        reports ``{"success": False, "error": ...}`` instead of raising.
+        """
+        calls = {'slack': self._send_slack, 'notion': self.notion.create_policy_page}
         
         # Schedule reminder if deadline exists
         if policy_info.get('deadline'):
-            results['calendar'] = self.calendar.schedule_compliance_reminder(
-                policy_info.get('title', 'Policy'),
-                policy_info.get('deadline')
+            calls['calendar'] = lambda info: self.calendar.schedule_compliance_reminder(
+                info.get('title', 'Policy'),
+                info.get('deadline')
             )
         
-        return results
\ No newline at end of file
+        start = time.perf_counter()
+        futures = {name: self._pool.submit(self._timed, call, policy_info) for name, call in calls.items()}
+        
+        results, latency = {}, {}
+        for name, future in futures.items():
+            timeout = self.timeouts.get(name, 10.0)
+            remaining = max(0.0, start + timeout - time.perf_counter())
+            try:
+                results[name], elapsed = future.result(timeout=remaining)
+            except FuturesTimeoutError:
+                results[name] = {"success": False, "error": f"timed out after {timeout:g}s"}
+                elapsed = timeout
+                self._count("timeouts")
+                # Still queued behind busy workers: make sure it never runs late
+                if future.cancel():
+                    self._count("cancelled")
+            except Exception as e:
+                results[name] = {"success": False, "error": str(e)}
+                elapsed = time.perf_counter() - start
+                self._count("failures")
+            latency[name] = round(elapsed * 1000, 1)
+        
+        results['latency_ms'] = latency
+        return results
+    
+    def sync_notion(self, policies) -> Dict:
+        """Upsert many policies into the Notion database at the rate-limit ceiling"""
+        if not self.notion.token or not self.notion.database_id:
+            return {"success": False, "message": "Notion integration not fully configured"}
+        
+        with self._lock:
+            if self.notion_writer is None:
+                from .notion_writer import NotionWriter
+                self.notion_writer = NotionWriter(
+                    self.notion,
+                    workers=self._notion_config.get('workers', 3),
+                    max_queue_size=self._notion_config.get('max_queue_size', 100)
+                )
+        return {"success": True, **self.notion_writer.sync(policies)}
+    
+    def dispatch_policy_update(self, policy_info: Dict) -> Future:
+        """Handle a policy update in the background; returns without waiting
+        
+        Raises QueueFullError when ``max_dispatch_queue`` dispatches are already pending.
+        """
+        with self._lock:
+            if self._dispatches >= self.max_dispatch_queue:
+                self._stats["rejected"] += 1
+                raise QueueFullError(f"Alert dispatch queue is full ({self.max_dispatch_queue} pending)")
+            self._dispatches += 1
+            self._stats["dispatched"] += 1
+        future = self._dispatch_pool.submit(self.handle_policy_update, policy_info)
+        future.add_done_callback(self._dispatch_done)
+        return future
+    
+    def close(self, wait: bool = True):
+        """Stop the worker pools, dropping dispatches that have not started, and the Slack and Notion workers"""
+        self._dispatch_pool.shutdown(wait=wait, cancel_futures=True)
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        if self.slack_outbox is not None:
+            self.slack_outbox.close()
+        if self.notion_writer is not None:
+            self.notion_writer.close()
+    
+    def resume_outbox(self) -> int:
+        """Resume delivery of Slack alerts queued before a restart; returns how many are pending"""
+        if self.slack_outbox is None:
+            return 0
+        return self.slack_outbox.resume()
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_dispatches'] = self._dispatches
+        stats['timeouts_seconds'] = dict(self.timeouts)
+        stats['reminders'] = self.calendar.index.get_stats()
+        stats['notion'] = self.notion.get_stats()
+        if self.slack_outbox is not None:
+            stats['slack_outbox'] = self.slack_outbox.get_stats()
+        return stats
+    
+    def _send_slack(self, policy_info: Dict):
+        if self.slack_outbox is not None:
+            return self.slack_outbox.enqueue(policy_info)
+        return self.slack.send_policy_alert(policy_info)
+    
+    @staticmethod
+    def _timed(call, policy_info: Dict):
+        start = time.perf_counter()
+        return call(policy_info), time.perf_counter() - start
+    
+    def _dispatch_done(self, future: Future):
+        with self._lock:
+            self._dispatches -= 1
+        if future.cancelled():
+            self._count("cancelled")
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Policy alert dispatch failed: {error}")
+            self._count("failures")
+        else:
+            self._count("completed")
+    
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
@@ -1,18 +1,15 @@
 import requests
 from typing import Dict, List, Optional
+from ..utils.config import get_config
 
 class FederalRegisterAPI:
-    def __init__(self):
-        self.base_url = "https://www.federalregister.gov/api/v1"
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or get_config()['data_sources']['federal_register']['base_url']
     
     def search_documents(self, query: str, limit: int = 10) -> List[Dict]:
         """Search Federal Register documents"""
         url = f"{self.base_url}/documents.json"
-        params = {
-            'conditions[term]': query,
-            'per_page': limit,
-            'fields[]': ['title', 'abstract', 'html_url', 'publication_date', 'type', 'agencies']
-        }
+        params = self.search_params(query, limit)
         
         try:
             response = requests.get(url, params=params)
@@ -22,6 +19,16 @@ class FederalRegisterAPI:
             print(f"Error searching Federal Register: {e}")
             return []
     
+    def get_recent_documents(self, limit: int = 20) -> List[Dict]:
+        """Get the newest Federal Register documents; raises on request errors"""
+        response = requests.get(
+            f"{self.base_url}/documents.json",
+            params={'per_page': limit, 'order': 'newest', 'fields[]': ['document_number', 'title', 'abstract', 'html_url', 'publication_date', 'type']},
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json().get('results', [])
+    
     def get_document_by_number(self, document_number: str) -> Optional[Dict]:
         """Get specific document by Federal Register number"""
         url = f"{self.base_url}/documents/{document_number}.json"
@@ -34,10 +41,35 @@ class FederalRegisterAPI:
             print(f"Error fetching document {document_number}: {e}")
             return None
     
+    def get_documents(self, document_numbers: List[str], fields: List[str]) -> List[Dict]:
+        """Fetch selected fields of several documents in one request; raises on request errors"""
+        response = requests.get(
+            f"{self.base_url}/documents/{','.join(document_numbers)}.json",
+            params={'fields[]': fields},
+            timeout=10
+        )
+        response.raise_for_status()
+        data = response.json()
+        # A single document number returns the document itself rather than a result list
+        return data.get('results', []) if 'results' in data else [data]
+    
     def check_policy_status(self, policy_id: str) -> Dict:
         """Check if a policy is still in effect"""
         documents = self.search_documents(policy_id, limit=5)
-        
+        return self.summarize_status(policy_id, documents)
+    
+    @staticmethod
+    def search_params(query: str, limit: int) -> Dict:
+        """Query parameters for a document search"""
+        return {
+            'conditions[term]': query,
+            'per_page': limit,
+            'fields[]': ['document_number', 'title', 'abstract', 'html_url', 'publication_date', 'type', 'agencies']
+        }
+    
+    @staticmethod
+    def summarize_status(policy_id: str, documents: List[Dict]) -> Dict:
+        """Summarize policy status from search results"""
         if not documents:
             return {"status": "not_found", "message": f"No documents found for {policy_id}"}
         
@@ -0,0 +1,120 @@
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+class NotionWriter:
+    """Sync policies into Notion from a bounded queue drained by worker threads
+
+    ``submit`` blocks while the queue is full, so a producer of hundreds of
+    policies is held to the pace Notion accepts rather than buffering
+    without limit. A policy that is submitted again while still queued is
+    updated in place and written once. Workers share the integration's
+    token bucket, so together they run at the rate-limit ceiling.
+    """
+
+    def __init__(self, notion, workers: int = 3, max_queue_size: int = 100):
+        self.notion = notion
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._pending = {}  # policy ID -> latest policy data
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stats = {"submitted": 0, "coalesced": 0, "created": 0, "updated": 0, "failed": 0}
+        self._errors = deque(maxlen=20)
+
+    def submit(self, policy_data: Dict, block: bool = True, timeout: Optional[float] = None) -> bool:
+        """Queue a policy for upsert; False if the queue stayed full"""
+        key = self.notion.policy_key(policy_data)
+        with self._lock:
+            self._stats["submitted"] += 1
+            if key in self._pending:
+                self._pending[key] = policy_data
+                self._stats["coalesced"] += 1
+                return True
+            self._pending[key] = policy_data
+        self._start()
+
+        try:
+            self._queue.put(key, block=block, timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._pending.pop(key, None)
+                self._stats["submitted"] -= 1
+            return False
+        return True
+
+    def sync(self, policies: Iterable[Dict]) -> Dict:
+        """Upsert every policy and wait for the writes; returns counts and throughput"""
+        before = self.get_stats()
+        requests_before = self.notion.get_stats()["requests"]
+        start = time.perf_counter()
+
+        for policy_data in policies:
+            self.submit(policy_data)
+        self.join()
+
+        elapsed = time.perf_counter() - start
+        after = self.get_stats()
+        requests = self.notion.get_stats()["requests"] - requests_before
+        summary = {key: after[key] - before[key] for key in ("submitted", "coalesced", "created", "updated", "failed")}
+        summary.update({
+            "errors": after["errors"][-summary["failed"]:] if summary["failed"] else [],
+            "requests": requests,
+            "elapsed_seconds": elapsed,
+            "requests_per_second": requests / elapsed if elapsed else 0.0
+        })
+        return summary
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued policy has been written; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self):
+        """Finish queued writes and stop the workers"""
+        self.join()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "queued": self._queue.qsize(), "workers": len(self._threads),
+                    "errors": list(self._errors)}
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for n in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"notion-writer-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            key = self._queue.get()
+            try:
+                if key is None:
+                    return
+                with self._lock:
+                    policy_data = self._pending.pop(key)
+                result = self.notion.upsert_policy_page(policy_data)
+                with self._lock:
+                    if result.get("success"):
+                        self._stats[result["action"]] += 1
+                    else:
+                        self._stats["failed"] += 1
+                        self._errors.append({"policy_id": key, "error": result.get("message")})
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Federal Register fields that define a policy's legal state; everything else is ignored
+WATCHED_FIELDS = ["title", "type", "action", "dates", "effective_on", "executive_order_notes",
+                  "disposition_notes", "corrections", "correction_of", "abstract"]
+FETCHED_FIELDS = ["document_number", "html_url", "publication_date"] + WATCHED_FIELDS
+
+_REPEAL = re.compile(r"\b(revok\w*|rescind\w*|repeal\w*|supersed\w*|withdraw\w*|vacat\w*)\b", re.I)
+_AMEND = re.compile(r"\b(amend\w*|modif\w*|extend\w*|supplement\w*)\b", re.I)
+
+def normalize(value):
+    """Collapse whitespace and key order so cosmetic edits do not change fingerprints"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, list):
+        return [normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: normalize(value[key]) for key in sorted(value)}
+    return value
+
+def fingerprint(snapshot: Dict) -> str:
+    return hashlib.sha256(json.dumps(snapshot, sort_keys=True).encode("utf-8")).hexdigest()
+
+def diff_snapshots(before: Dict, after: Dict) -> Dict:
+    """Field-level changes as {field: {"before": ..., "after": ...}}"""
+    return {
+        field: {"before": before.get(field), "after": after.get(field)}
+        for field in WATCHED_FIELDS
+        if before.get(field) != after.get(field)
+    }
+
+def classify_change(changes: Dict) -> str:
+    """Name a change: "repealed", "amended", "corrected" or "edited"
+
+    Only wording that newly appears counts, so a note that already said
+    "Revoked by" does not re-trigger on an unrelated edit.
+    """
+    def added_text(field):
+        change = changes.get(field)
+        if not change:
+            return ""
+        before, after = str(change["before"] or ""), str(change["after"] or "")
+        return after.replace(before, "") if before in after else after
+
+    notes = " ".join(added_text(field) for field in ("executive_order_notes", "disposition_notes", "action"))
+    if _REPEAL.search(notes):
+        return "repealed"
+    if _AMEND.search(notes) or "effective_on" in changes or "dates" in changes:
+        return "amended"
+    if "corrections" in changes or "correction_of" in changes:
+        return "corrected"
+    return "edited"
+
+class PolicyWatcher:
+    """Detect real changes to tracked Federal Register documents
+
+    Each check fetches only the fields that define a document's legal state,
+    many documents per request, and compares a SHA-256 fingerprint of the
+    normalized fields with the stored one. The stored snapshot is read and
+    diffed only when the fingerprints differ, and ``on_change`` runs only for
+    change kinds in ``alert_on`` (amendments and repeals by default).
+    """
+
+    def __init__(self, federal_api, on_change: Optional[Callable[[Dict], Dict]] = None,
+                 path: Optional[str] = "data/policy_watch.db", batch_size: int = 50,
+                 alert_on: Optional[List[str]] = None):
+        self.federal_api = federal_api
+        self.on_change = on_change
+        self.path = path
+        self.batch_size = batch_size
+        self.alert_on = set(alert_on or ["amended", "repealed"])
+        self._fingerprints = {}  # document number -> fingerprint (None until first check)
+        self._labels = {}        # document number -> policy ID shown in alerts
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._stats = {"checks": 0, "documents_checked": 0, "requests": 0, "unchanged": 0,
+                       "changed": 0, "alerts": 0, "missing": 0, "errors": 0}
+        self._open_db()
+
+    def track(self, document_number: str, policy_id: Optional[str] = None) -> bool:
+        """Start watching a document; returns False if it was already tracked"""
+        with self._lock:
+            if document_number in self._fingerprints:
+                return False
+            self._fingerprints[document_number] = None
+            self._labels[document_number] = policy_id or document_number
+            self._db.execute(
+                "INSERT INTO watched (document_number, policy_id, fingerprint, snapshot, checked, changed) "
+                "VALUES (?, ?, NULL, NULL, NULL, NULL)",
+                (document_number, self._labels[document_number])
+            )
+            self._db.commit()
+        return True
+
+    def resolve_policy(self, policy_id: str) -> Optional[str]:
+        """Find the Federal Register document for a policy ID such as EO 14067"""
+        documents = self.federal_api.search_documents(policy_id, limit=1)
+        return documents[0].get("document_number") if documents else None
+
+    def untrack(self, document_number: str) -> bool:
+        with self._lock:
+            if document_number not in self._fingerprints:
+                return False
+            del self._fingerprints[document_number]
+            self._labels.pop(document_number, None)
+            self._db.execute("DELETE FROM watched WHERE document_number = ?", (document_number,))
+            self._db.commit()
+        return True
+
+    def check_all(self) -> Dict:
+        """Re-check every tracked document; returns counts and the changes found"""
+        with self._check_lock:
+            with self._lock:
+                numbers = list(self._fingerprints)
+            changes = []
+            for start in range(0, len(numbers), self.batch_size):
+                changes.extend(self._check_batch(numbers[start:start + self.batch_size]))
+            with self._lock:
+                self._stats["checks"] += 1
+        return {"checked": len(numbers), "changes": changes, "alerts": sum(1 for c in changes if c["alerted"])}
+
+    def refresh(self) -> bool:
+        """Refresh function for the re-index scheduler: True when anything changed"""
+        return bool(self.check_all()["changes"])
+
+    def get_watched(self) -> List[Dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT document_number, policy_id, status, checked, changed FROM watched ORDER BY document_number"
+            ).fetchall()
+        return [
+            {"document_number": number, "policy_id": policy_id, "status": status,
+             "last_checked": checked, "last_changed": changed}
+            for number, policy_id, status, checked, changed in rows
+        ]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "tracked": len(self._fingerprints)}
+
+    def _check_batch(self, numbers: List[str]) -> List[Dict]:
+        try:
+            documents = self.federal_api.get_documents(numbers, FETCHED_FIELDS)
+        except Exception as e:
+            print(f"Policy watch request failed: {e}")
+            with self._lock:
+                self._stats["requests"] += 1
+                self._stats["errors"] += 1
+            return []
+
+        now = time.time()
+        found = {document.get("document_number"): document for document in documents}
+        changes, unchanged = [], []
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["documents_checked"] += len(found)
+            self._stats["missing"] += sum(1 for number in numbers if number not in found)
+
+        for number in numbers:
+            document = found.get(number)
+            if document is None:
+                continue
+            snapshot = normalize({field: document.get(field) for field in WATCHED_FIELDS})
+            new_fingerprint = fingerprint(snapshot)
+            old_fingerprint = self._fingerprints.get(number)
+            if new_fingerprint == old_fingerprint:
+                unchanged.append(number)
+                continue
+            change = self._record_change(number, document, snapshot, new_fingerprint, old_fingerprint, now)
+            if change:
+                changes.append(change)
+
+        with self._lock:
+            self._stats["unchanged"] += len(unchanged)
+            if unchanged:
+                self._db.executemany("UPDATE watched SET checked = ? WHERE document_number = ?",
+                                     [(now, number) for number in unchanged])
+                self._db.commit()
+        return changes
+
+    def _record_change(self, number: str, document: Dict, snapshot: Dict, new_fingerprint: str,
+                       old_fingerprint: Optional[str], now: float) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT snapshot, status FROM watched WHERE document_number = ?",
+                                   (number,)).fetchone()
+            if row is None:
+                return None  # untracked meanwhile
+            self._fingerprints[number] = new_fingerprint
+
+            # The first sighting is the baseline, not a change
+            if old_fingerprint is None:
+                self._db.execute(
+                    "UPDATE watched SET fingerprint = ?, snapshot = ?, checked = ?, status = 'active' "
+                    "WHERE document_number = ?",
+                    (new_fingerprint, json.dumps(snapshot), now, number)
+                )
+                self._db.commit()
+                return None
+
+            changes = diff_snapshots(json.loads(row[0]), snapshot)
+            kind = classify_change(changes)
+            status = kind if kind in ("amended", "repealed") else row[1]
+            self._db.execute(
+                "UPDATE watched SET fingerprint = ?, snapshot = ?, checked = ?, changed = ?, status = ? "
+                "WHERE document_number = ?",
+                (new_fingerprint, json.dumps(snapshot), now, now, status, number)
+            )
+            self._db.commit()
+            self._stats["changed"] += 1
+            label = self._labels.get(number, number)
+
+        change = {"document_number": number, "policy_id": label, "kind": kind, "changes": changes,
+                  "alerted": False}
+        if kind in self.alert_on and self.on_change is not None:
+            try:
+                self.on_change({
+                    "policy_id": label,
+                    "title": document.get("title") or label,
+                    "status": kind,
+                    "source": "Federal Register",
+                    "url": document.get("html_url"),
+                    "document_number": number,
+                    "changes": changes
+                })
+                change["alerted"] = True
+                with self._lock:
+                    self._stats["alerts"] += 1
+            except Exception as e:
+                print(f"Policy change alert failed for {number}: {e}")
+        return change
+
+    def _open_db(self):
+        path = self.path or ":memory:"
+        directory = os.path.dirname(path) if self.path else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS watched (document_number TEXT PRIMARY KEY, policy_id TEXT, "
+            "fingerprint TEXT, snapshot TEXT, checked REAL, changed REAL, status TEXT)"
+        )
+        self._db.commit()
+
+        # Only fingerprints are kept in memory; snapshots are read when a fingerprint differs
+        for number, policy_id, stored in self._db.execute(
+                "SELECT document_number, policy_id, fingerprint FROM watched"):
+            self._fingerprints[number] = stored
+            self._labels[number] = policy_id
@@ -0,0 +1,204 @@
+import bisect
+import calendar
+import heapq
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Recurrence name -> (months, days) per period, checked in this order
+RECURRENCES = {
+    "semiannual": (6, 0),
+    "annual": (12, 0),
+    "quarterly": (3, 0),
+    "monthly": (1, 0),
+    "biweekly": (0, 14),
+    "weekly": (0, 7),
+    "daily": (0, 1)
+}
+
+_RECURRENCE_PATTERNS = [
+    ("semiannual", re.compile(r"\b(semi-?annual(ly)?|bi-?annual(ly)?|twice a year)\b", re.I)),
+    ("annual", re.compile(r"\b(annual(ly)?|yearly|every year|each year)\b", re.I)),
+    ("quarterly", re.compile(r"\b(quarterly|every quarter|each quarter)\b", re.I)),
+    ("monthly", re.compile(r"\b(monthly|every month|each month)\b", re.I)),
+    ("biweekly", re.compile(r"\b(bi-?weekly|every (two|2) weeks)\b", re.I)),
+    ("weekly", re.compile(r"\b(weekly|every week|each week)\b", re.I)),
+    ("daily", re.compile(r"\b(daily|every day|each day)\b", re.I))
+]
+
+_DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%m/%d/%Y", "%B %d %Y", "%b %d %Y",
+                 "%d %B %Y"]
+_DATE_IN_TEXT = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?|\d{1,2}/\d{1,2}/\d{4}|"
+    r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.? \d{1,2},? \d{4}",
+    re.I
+)
+
+def add_months(moment: datetime, months: int) -> datetime:
+    """Add calendar months, clamping the day to the end of shorter months"""
+    month_index = moment.month - 1 + months
+    year, month = moment.year + month_index // 12, month_index % 12 + 1
+    return moment.replace(year=year, month=month, day=min(moment.day, calendar.monthrange(year, month)[1]))
+
+def occurrence(anchor: datetime, recurrence: Optional[str], n: int) -> datetime:
+    """The n-th occurrence of a deadline (the anchor is occurrence 0)"""
+    if not recurrence or n == 0:
+        return anchor
+    months, days = RECURRENCES[recurrence]
+    # Step from the anchor each time so month-end clamping never drifts
+    return add_months(anchor, months * n) if months else anchor + timedelta(days=days * n)
+
+def parse_date(text: str) -> Optional[datetime]:
+    cleaned = text.strip().replace(",", "").replace(".", "")
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, date_format)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(text.strip())
+    except ValueError:
+        return None
+
+def parse_deadline(deadline: str, now: Optional[datetime] = None) -> Tuple[Optional[datetime], Optional[str]]:
+    """Parse a deadline string into (first due date, recurrence)
+
+    Accepts dates ("2025-12-31", "12/31/2025", "December 31, 2025"),
+    recurring phrases ("Annual review required", "Quarterly assessments")
+    or both ("Quarterly filings starting 2025-01-15"). A recurring phrase
+    without a date is first due one period from ``now``. Returns
+    (None, None) when nothing is recognized.
+    """
+    now = now or datetime.now()
+    recurrence = next((name for name, pattern in _RECURRENCE_PATTERNS if pattern.search(deadline)), None)
+
+    anchor = parse_date(deadline)
+    if anchor is None:
+        match = _DATE_IN_TEXT.search(deadline)
+        anchor = parse_date(match.group(0)) if match else None
+    if anchor is None and recurrence:
+        anchor = occurrence(now, recurrence, 1)
+    return anchor, recurrence
+
+class ReminderIndex:
+    """Time-ordered index of reminders with lazily expanded recurrences
+
+    One-off reminders sit in a sorted array of (due, id). Each recurring
+    reminder has a single entry in a second sorted array, keyed by its next
+    occurrence; later occurrences are generated only when a query reaches
+    them. Before a query, series whose next occurrence has passed are rolled
+    forward, which is amortized over the occurrences that elapsed. A range
+    query is then two bisections plus the k occurrences returned.
+    """
+
+    def __init__(self):
+        self._once = []       # sorted (due timestamp, id)
+        self._recurring = []  # sorted (next occurrence timestamp, id)
+        self._series = {}     # id -> (anchor, recurrence, next occurrence number)
+        self._rolled_to = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self._once) + len(self._recurring)
+
+    def add(self, reminder_id: int, anchor: datetime, recurrence: Optional[str] = None,
+            now: Optional[datetime] = None):
+        if not recurrence:
+            bisect.insort(self._once, (anchor.timestamp(), reminder_id))
+            return
+
+        # A series starts at its first occurrence that has not passed yet
+        floor = max(self._rolled_to, (now or datetime.now()).timestamp())
+        n = self._first_occurrence_after(anchor, recurrence, floor)
+        self._series[reminder_id] = (anchor, recurrence, n)
+        bisect.insort(self._recurring, (occurrence(anchor, recurrence, n).timestamp(), reminder_id))
+
+    def add_many(self, entries: List[Tuple[int, datetime, Optional[str]]], now: Optional[datetime] = None):
+        """Add (id, anchor, recurrence) entries with one sort instead of an insert each"""
+        floor = max(self._rolled_to, (now or datetime.now()).timestamp())
+        for reminder_id, anchor, recurrence in entries:
+            if not recurrence:
+                self._once.append((anchor.timestamp(), reminder_id))
+                continue
+            n = self._first_occurrence_after(anchor, recurrence, floor)
+            self._series[reminder_id] = (anchor, recurrence, n)
+            self._recurring.append((occurrence(anchor, recurrence, n).timestamp(), reminder_id))
+        self._once.sort()
+        self._recurring.sort()
+
+    def remove(self, reminder_id: int, anchor: datetime, recurrence: Optional[str] = None) -> bool:
+        if recurrence:
+            series = self._series.pop(reminder_id, None)
+            if series is None:
+                return False
+            key = (occurrence(*series).timestamp(), reminder_id)
+            entries = self._recurring
+        else:
+            key = (anchor.timestamp(), reminder_id)
+            entries = self._once
+        position = bisect.bisect_left(entries, key)
+        if position < len(entries) and entries[position] == key:
+            del entries[position]
+            return True
+        return False
+
+    def between(self, start: datetime, end: datetime) -> List[Tuple[datetime, int]]:
+        """(due, id) for every occurrence in [start, end], in due order
+
+        Occurrences of recurring reminders before the current time are not
+        reported; their series have moved on.
+        """
+        self.roll_forward(datetime.now())
+        low, high = start.timestamp(), end.timestamp()
+
+        first = bisect.bisect_left(self._once, (low, -1))
+        last = bisect.bisect_right(self._once, (high, float("inf")))
+        once = ((datetime.fromtimestamp(due), reminder_id) for due, reminder_id in self._once[first:last])
+
+        last = bisect.bisect_right(self._recurring, (high, float("inf")))
+        expansions = [self._expand(reminder_id, low, high) for _, reminder_id in self._recurring[:last]]
+        return list(heapq.merge(once, *expansions))
+
+    def roll_forward(self, now: datetime):
+        """Move every series whose next occurrence has passed to its next future one"""
+        floor = now.timestamp()
+        if floor <= self._rolled_to:
+            return
+        self._rolled_to = floor
+
+        passed = bisect.bisect_left(self._recurring, (floor, -1))
+        if not passed:
+            return
+        moved, self._recurring = self._recurring[:passed], self._recurring[passed:]
+        for _, reminder_id in moved:
+            anchor, recurrence, n = self._series[reminder_id]
+            while occurrence(anchor, recurrence, n).timestamp() < floor:
+                n += 1
+            self._series[reminder_id] = (anchor, recurrence, n)
+            bisect.insort(self._recurring, (occurrence(anchor, recurrence, n).timestamp(), reminder_id))
+
+    def _expand(self, reminder_id: int, low: float, high: float) -> Iterator[Tuple[datetime, int]]:
+        anchor, recurrence, n = self._series[reminder_id]
+        if occurrence(anchor, recurrence, n).timestamp() < low:
+            n = self._first_occurrence_after(anchor, recurrence, low, start=n)
+        while True:
+            due = occurrence(anchor, recurrence, n)
+            if due.timestamp() > high:
+                return
+            yield due, reminder_id
+            n += 1
+
+    @staticmethod
+    def _first_occurrence_after(anchor: datetime, recurrence: str, floor: float, start: int = 0) -> int:
+        n = start
+        if occurrence(anchor, recurrence, n).timestamp() >= floor:
+            return n
+        # Jump close to the target in one step, then settle on it exactly
+        months, days = RECURRENCES[recurrence]
+        period = months * 30.44 * 86400 if months else days * 86400
+        n = max(n, int((floor - anchor.timestamp()) // period) - 1)
+        while occurrence(anchor, recurrence, n).timestamp() < floor:
+            n += 1
+        return n
+
+    def get_stats(self) -> Dict:
+        return {"one_off": len(self._once), "recurring": len(self._recurring)}
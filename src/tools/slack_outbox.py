@@ -0,0 +1,223 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+# A digest uses a header plus two blocks per alert; Slack accepts at most 50 blocks
+MAX_DIGEST_ALERTS = 24
+
+class SlackOutbox:
+    """Durable queue of Slack policy alerts, delivered by a background worker
+
+    Alerts are written to SQLite when enqueued and deleted only once the
+    webhook accepts them, so undelivered alerts survive restarts. The worker
+    waits up to ``batch_window`` seconds after the oldest alert arrives and
+    posts everything pending as one message: a single alert keeps the usual
+    format, several become a digest. A 429 pauses delivery for Retry-After
+    seconds without spending an attempt; 5xx and connection errors retry with
+    exponential backoff; other 4xx responses, and alerts that run out of
+    attempts, are kept as dead letters.
+    """
+
+    def __init__(self, slack, path: Optional[str] = "data/slack_outbox.db", batch_size: int = 20,
+                 batch_window: float = 2.0, base_backoff: float = 1.0, max_backoff: float = 300,
+                 max_attempts: int = 10, default_retry_after: float = 30, idle_wait: float = 60):
+        self.slack = slack
+        self.path = path
+        self.batch_size = max(1, min(batch_size, MAX_DIGEST_ALERTS))
+        self.batch_window = batch_window
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.default_retry_after = default_retry_after
+        self.idle_wait = idle_wait
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._paused_until = 0.0
+        self._stats = {"enqueued": 0, "delivered": 0, "messages_sent": 0, "rate_limited": 0,
+                       "retries": 0, "dead": 0}
+        self._open_db()
+
+    def enqueue(self, policy_info: Dict):
+        """Queue an alert and return immediately; False if no webhook is configured"""
+        if not self.slack.webhook_url:
+            print("Slack webhook not configured")
+            return False
+
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO outbox (policy_info, created, attempts, next_attempt, status) VALUES (?, ?, 0, ?, 'pending')",
+                (json.dumps(policy_info), now, now)
+            )
+            self._db.commit()
+            self._stats["enqueued"] += 1
+        self.start()
+        self._wake.set()
+        return {"queued": True, "outbox_id": cursor.lastrowid}
+
+    def resume(self) -> int:
+        """Start delivering alerts a previous process left pending; returns how many there are"""
+        pending = self._count("pending")
+        if pending and self.slack.webhook_url:
+            self.start()
+        return pending
+
+    def start(self):
+        """Start the delivery thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="slack-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    def flush(self, timeout: float = 10) -> bool:
+        """Wait until no alerts are pending; returns False on timeout"""
+        deadline = time.time() + timeout
+        while self._count("pending"):
+            if time.time() >= deadline:
+                return False
+            self._wake.set()
+            time.sleep(0.05)
+        return True
+
+    def get_stats(self) -> Dict:
+        return {
+            **self._stats,
+            "pending": self._count("pending"),
+            "dead_letters": self._count("dead"),
+            "paused_seconds": round(max(0.0, self._paused_until - time.time()), 1),
+            "active": self._thread is not None and self._thread.is_alive()
+        }
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            now = time.time()
+            if self._paused_until > now:
+                self._wake.wait(self._paused_until - now)
+                continue
+
+            rows = self._due(now)
+            if not rows:
+                self._wake.wait(self._idle_timeout(now))
+                continue
+
+            # Give a burst of alerts a moment to collect into one digest
+            window_ends = rows[0][2] + self.batch_window
+            if len(rows) < self.batch_size and window_ends > now:
+                self._wake.wait(window_ends - now)
+                continue
+
+            self._deliver(rows)
+
+    def _deliver(self, rows: List[tuple]):
+        ids = [row[0] for row in rows]
+        infos = [json.loads(row[1]) for row in rows]
+        message = self.slack.build_message(infos[0]) if len(infos) == 1 else self.slack.build_digest(infos)
+
+        try:
+            response = self.slack.post(message)
+        except Exception as e:
+            self._retry(rows, str(e))
+            return
+
+        if response.status_code == 200:
+            with self._lock:
+                self._db.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in ids])
+                self._db.commit()
+                self._stats["delivered"] += len(ids)
+                self._stats["messages_sent"] += 1
+        elif response.status_code == 429:
+            self._stats["rate_limited"] += 1
+            self._paused_until = time.time() + self._retry_after(response)
+        elif response.status_code >= 500:
+            self._retry(rows, f"HTTP {response.status_code}")
+        else:
+            print(f"Slack rejected {len(ids)} alert(s): HTTP {response.status_code}")
+            self._mark_dead(ids, f"HTTP {response.status_code}")
+
+    def _retry(self, rows: List[tuple], error: str):
+        now = time.time()
+        dead = []
+        with self._lock:
+            for row_id, _, _, attempts in rows:
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    dead.append(row_id)
+                    continue
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+                self._db.execute(
+                    "UPDATE outbox SET attempts = ?, next_attempt = ?, error = ? WHERE id = ?",
+                    (attempts, now + delay, error, row_id)
+                )
+                self._stats["retries"] += 1
+            self._db.commit()
+        if dead:
+            print(f"Slack delivery gave up on {len(dead)} alert(s): {error}")
+            self._mark_dead(dead, error)
+
+    def _mark_dead(self, ids: List[int], error: str):
+        with self._lock:
+            self._db.executemany(
+                "UPDATE outbox SET status = 'dead', error = ? WHERE id = ?", [(error, row_id) for row_id in ids]
+            )
+            self._db.commit()
+            self._stats["dead"] += len(ids)
+
+    def _retry_after(self, response) -> float:
+        try:
+            return max(0.0, float(response.headers.get("Retry-After")))
+        except (TypeError, ValueError):
+            return self.default_retry_after
+
+    def _due(self, now: float) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, policy_info, created, attempts FROM outbox "
+                "WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+                (now, self.batch_size)
+            ).fetchall()
+
+    def _idle_timeout(self, now: float) -> float:
+        with self._lock:
+            next_attempt = self._db.execute(
+                "SELECT MIN(next_attempt) FROM outbox WHERE status = 'pending'"
+            ).fetchone()[0]
+        if next_attempt is None:
+            return self.idle_wait
+        return min(self.idle_wait, max(0.0, next_attempt - now))
+
+    def _count(self, status: str) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM outbox WHERE status = ?", (status,)).fetchone()[0]
+
+    def _open_db(self):
+        path = self.path or ":memory:"
+        directory = os.path.dirname(path) if self.path else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, policy_info TEXT, "
+            "created REAL, attempts INTEGER, next_attempt REAL, status TEXT, error TEXT)"
+        )
+        self._db.commit()
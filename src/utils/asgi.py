@@ -0,0 +1,39 @@
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Iterator, Optional
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Helpers for the Starlette app in asgi_server.py: Flask-like JSON responses
+# and request bodies, and driving async iterators from worker threads.
+
+def jsonify(data, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """A JSON response that serializes dates and other objects like the Flask server does"""
+    return Response(json.dumps(data, default=str), status, headers, media_type="application/json")
+
+async def read_json(request: Request) -> Optional[Dict]:
+    """The body parsed as JSON, or None when it is empty or not JSON"""
+    body = await request.body()
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+def mimetype(request: Request) -> str:
+    return request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+def iterate_from_thread(iterator: AsyncIterator, loop: asyncio.AbstractEventLoop) -> Iterator:
+    """Consume an async iterator from a worker thread, one item per loop round trip"""
+    done = object()
+
+    async def next_item():
+        try:
+            return await iterator.__anext__()
+        except StopAsyncIteration:
+            return done
+
+    while True:
+        item = asyncio.run_coroutine_threadsafe(next_item(), loop).result()
+        if item is done:
+            return
+        yield item
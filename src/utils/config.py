@@ -4,8 +4,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+_config = None
+
 def load_config():
-    config_path = os.path.join(os.path.dirname(__file__), '../../config/config.yaml')
+    # POLICY_NAVIGATOR_CONFIG points at an alternate file, e.g. one aimed at local stand-in servers
+    default_path = os.path.join(os.path.dirname(__file__), '../../config/config.yaml')
+    config_path = os.getenv('POLICY_NAVIGATOR_CONFIG', default_path)
     with open(config_path, 'r') as f:
         config = yaml.safe_load(f)
     
@@ -13,4 +17,15 @@ def load_config():
     config['aixplain']['api_key'] = os.getenv('AIXPLAIN_API_KEY')
     return config
 
-CONFIG = load_config()
\ No newline at end of file
+def get_config():
+    """Load config.yaml on first use and reuse it afterwards"""
+    global _config
+    if _config is None:
+        _config = load_config()
+    return _config
+
+def __getattr__(name):
+    # CONFIG is resolved on first access so importing this module stays cheap
+    if name == 'CONFIG':
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
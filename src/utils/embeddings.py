@@ -0,0 +1,43 @@
+import math
+import zlib
+from typing import Dict
+from .text import normalize_text, tokenize
+
+class HashingEmbedder:
+    """Local text embedder using feature hashing of words and character trigrams
+
+    Needs no model or network call, so it is cheap enough to run on every
+    request. Vectors are sparse ``{dimension: weight}`` dicts normalized to
+    unit length, and hashing is stable across processes so vectors can be
+    recomputed from persisted text.
+    """
+
+    def __init__(self, dimensions: int = 1024, trigram_weight: float = 0.3):
+        self.dimensions = dimensions
+        self.trigram_weight = trigram_weight
+
+    def embed(self, text: str) -> Dict[int, float]:
+        """Embed text as a normalized sparse vector"""
+        vector = {}
+        for token in tokenize(normalize_text(text)):
+            self._add(vector, token, 1.0)
+            if token.isalpha() and len(token) > 3:
+                padded = f"#{token}#"
+                for i in range(len(padded) - 2):
+                    self._add(vector, padded[i:i + 3], self.trigram_weight)
+
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm:
+            vector = {index: weight / norm for index, weight in vector.items()}
+        return vector
+
+    @staticmethod
+    def similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+        """Cosine similarity of two normalized sparse vectors"""
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+    def _add(self, vector: Dict[int, float], feature: str, weight: float):
+        index = zlib.crc32(feature.encode("utf-8")) % self.dimensions
+        vector[index] = vector.get(index, 0.0) + weight
@@ -0,0 +1,124 @@
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+class JobQueue:
+    """Bounded queue of background jobs run by a fixed pool of worker threads
+
+    ``max_workers`` caps how many jobs run at once (and so how many calls are
+    in flight toward the upstream service); ``max_queue_size`` caps how many
+    may wait. Finished jobs are kept for ``ttl_seconds`` so clients can poll
+    their results, then discarded.
+    """
+
+    def __init__(self, handler: Callable[[Dict], Any], max_workers: int = 4,
+                 max_queue_size: int = 100, ttl_seconds: float = 3600):
+        self.handler = handler
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.ttl_seconds = ttl_seconds
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._jobs = {}
+        self._finished = deque()  # (finish time, job id), oldest first
+        self._lock = threading.Lock()
+        self._workers = []
+        self._running = 0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "expired": 0}
+
+    def submit(self, payload: Dict) -> Dict:
+        """Queue a job; raises QueueFullError when the queue is at capacity"""
+        self._start_workers()
+        self._purge_expired()
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "payload": payload,
+            "submitted_at": datetime.now().isoformat(),
+            "result": None,
+            "error": None
+        }
+
+        with self._lock:
+            try:
+                self._queue.put_nowait(job["id"])
+            except queue.Full:
+                self._stats["rejected"] += 1
+                raise QueueFullError(f"Job queue is full ({self.max_queue_size} jobs waiting)")
+            self._jobs[job["id"]] = job
+            self._stats["submitted"] += 1
+            return self._view(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job's status and, once finished, its result"""
+        self._purge_expired()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._view(job) if job else None
+
+    def get_stats(self) -> Dict:
+        """Get queue depth, concurrency and outcome counters"""
+        self._purge_expired()
+        with self._lock:
+            return {
+                **self._stats,
+                "queue_depth": self._queue.qsize(),
+                "running": self._running,
+                "tracked_jobs": len(self._jobs),
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size
+            }
+
+    def _start_workers(self):
+        with self._lock:
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, name=f"job-worker-{len(self._workers)}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                job["status"] = "running"
+                job["started_at"] = datetime.now().isoformat()
+                self._running += 1
+
+            try:
+                result, error, status = self.handler(job["payload"]), None, "completed"
+            except Exception as e:
+                result, error, status = None, str(e), "failed"
+
+            with self._lock:
+                job.update({
+                    "status": status,
+                    "result": result,
+                    "error": error,
+                    "finished_at": datetime.now().isoformat()
+                })
+                self._finished.append((time.time(), job_id))
+                self._running -= 1
+                self._stats[status] += 1
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            while self._finished and self._finished[0][0] < cutoff:
+                _, job_id = self._finished.popleft()
+                if self._jobs.pop(job_id, None) is not None:
+                    self._stats["expired"] += 1
+
+    @staticmethod
+    def _view(job: Dict) -> Dict:
+        return dict(job)
@@ -0,0 +1,45 @@
+from typing import Iterable, Iterator, Optional, Tuple
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, File, MultipartDecoder, NeedData
+
+def read_file_upload(chunks: Iterable[bytes], content_type: str,
+                     field_name: str = "file") -> Tuple[Optional[str], Optional[Iterator[bytes]]]:
+    """Find a file field in a streamed multipart/form-data body
+
+    Returns (filename, iterator over the file's bytes), or (None, None) when
+    the body has no such field. Only the current chunk is held in memory;
+    the file's bytes are produced as the body is read.
+    """
+    mimetype, options = parse_options_header(content_type or "")
+    if mimetype != "multipart/form-data" or not options.get("boundary"):
+        raise ValueError("Expected a multipart/form-data body")
+
+    events = _file_events(iter(chunks), options["boundary"].encode("latin-1"), field_name)
+    for kind, value in events:
+        if kind == "file":
+            return value, (data for _, data in events)
+    return None, None
+
+def _file_events(chunks: Iterator[bytes], boundary: bytes, field_name: str):
+    decoder = MultipartDecoder(boundary)
+    in_file = False
+    ended = False
+
+    while True:
+        event = decoder.next_event()
+        if isinstance(event, NeedData):
+            if ended:
+                raise ValueError("Truncated multipart body")
+            chunk = next(chunks, None)
+            ended = chunk is None
+            decoder.receive_data(chunk)
+        elif isinstance(event, File) and event.name == field_name:
+            in_file = True
+            yield "file", event.filename or ""
+        elif isinstance(event, Data) and in_file:
+            if event.data:
+                yield "data", event.data
+            if not event.more_data:
+                return
+        elif isinstance(event, Epilogue):
+            return
@@ -0,0 +1,24 @@
+import base64
+import hashlib
+import json
+from typing import Dict
+
+def query_fingerprint(query: str) -> str:
+    """Short, stable identifier of a query, so a cursor cannot be reused with another one"""
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+
+def encode_cursor(query: str, position: Dict) -> str:
+    """Opaque cursor pointing just after ``position`` in the results of ``query``"""
+    payload = {"q": query_fingerprint(query), **position}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(query: str, cursor: str) -> Dict:
+    """Position stored in a cursor; raises ValueError if it is malformed or from another query"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict) or payload.pop("q", None) != query_fingerprint(query):
+        raise ValueError("Cursor does not belong to this query")
+    return payload
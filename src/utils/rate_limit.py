@@ -0,0 +1,51 @@
+import threading
+import time
+from typing import Dict
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every caller of one upstream API
+
+    Tokens refill at ``rate`` per second and up to ``capacity`` may be saved
+    up for a burst. ``acquire`` reserves the next token and sleeps until it
+    is due, so concurrent callers are spaced out evenly at the rate instead of
+    bursting and then failing. ``pause`` holds everyone back, e.g. for a
+    429's Retry-After.
+
+    Internally this tracks when the next token is due (the "virtual
+    scheduling" form of a token bucket), which needs no refill bookkeeping.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._interval = 1.0 / rate
+        self._next_due = 0.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "waited_seconds": 0.0, "pauses": 0}
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available; returns the time waited"""
+        with self._lock:
+            now = time.monotonic()
+            due = max(self._next_due, now, self._paused_until)
+            allowed_at = max(due - (self.capacity - 1) * self._interval, self._paused_until)
+            self._next_due = due + self._interval
+
+            wait = max(0.0, allowed_at - now)
+            self._stats["acquired"] += 1
+            self._stats["waited_seconds"] += wait
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the next ``seconds``"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._stats["pauses"] += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "rate": self.rate, "capacity": self.capacity}
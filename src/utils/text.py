@@ -0,0 +1,57 @@
+import re
+from typing import Iterator, List, Tuple
+
+STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "been", "by", "can", "did", "do", "does",
+    "for", "from", "has", "have", "how", "i", "in", "is", "it", "its", "me", "my", "of", "on",
+    "or", "our", "still", "tell", "that", "the", "there", "this", "to", "was", "we", "what",
+    "when", "which", "who", "will", "with", "would", "you", "your"
+}
+
+# Phrasings that mean the same thing in policy questions, rewritten to one form.
+# "In effect" and "revoked" ask opposite questions, so they keep separate forms.
+SYNONYMS = [
+    (r"\bexec(?:utive|\.)?\s+orders?\b|\be\.\s?o\.", "eo"),
+    (r"\bu\.\s?s\.\s?c\.", "usc"),
+    (r"\bc\.\s?f\.\s?r\.", "cfr"),
+    (r"n['\u2019]t\b", " not"),
+    (r"\b(?:still\s+)?(?:in\s+(?:effect|force)|active)\b", "active"),
+    (r"\b(?:been\s+)?(?:repealed|revoked|rescinded|overturned|struck\s+down)\b", "revoked"),
+    (r"\bsmall\s+(?:businesses|companies|firms)\b", "small business"),
+    (r"\blarge\s+(?:businesses|companies|firms|enterprises)\b", "large business"),
+]
+
+# Words that flip the meaning of a question; cached answers must agree on them exactly
+POLARITY_WORDS = {"not", "no", "never", "nothing", "none", "neither", "nor", "without", "active", "revoked"}
+
+_SYNONYM_PATTERNS = [(re.compile(pattern), replacement) for pattern, replacement in SYNONYMS]
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+_TOKEN_SPAN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*", re.IGNORECASE)
+
+def normalize_text(text: str) -> str:
+    """Lowercase text and collapse common policy phrasings to one form"""
+    text = text.lower()
+    for pattern, replacement in _SYNONYM_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return " ".join(_TOKEN_PATTERN.findall(text))
+
+def tokenize(text: str, drop_stopwords: bool = True) -> List[str]:
+    """Split text into lowercase word tokens"""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if drop_stopwords:
+        tokens = [token for token in tokens if token not in STOPWORDS]
+    return tokens
+
+def iter_tokens(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Yield (token, start, end) for each word in text, with offsets into the original text"""
+    for match in _TOKEN_SPAN_PATTERN.finditer(text):
+        yield match.group().lower(), match.start(), match.end()
+
+def token_end(text: str, start: int) -> int:
+    """End offset of the word that starts at ``start``"""
+    match = _TOKEN_SPAN_PATTERN.match(text, start)
+    return match.end() if match else start
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)"""
+    return max(1, (len(text) + 3) // 4)
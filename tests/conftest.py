@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared stand-ins for the policy resolution tests
+"""
+
+import pytest
+
+class RecordingAPI:
+    """Federal Register / CourtListener stand-in that records the policy names searched upstream"""
+
+    def __init__(self):
+        self.queries = []
+
+    def check_policy_status(self, policy_id):
+        self.queries.append(policy_id)
+        return {"status": "active"}
+
+    def get_case_law_for_policy(self, policy_id):
+        self.queries.append(policy_id)
+        return []
+
+@pytest.fixture
+def recording_apis():
+    """Attach fresh RecordingAPI stand-ins to a PolicyStatusChecker; returns the checker"""
+    def attach(checker):
+        checker.federal_api, checker.court_api = RecordingAPI(), RecordingAPI()
+        return checker
+    return attach
+
+@pytest.fixture
+def api_client(monkeypatch):
+    """Flask test client for an agent serving the given vector store"""
+    def make(store):
+        import api_server
+        from src.agents.policy_agent import PolicyNavigatorAgent
+
+        agent = PolicyNavigatorAgent(load_data=False)
+        agent.vector_store = store
+        monkeypatch.setattr(api_server, "agent", agent)
+        return agent, api_server.app.test_client()
+    return make
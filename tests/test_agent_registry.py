@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test reuse of the aiXplain agent definition across processes
+"""
+
+from src.agents.agent_registry import AgentRegistry
+from src.agents.local_agent import LocalAgentFactory
+from src.agents.policy_agent import PolicyNavigatorAgent
+
+def make_agent(factory, registry_path):
+    """Simulate a fresh process sharing the remote platform and registry file"""
+    agent = PolicyNavigatorAgent(load_data=False, agent_factory=factory)
+    agent.agent_registry = AgentRegistry(registry_path)
+    agent.answer_cache = None
+    return agent
+
+def test_agent_reused_when_definition_unchanged(tmp_path):
+    """A restart fetches the stored agent instead of creating a new one"""
+    factory = LocalAgentFactory()
+    path = str(tmp_path / "agent_registry.json")
+
+    first = make_agent(factory, path).create_agent()
+    second = make_agent(factory, path).create_agent()
+
+    assert second is first
+    assert factory.calls["create"] == 1 and factory.calls["get"] == 1
+
+    response = make_agent(factory, path).query("Is EO 14067 still in effect?")
+    assert response["output"] == "Local answer for: Is EO 14067 still in effect?"
+    assert factory.calls["create"] == 1
+
+def test_local_factory_needs_no_sdk(tmp_path, monkeypatch):
+    """Creating an agent through a stand-in factory never imports the aiXplain SDK"""
+    import sys
+
+    for name in [name for name in sys.modules if name == "aixplain" or name.startswith("aixplain.")]:
+        monkeypatch.delitem(sys.modules, name)
+    monkeypatch.setitem(sys.modules, "aixplain", None)
+
+    factory = LocalAgentFactory()
+    agent = make_agent(factory, str(tmp_path / "agent_registry.json")).create_agent()
+    assert [task["name"] for task in agent.definition["tasks"]][:2] == ["policy_search", "status_check"]
+
+def test_agent_recreated_when_definition_changes(tmp_path):
+    """A changed definition creates a new agent and deletes the outdated one"""
+    factory = LocalAgentFactory()
+    path = str(tmp_path / "agent_registry.json")
+
+    first = make_agent(factory, path).create_agent()
+
+    agent = make_agent(factory, path)
+    definition = agent.agent_definition()
+    agent.agent_definition = lambda: {**definition, "llm_id": "another-llm"}
+    second = agent.create_agent()
+
+    assert second.id != first.id
+    assert first.id not in factory.agents
+    assert AgentRegistry(path).get(definition["name"])["agent_id"] == second.id
+
+def test_missing_remote_agent_is_recreated(tmp_path):
+    """A stored ID that no longer exists remotely falls back to creation"""
+    path = str(tmp_path / "agent_registry.json")
+    make_agent(LocalAgentFactory(), path).create_agent()
+
+    factory = LocalAgentFactory()
+    agent = make_agent(factory, path).create_agent()
+    assert agent.id in factory.agents
+    assert factory.calls["create"] == 1
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test concurrent fan-out of policy updates to external tools
+"""
+
+import threading
+import time
+import pytest
+from src.tools.external_integrations import ExternalToolManager
+from src.utils.job_queue import QueueFullError
+
+ALERT = {"title": "EO 14067 amended", "status": "amended", "deadline": "2025-12-31"}
+
+def make_tools(timeouts=None, **options):
+    tools = ExternalToolManager({"external_tools": {"timeouts": timeouts or {}, **options}})
+    tools.slack.webhook_url = None
+    return tools
+
+def slow(seconds, result=None, error=None):
+    def call(*args):
+        time.sleep(seconds)
+        if error:
+            raise error
+        return result or {"success": True}
+    return call
+
+def test_integrations_run_concurrently(monkeypatch):
+    tools = make_tools()
+    monkeypatch.setattr(tools, "_send_slack", slow(0.3, True))
+    monkeypatch.setattr(tools.notion, "create_policy_page", slow(0.3))
+    monkeypatch.setattr(tools.calendar, "schedule_compliance_reminder", slow(0.3))
+
+    start = time.perf_counter()
+    results = tools.handle_policy_update(ALERT)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6  # the slowest integration, not the sum of all three
+    assert results["slack"] is True and results["notion"]["success"] and results["calendar"]["success"]
+    assert set(results["latency_ms"]) == {"slack", "notion", "calendar"}
+    assert all(250 <= latency < 600 for latency in results["latency_ms"].values())
+
+def test_failures_and_timeouts_are_isolated(monkeypatch):
+    tools = make_tools(timeouts={"slack": 0.2})
+    monkeypatch.setattr(tools, "_send_slack", slow(1.0, True))
+    monkeypatch.setattr(tools.notion, "create_policy_page", slow(0, error=RuntimeError("Notion is down")))
+
+    start = time.perf_counter()
+    results = tools.handle_policy_update(ALERT)
+    assert time.perf_counter() - start < 0.5
+
+    assert results["slack"] == {"success": False, "error": "timed out after 0.2s"}
+    assert results["notion"] == {"success": False, "error": "Notion is down"}
+    assert results["calendar"]["success"] is True
+    assert results["latency_ms"]["slack"] == 200.0
+    assert tools.get_stats()["timeouts"] == 1 and tools.get_stats()["failures"] == 1
+
+def test_timed_out_calls_that_never_started_are_cancelled(monkeypatch):
+    tools = make_tools(timeouts={"slack": 0.2, "notion": 0.2, "calendar": 0.2}, max_workers=1)
+    release = threading.Event()
+    calls = []
+    def slack(*args):
+        calls.append("slack")
+        release.wait(2)
+        return True
+    def record(name):
+        def call(*args):
+            calls.append(name)
+            return {"success": True}
+        return call
+    monkeypatch.setattr(tools, "_send_slack", slack)
+    monkeypatch.setattr(tools.notion, "create_policy_page", record("notion"))
+    monkeypatch.setattr(tools.calendar, "schedule_compliance_reminder", record("calendar"))
+
+    results = tools.handle_policy_update(ALERT)
+    release.set()
+    tools.close()
+
+    # Notion and Calendar timed out waiting for the only worker and must not run late
+    assert calls == ["slack"]
+    assert results["notion"]["success"] is False and results["calendar"]["success"] is False
+    assert tools.get_stats()["cancelled"] == 2
+
+def test_dispatch_queue_is_bounded(monkeypatch):
+    tools = make_tools(dispatch_workers=1, max_dispatch_queue=2)
+    release = threading.Event()
+    monkeypatch.setattr(tools, "handle_policy_update", lambda policy_info: release.wait(2))
+
+    tools.dispatch_policy_update(ALERT)
+    tools.dispatch_policy_update(ALERT)
+    with pytest.raises(QueueFullError):
+        tools.dispatch_policy_update(ALERT)
+    assert tools.get_stats()["rejected"] == 1 and tools.get_stats()["pending_dispatches"] == 2
+
+    release.set()
+    deadline = time.time() + 2
+    while tools.get_stats()["pending_dispatches"] and time.time() < deadline:
+        time.sleep(0.01)
+    tools.dispatch_policy_update(ALERT)
+    tools.close()
+
+def test_close_drops_pending_dispatches(monkeypatch):
+    tools = make_tools(dispatch_workers=1)
+    started, release = threading.Event(), threading.Event()
+    def handle(policy_info):
+        started.set()
+        return release.wait(2)
+    monkeypatch.setattr(tools, "handle_policy_update", handle)
+
+    running = tools.dispatch_policy_update(ALERT)
+    assert started.wait(2)
+    queued = tools.dispatch_policy_update(ALERT)
+    tools.close(wait=False)
+    release.set()
+
+    assert running.result(2) is True and queued.cancelled()
+    assert tools.get_stats()["pending_dispatches"] == 0
+    with pytest.raises(RuntimeError):
+        tools.dispatch_policy_update(ALERT)
+
+def test_send_alert_endpoint_can_fire_and_forget(monkeypatch):
+    import api_server
+    from src.agents.policy_agent import PolicyNavigatorAgent
+
+    agent = PolicyNavigatorAgent(load_data=False)
+    monkeypatch.setattr(api_server, "agent", agent)
+    tools = make_tools()
+    agent._components["external_tools"] = tools
+
+    delivered = threading.Event()
+    def notion(policy_info):
+        time.sleep(0.3)
+        delivered.set()
+        return {"success": True}
+    monkeypatch.setattr(tools.notion, "create_policy_page", notion)
+
+    client = api_server.app.test_client()
+    start = time.perf_counter()
+    response = client.post("/api/send-alert", json={"policy_info": ALERT, "background": True})
+    assert time.perf_counter() - start < 0.2
+    assert response.status_code == 202
+    assert response.get_json() == {"status": "dispatched"}
+
+    assert delivered.wait(2)
+    deadline = time.time() + 2
+    while tools.get_stats()["completed"] < 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert tools.get_stats()["dispatched"] == 1 and tools.get_stats()["completed"] == 1
+
+    response = client.post("/api/send-alert", json={"policy_info": ALERT})
+    assert response.status_code == 200
+    assert set(response.get_json()["latency_ms"]) == {"slack", "notion", "calendar"}
+
+    tools.max_dispatch_queue = 0
+    response = client.post("/api/send-alert", json={"policy_info": ALERT, "background": True})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
+    agent.close()
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the semantic answer cache in front of PolicyNavigatorAgent.query
+"""
+
+import time
+from src.agents.answer_cache import SemanticAnswerCache
+
+ANSWER = {"output": "Executive Order 14067 is still active."}
+
+def test_reworded_question_hits():
+    """A paraphrase of a cached question returns the stored answer"""
+    cache = SemanticAnswerCache()
+    cache.put("Is EO 14067 still in effect?", ANSWER)
+
+    cached = cache.get("Would executive order 14067 still be in force?")
+    assert cached["output"] == ANSWER["output"]
+    assert cached["cache"]["hit"] is True
+
+    assert cache.get("Is EO 14068 still in effect?") is None
+    assert cache.get("What are GDPR requirements for small businesses?") is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["semantic_hits"] == 1 and stats["misses"] == 2
+    assert stats["hit_rate"] == round(1 / 3, 3)
+
+def test_polarity_must_match():
+    """Negated or opposite questions never share an answer or a single-flight key"""
+    from src.utils.text import normalize_text
+
+    cache = SemanticAnswerCache()
+    cache.put("Is EO 14067 still in effect?", ANSWER)
+
+    assert cache.get("Has executive order 14067 been repealed?") is None
+    assert cache.get("Is EO 14067 not in effect?") is None
+    assert cache.get("Isn't EO 14067 in effect?") is None
+    assert normalize_text("Is EO 14067 in effect?") != normalize_text("Is EO 14067 revoked?")
+    assert normalize_text("Is EO 14067 in effect?") != normalize_text("Is EO 14067 not in effect?")
+
+def test_ttl_and_lru_bound():
+    """Entries expire after their TTL and the oldest are evicted first"""
+    cache = SemanticAnswerCache(ttl_seconds=0.05, max_entries=2)
+    cache.put("Is EO 14067 still in effect?", ANSWER)
+    time.sleep(0.1)
+    assert cache.get("Is EO 14067 still in effect?") is None
+
+    cache = SemanticAnswerCache(max_entries=2)
+    for number in (1, 2, 3):
+        cache.put(f"What does section {number} require?", {"output": str(number)})
+    assert cache.get("What does section 1 require?") is None
+    assert cache.get("What does section 3 require?")["output"] == "3"
+    assert cache.get_stats()["evictions"] == 1
+
+def test_persistent_tier(tmp_path):
+    """Answers survive a restart through the SQLite tier"""
+    path = str(tmp_path / "answer_cache.db")
+    SemanticAnswerCache(persist_path=path).put("Is EO 14067 still in effect?", ANSWER)
+
+    cache = SemanticAnswerCache(persist_path=path, max_entries=1)
+    assert cache.get("is eo 14067 still in effect")["output"] == ANSWER["output"]
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    test_reworded_question_hits()
+    test_polarity_must_match()
+    test_ttl_and_lru_bound()
+    test_persistent_tier(pathlib.Path(tempfile.mkdtemp()))
+    print("✅ Answer cache tests passed")
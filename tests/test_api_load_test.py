@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the API load-test harness: upstream stand-ins, config rewriting and per-endpoint reports
+"""
+
+import importlib.util
+import os
+import pytest
+import requests
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location("api_load_test", os.path.join(ROOT, "benchmarks", "api_load_test.py"))
+api_load_test = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(api_load_test)
+
+def profiles(**overrides):
+    result = {name: dict(profile, latency=0.0, jitter=0.0) for name, profile in api_load_test.UPSTREAMS.items()}
+    for name, profile in overrides.items():
+        result[name].update(profile)
+    return result
+
+def test_stand_ins_are_seeded_and_fail_at_the_configured_rate():
+    draws = [api_load_test.StandIns(profiles(court_listener={"error_rate": 0.3}), seed=3) for _ in range(2)]
+    first, second = ([standins.draw("court_listener") for _ in range(200)] for standins in draws)
+    assert first == second
+    assert 30 < sum(1 for _, status in first if status == 503) < 90
+    assert draws[0].counts["court_listener"]["requests"] == 200
+
+def test_stand_ins_serve_every_upstream():
+    standins = api_load_test.StandIns(profiles(federal_register={"error_rate": 1.0}))
+    port = api_load_test.start_standins(standins)
+    base = f"http://127.0.0.1:{port}"
+
+    assert requests.get(f"{base}/federal/documents.json").status_code == 503
+    assert requests.get(f"{base}/courts/search/", params={"q": "Section 230"}).json()["results"]
+    answer = api_load_test.StandInAgent(f"{base}/aixplain/run").run("Is EO 14067 in effect?")
+    assert answer["data"]["output"].startswith("Stand-in answer")
+    assert standins.counts["aixplain"] == {"requests": 1, "errors": 0}
+    assert "<title>EPA Laws and Regulations</title>" in requests.get(f"{base}/sites/epa-regulations").text
+    assert requests.get(f"{base}/sites/unknown").status_code == 404
+
+def test_config_points_clients_at_the_stand_ins():
+    with open(api_load_test.write_config(8123)) as f:
+        config = yaml.safe_load(f)
+    assert config["data_sources"]["federal_register"]["base_url"] == "http://127.0.0.1:8123/federal"
+    assert config["data_sources"]["court_listener"]["base_url"] == "http://127.0.0.1:8123/courts"
+    assert config["data_sources"]["government_websites"] == [
+        f"http://127.0.0.1:8123/sites/{page}" for page in api_load_test.SITES]
+    assert not config["answer_cache"]["enabled"]
+    assert not config["policy_watch"]["path"].startswith("data/")
+
+def test_options_parse_and_reject_unknown_names():
+    assert api_load_test.parse_upstream("aixplain=latency:2,error_rate:0.1,error_status:502") == (
+        "aixplain", {"latency": 2.0, "error_rate": 0.1, "error_status": 502})
+    assert api_load_test.parse_mix("status=3,query") == {"status": 3.0, "query": 1.0}
+    for bad in (lambda: api_load_test.parse_upstream("epa=latency:1"),
+                lambda: api_load_test.parse_upstream("aixplain=speed:1"),
+                lambda: api_load_test.parse_mix("upload=1")):
+        with pytest.raises(ValueError):
+            bad()
+
+def test_summary_reports_percentiles_throughput_and_errors_per_endpoint():
+    samples = [("status", n / 1000, n % 10 != 0) for n in range(1, 101)] + [("query", 2.0, False)]
+    report = api_load_test.summarize(samples, wall=10.0)
+
+    status = report["endpoints"]["status"]
+    assert (status["p50_ms"], status["p95_ms"], status["p99_ms"]) == (50.0, 95.0, 99.0)
+    assert status["errors"] == 10 and status["error_rate"] == 0.1 and status["throughput_rps"] == 10.0
+    assert report["endpoints"]["query"]["error_rate"] == 1.0
+    assert report["overall"]["requests"] == 101
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test the async (ASGI) serving mode against in-process stand-in upstreams
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+import uvicorn
+from src.agents.local_agent import LocalAgentFactory
+from src.agents.policy_agent import PolicyNavigatorAgent
+from src.tools.async_clients import AsyncPolicyStatusChecker, create_http_client
+from starlette.applications import Starlette
+from starlette.routing import Route
+from src.utils.asgi import jsonify
+
+UPSTREAM_DELAY = 0.3
+
+def start_upstream():
+    """Serve Federal Register and CourtListener stand-ins that answer after a delay"""
+    calls = []
+
+    async def documents(request):
+        term = request.query_params['conditions[term]']
+        calls.append(term)
+        await asyncio.sleep(UPSTREAM_DELAY)
+        return jsonify({'results': [{
+            'title': f"Notice on {term}",
+            'publication_date': '2024-01-15',
+            'html_url': 'https://example.gov/doc'
+        }]})
+
+    async def opinions(request):
+        await asyncio.sleep(UPSTREAM_DELAY)
+        return jsonify({'results': []})
+
+    upstream = Starlette(routes=[Route('/federal/documents.json', documents), Route('/courts/search/', opinions)])
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(upstream, port=port, log_level='warning', backlog=2048))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f'http://127.0.0.1:{port}', calls
+
+async def use_upstream(monkeypatch, server, upstream_url):
+    """Point the server's status checker at the stand-in (call inside the test's event loop)"""
+    client = create_http_client()
+    checker = AsyncPolicyStatusChecker(client)
+    checker.federal_api.base_url = f'{upstream_url}/federal'
+    checker.court_api.base_url = f'{upstream_url}/courts'
+    monkeypatch.setattr(server, 'http_client', client)
+    monkeypatch.setattr(server, 'status_checker', checker)
+    return client
+
+async def call(app, method, path, body=None, chunks=None, content_type='application/json'):
+    """Send one request straight to an ASGI app; returns (status, headers, body)
+
+    A raw body can be given as ``chunks``, delivered as separate messages.
+    """
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': True} for chunk in chunks or []]
+    payload = json.dumps(body).encode() if body is not None else b''
+    messages.append({'type': 'http.request', 'body': payload})
+    headers = [(b'content-type', content_type.encode()), (b'origin', b'http://localhost:3000')]
+    if method == 'OPTIONS':
+        headers.append((b'access-control-request-method', b'POST'))
+    scope = {'type': 'http', 'http_version': '1.1', 'method': method, 'path': path, 'query_string': b'',
+             'headers': headers}
+    sent = []
+
+    async def receive():
+        # Once the body is used up the client stays connected until the response is sent
+        if not messages:
+            await asyncio.Event().wait()
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    headers = dict(sent[0]['headers'])
+    content = b''.join(message.get('body', b'') for message in sent[1:])
+    is_json = headers.get(b'content-type', b'').startswith(b'application/json')
+    return sent[0]['status'], headers, json.loads(content) if content and is_json else content
+
+def test_concurrent_status_checks_do_not_block(monkeypatch):
+    """Hundreds of slow upstream calls overlap instead of queuing on threads"""
+    import asgi_server
+
+    upstream_url, calls = start_upstream()
+
+    async def run():
+        client = await use_upstream(monkeypatch, asgi_server, upstream_url)
+        requests = [call(asgi_server.app, 'POST', '/api/status', {'policy_id': f'EO {n}'}) for n in range(300)]
+        try:
+            return await asyncio.gather(*requests)
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    responses = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert all(status == 200 for status, _, _ in responses)
+    assert responses[7][2]['policy_id'] == 'EO 7'
+    assert responses[7][2]['federal_status']['status'] == 'active'
+    assert len(calls) == 300
+    # Serially this would take 300 * 0.3s; both sources are also queried concurrently
+    assert elapsed < 10 * UPSTREAM_DELAY
+
+def test_identical_status_checks_coalesce(monkeypatch):
+    """Concurrent checks for the same policy share one upstream round trip"""
+    import asgi_server
+
+    upstream_url, calls = start_upstream()
+
+    async def run():
+        client = await use_upstream(monkeypatch, asgi_server, upstream_url)
+        requests = [call(asgi_server.app, 'POST', '/api/status', {'policy_id': 'EO 14067'}) for _ in range(20)]
+        try:
+            return await asyncio.gather(*requests)
+        finally:
+            await client.close()
+
+    responses = asyncio.run(run())
+    assert all(body == responses[0][2] for _, _, body in responses)
+    assert calls == ['EO 14067']
+
+def test_query_and_routing(monkeypatch):
+    """Agent queries run through the async path; routing matches the Flask server"""
+    import asgi_server
+
+    factory = LocalAgentFactory(responder=lambda prompt: 'Still in effect.', steps=[{'tool': 'search'}])
+    agent = PolicyNavigatorAgent(load_data=False, agent_factory=factory)
+    agent.config = {**agent.config, 'streaming': {'poll_interval': 0, 'answer_chunk_chars': 80}}
+    agent.answer_cache = None
+    monkeypatch.setattr(asgi_server, 'agent', agent)
+
+    async def run():
+        return (
+            await call(asgi_server.app, 'POST', '/api/query', {'query': 'Is EO 14067 in effect?'}),
+            await call(asgi_server.app, 'POST', '/api/query', {}),
+            await call(asgi_server.app, 'GET', '/api/health'),
+            await call(asgi_server.app, 'GET', '/api/missing'),
+            await call(asgi_server.app, 'GET', '/api/query'),
+            await call(asgi_server.app, 'OPTIONS', '/api/query')
+        )
+
+    answer, missing_query, health, not_found, wrong_method, preflight = asyncio.run(run())
+
+    assert answer[2]['output'] == 'Still in effect.'
+    assert factory.calls['run_async'] == 1 and factory.calls['run'] == 0
+    assert missing_query[0] == 400
+    assert health[2]['live'] is True
+    assert not_found[0] == 404
+    assert wrong_method[0] == 405
+    assert preflight[0] == 200 and preflight[1][b'access-control-allow-methods']
+    assert answer[1][b'access-control-allow-origin'] == b'*'
+
+def test_queued_job_joins_identical_query_in_flight(monkeypatch):
+    """A job and an /api/query for the same question share one agent run"""
+    import asgi_server
+
+    factory = LocalAgentFactory(responder=lambda prompt: 'Still in effect.', steps=[{'tool': 'search'}] * 3)
+    agent = PolicyNavigatorAgent(load_data=False, agent_factory=factory)
+    agent.config = {**agent.config, 'streaming': {'poll_interval': 0.1, 'answer_chunk_chars': 80}}
+    agent.answer_cache = None
+    monkeypatch.setattr(asgi_server, 'agent', agent)
+
+    async def run():
+        query = asyncio.ensure_future(call(asgi_server.app, 'POST', '/api/query', {'query': 'Is EO 14067 in effect?'}))
+        await asyncio.sleep(0.05)
+        submitted = await call(asgi_server.app, 'POST', '/api/jobs', {'query': 'is EO 14067 in effect'})
+        answer = await query
+        for _ in range(50):
+            job = await call(asgi_server.app, 'GET', submitted[2]['poll_url'])
+            if job[2]['status'] == 'completed':
+                break
+            await asyncio.sleep(0.05)
+        return answer, job
+
+    answer, job = asyncio.run(run())
+    assert answer[2]['output'] == job[2]['result']['output'] == 'Still in effect.'
+    assert factory.calls['run_async'] + factory.calls['run'] == 1
+
+def test_upload_streams_body_into_extraction(monkeypatch):
+    """Multipart uploads arrive in pieces and are indexed without buffering the request"""
+    import asgi_server
+
+    agent = PolicyNavigatorAgent(load_data=False)
+    monkeypatch.setattr(asgi_server, 'agent', agent)
+
+    text = 'Section 4 requires quarterly emissions reporting. ' * 200
+    body = (b'--xyz\r\nContent-Disposition: form-data; name="file"; filename="epa.txt"\r\n'
+            b'Content-Type: text/plain\r\n\r\n' + text.encode() + b'\r\n--xyz--\r\n')
+    chunks = [body[i:i + 512] for i in range(0, len(body), 512)]
+
+    status, _, result = asyncio.run(call(asgi_server.app, 'POST', '/api/upload', chunks=chunks,
+                                         content_type='multipart/form-data; boundary=xyz'))
+
+    assert status == 200 and result['status'] == 'uploaded'
+    assert agent.vector_store.documents[0]['content'] == text
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test parallel, resumable bulk ingestion of document directories
+"""
+
+import json
+import os
+import pytest
+from click.testing import CliRunner
+from src.data_processing.bulk_ingest import BulkIngestor
+from src.data_processing.dataset_loader import DatasetLoader
+from src.data_processing.document_store import DocumentStore
+from src.data_processing.vector_store import VectorStoreManager
+from src.interfaces.cli import cli
+
+def make_tree(root, count=30):
+    for n in range(count):
+        folder = root / f"agency_{n % 3}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"rule_{n:03d}.txt").write_text(f"Rule {n} sets reporting deadlines for agency {n % 3}.")
+    (root / "agency_0" / "notes.csv").write_text("ignored,file")
+    (root / "agency_1" / "broken.pdf").write_bytes(b"not really a pdf")
+
+def test_interrupted_run_resumes_without_duplicates(tmp_path):
+    make_tree(tmp_path / "docs")
+    store = DocumentStore(str(tmp_path / "documents.jsonl"))
+    ingestor = BulkIngestor(store, manifest_path=str(tmp_path / "manifest.jsonl"), workers=2, batch_size=5)
+
+    pending, skipped = ingestor.plan(str(tmp_path / "docs"))
+    assert len(pending) == 31 and skipped == 0
+
+    finished = []
+    def interrupt_after_twelve(files, size):
+        finished.append(files)
+        if len(finished) == 12:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        ingestor.run(pending, progress=interrupt_after_twelve)
+
+    # Everything finished before the interruption was checkpointed
+    pending, skipped = ingestor.plan(str(tmp_path / "docs"))
+    assert skipped == 12 and len(pending) == 19
+
+    stats = ingestor.run(pending)
+    assert stats["failed"] + stats["indexed"] == 19
+    assert stats["docs_per_second"] > 0 and stats["mb_per_second"] > 0
+
+    documents = list(store.iter_documents())
+    assert len(documents) == 30
+    assert len({document["metadata"]["file_path"] for document in documents}) == 30
+
+    failures = [json.loads(line) for line in open(ingestor.manifest_path) if '"failed"' in line]
+    assert [os.path.basename(entry["path"]) for entry in failures] == ["broken.pdf"]
+    assert ingestor.plan(str(tmp_path / "docs")) == ([], 31)
+
+    # Failed files are parsed again on request, until one succeeds
+    pending, skipped = ingestor.plan(str(tmp_path / "docs"), retry_failed=True)
+    assert [os.path.basename(path) for path, _, _ in pending] == ["broken.pdf"] and skipped == 30
+    assert ingestor.run(pending)["failed"] == 1
+    assert ingestor.plan(str(tmp_path / "docs"), retry_failed=True)[0] == pending
+
+def test_changed_files_are_reingested(tmp_path):
+    make_tree(tmp_path / "docs", count=3)
+    store = DocumentStore(str(tmp_path / "documents.jsonl"))
+    ingestor = BulkIngestor(store, manifest_path=str(tmp_path / "manifest.jsonl"), workers=1)
+    ingestor.run(ingestor.plan(str(tmp_path / "docs"))[0])
+
+    changed = tmp_path / "docs" / "agency_1" / "rule_001.txt"
+    changed.write_text("Rule 1 was amended in 2024 to require quarterly reporting.")
+    pending, _ = ingestor.plan(str(tmp_path / "docs"))
+    assert [path for path, _, _ in pending] == [str(changed)]
+    ingestor.run(pending)
+
+    # The store keeps the latest copy, and the agent's vector store bulk-loads it
+    vector_store = VectorStoreManager()
+    result = DatasetLoader(vector_store).load_ingested_documents(store.path)
+    assert result["documents_indexed"] == 3
+    assert "amended" in vector_store.search_documents("quarterly reporting")[0]["content"]
+
+def test_ingest_command(tmp_path):
+    make_tree(tmp_path / "docs", count=6)
+    args = ["ingest", str(tmp_path / "docs"), "--workers", "2",
+            "--store", str(tmp_path / "documents.jsonl"), "--manifest", str(tmp_path / "manifest.jsonl")]
+
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    assert "Ingested 6 documents" in result.output
+    assert "docs/s" in result.output and "MB/s" in result.output
+
+    result = CliRunner().invoke(cli, args)
+    assert "7 already ingested, 0 to go" in result.output
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test citation edge extraction, the CSR citation graph and graph-backed policy status
+"""
+
+import pytest
+from src.data_processing.citation_graph import CitationGraph, extract_edges
+from src.data_processing.vector_store import VectorStoreManager
+from src.tools.custom_tools import PolicyStatusChecker
+
+@pytest.mark.parametrize("text, edges", [
+    ("The following executive orders are hereby revoked: Executive Order 14067 of March 9, 2022.",
+     [("eo:14148", "revokes", "eo:14067")]),
+    ("Section 2 amends 40 CFR part 60 to add reporting duties.", [("eo:14148", "amends", "cfr:40:60")]),
+    ("Agencies shall follow 42 U.S.C. 7401 when reviewing permits.", [("eo:14148", "cites", "usc:42:7401")]),
+    ("E.O. 13990 was revoked by Executive Order 14154.", [("eo:14154", "revokes", "eo:13990")]),
+    ("This order is superseded by EO 14200.", [("eo:14200", "revokes", "eo:14148")]),
+    ("It does not mention any other policy.", []),
+    ("Nothing in this order revokes or amends Executive Order 13990.", []),
+    ("EO 14067 is not revoked by EO 14200.", []),
+    ("Executive Order No. 14067 is hereby revoked.", [("eo:14148", "revokes", "eo:14067")]),
+    ("This order shall not be construed to modify 42 U.S.C. 7401.", []),
+])
+def test_edges_follow_the_relation_verb(text, edges):
+    assert extract_edges("eo:14148", text) == edges
+
+def test_traversal_is_multi_hop_and_directional():
+    graph = CitationGraph()
+    graph.add("doc_0", [("eo:2", "revokes", "eo:1"), ("eo:2", "cites", "usc:42:7401")])
+    graph.add("doc_1", [("eo:3", "revokes", "eo:2")])
+    graph.add("doc_2", [("eo:4", "amends", "eo:3")])
+
+    assert [edge["key"] for edge in graph.traverse("eo:1", "in", ["revokes"], max_hops=1)] == ["eo:2"]
+    chain = graph.traverse("eo:1", "in", ["revokes", "amends"], max_hops=5)
+    assert [(edge["key"], edge["hops"], edge["via"]) for edge in chain] == [
+        ("eo:2", 1, "eo:1"), ("eo:3", 2, "eo:2"), ("eo:4", 3, "eo:3")]
+    assert [edge["key"] for edge in graph.traverse("eo:2", "out")] == ["eo:1", "usc:42:7401"]
+    assert [edge["key"] for edge in graph.traverse("usc:42:7401", "in", max_hops=3)] == ["eo:2", "eo:3", "eo:4"]
+
+    assert graph.status("eo:1")["superseded_by"] == ["eo:2", "eo:3"]
+    assert graph.status("eo:3")["status"] == "amended"
+    assert graph.status("eo:4")["status"] == "active"
+    assert graph.status("eo:99") is None
+
+    # Re-indexing a document replaces exactly its edges
+    graph.remove("doc_1")
+    assert graph.status("eo:2")["status"] == "active"
+    assert graph.get_stats() == {"nodes": 5, "edges": 3, "documents": 2}
+
+def make_store():
+    store = VectorStoreManager()
+    store.add_document("Executive Order 14067 establishes policy on digital assets under 31 U.S.C. 5312.",
+                       {"title": "Ensuring Responsible Development of Digital Assets", "policy_id": "EO-14067"})
+    store.add_document("Executive Order 14067 of March 9, 2022 is hereby revoked. Section 3 amends 40 CFR part 60.",
+                       {"title": "Executive Order 14178 - Strengthening Leadership in Digital Financial Technology"})
+    store.add_document("Agencies implementing E.O. 14067 should coordinate with Treasury.", {"title": "Agency guidance"})
+    return store
+
+def test_store_builds_the_graph_at_ingest():
+    store = make_store()
+    citing = store.related_policies("EO-14067")
+    assert [(edge["name"], edge["relation"]) for edge in citing["related"]] == [
+        ("Executive Order 14178", "revokes"), ("Agency guidance", "cites")]
+    assert [edge["key"] for edge in store.related_policies("EO 14178", "out")["related"]] == ["eo:14067", "cfr:40:60"]
+    assert store.related_policies("maritime salvage") is None
+    with pytest.raises(ValueError):
+        store.related_policies("EO 14067", relations=["overrules"])
+
+    store.replace_document("doc_1", "Executive Order 14067 remains in effect.")
+    assert store.resolve_policy("EO 14067")["graph_status"]["status"] == "active"
+
+def test_status_comes_from_the_graph_without_a_remote_search(recording_apis):
+    store = make_store()
+    checker = recording_apis(PolicyStatusChecker(resolver=store.resolve_policy))
+
+    revoked = checker.check_policy_status("E.O. 14067")
+    assert revoked["federal_status"]["status"] == "revoked"
+    assert revoked["federal_status"]["revoked_by"] == [{"key": "eo:14178", "doc_id": "doc_1"}]
+    assert checker.federal_api.queries == []
+
+    amended = checker.check_policy_status("40 CFR 60")
+    assert amended["federal_status"]["status"] == "amended"
+    assert checker.check_policy_status("EO 14178")["federal_status"] == {"status": "active"}
+    assert checker.federal_api.queries == ["Executive Order 14178"]
+
+def test_related_endpoint(api_client, monkeypatch):
+    agent, client = api_client(make_store())
+
+    response = client.post("/api/related", json={"policy_id": "EO 14067", "relations": ["revokes"], "max_hops": 3})
+    assert response.status_code == 200
+    assert [edge["key"] for edge in response.get_json()["related"]] == ["eo:14178"]
+    assert client.post("/api/related", json={"policy_id": "EO 14067", "direction": "sideways"}).status_code == 400
+    assert client.post("/api/related", json={"policy_id": "maritime salvage"}).status_code == 404
+    assert client.post("/api/related", json={}).status_code == 400
+
+    def broken(*args):
+        raise RuntimeError("citation graph unavailable")
+    monkeypatch.setattr(agent, "related_policies", broken)
+    response = client.post("/api/related", json={"policy_id": "EO 14067"})
+    assert response.status_code == 500 and response.get_json() == {"error": "citation graph unavailable"}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark guarding CLI cold start
+
+Runs the CLI under ``python -X importtime`` and checks that heavy
+dependencies are only imported by commands that need them.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("aixplain", "pandas", "bs4", "requests")
+IMPORT_BUDGET_MS = float(os.getenv("CLI_IMPORT_BUDGET_MS", "500"))
+
+def run_with_importtime(*args):
+    """Run Python with -X importtime and return (result, {module: cumulative_us})"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, cwd=ROOT
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative)
+    return result, timings
+
+def heavy_imports(timings):
+    return sorted({name.split(".")[0] for name in timings if name.split(".")[0] in HEAVY_MODULES})
+
+def test_help_skips_heavy_imports():
+    """--help does not import aixplain, pandas, bs4 or requests"""
+    result, timings = run_with_importtime("-m", "src.interfaces.cli", "--help")
+    assert result.returncode == 0
+    assert "compliance" in result.stdout
+    assert heavy_imports(timings) == []
+
+def test_local_command_skips_heavy_imports():
+    """The local compliance command runs without the heavy dependencies"""
+    result, timings = run_with_importtime("-m", "src.interfaces.cli", "compliance", "-s", "large_business")
+    assert result.returncode == 0
+    assert "COMPLIANCE ANALYSIS" in result.stdout
+    assert heavy_imports(timings) == []
+
+def test_cli_import_budget():
+    """Importing the CLI module stays within the cold-start budget"""
+    result, timings = run_with_importtime("-c", "import src.interfaces.cli")
+    assert result.returncode == 0
+    elapsed_ms = timings["src.interfaces.cli"] / 1000
+    print(f"src.interfaces.cli import: {elapsed_ms:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    assert elapsed_ms < IMPORT_BUDGET_MS
+
+if __name__ == "__main__":
+    test_help_skips_heavy_imports()
+    test_local_command_skips_heavy_imports()
+    test_cli_import_budget()
+    print("✅ CLI startup checks passed")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test batch compliance analysis and its NDJSON streaming endpoint
+"""
+
+import json
+from src.agents.policy_agent import PolicyNavigatorAgent
+
+PROFILES = [
+    {"business_type": "tech", "size": "small_business", "jurisdiction": "US"},
+    {"business_type": "retail", "size": "large_business", "jurisdiction": "EU"},
+    {"business_type": "Tech", "size": "small_business", "jurisdiction": "us"},
+]
+
+def test_batch_groups_identical_profiles():
+    """Identical (type, size, jurisdiction) keys are analyzed once"""
+    agent = PolicyNavigatorAgent()
+
+    calls = []
+    analyze = agent.compliance_analyzer.analyze_compliance_requirements
+    agent.compliance_analyzer.analyze_compliance_requirements = lambda *args: calls.append(args) or analyze(*args)
+
+    results = list(agent.analyze_compliance_batch(PROFILES))
+
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert len(calls) == 2
+    assert results[0]["output"] == results[2]["output"]
+    assert results[1]["jurisdiction"] == "EU"
+    assert results[2]["profile"] == PROFILES[2]
+
+def test_batch_endpoint_streams_ndjson():
+    """The batch endpoint streams one JSON line per profile"""
+    from api_server import app
+
+    client = app.test_client()
+    response = client.post('/api/compliance/batch', json={"profiles": PROFILES})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2]
+
+    csv_body = "business_type,size\ntech,large_business\n"
+    response = client.post('/api/compliance/batch', data=csv_body, content_type='text/csv')
+    assert json.loads(response.get_data(as_text=True))["size"] == "large_business"
+
+    response = client.post('/api/compliance/batch', json={"profiles": []})
+    assert response.status_code == 400
+
+if __name__ == "__main__":
+    test_batch_groups_identical_profiles()
+    test_batch_endpoint_streams_ndjson()
+    print("✅ Batch compliance tests passed")
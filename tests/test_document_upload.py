@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test streamed document uploads: text, PDF and DOCX extraction and size limits
+"""
+
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from src.data_processing.document_parser import DocumentParser
+from src.data_processing.vector_store import VectorStoreManager
+
+def make_pdf(page_texts):
+    """Build a minimal PDF with one line of Helvetica text per page"""
+    page_count = len(page_texts)
+    kids = " ".join(f"{4 + 2 * n} 0 R" for n in range(page_count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    for n, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * n} 0 R >>".encode())
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+def make_docx(paragraphs):
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    document = ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body}</w:body></w:document>')
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+def chunked(data, size=1000):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+def test_pdf_pages_extracted_in_parallel_match_serial():
+    """Page ranges extracted in the process pool come back in page order"""
+    pages = [f"Section {n} requires annual reporting" for n in range(12)]
+    pdf = make_pdf(pages)
+
+    serial = DocumentParser(workers=1).parse(chunked(pdf), "rule.pdf")
+    parser = DocumentParser(workers=3, parallel_min_pages=4)
+    submitted = []
+    pool = parser._get_pool()
+    submit = pool.submit
+    def record(fn, *args):
+        submitted.append(args)
+        return submit(fn, *args)
+    pool.submit = record
+    try:
+        parallel = parser.parse(chunked(pdf), "rule.pdf")
+    finally:
+        parser.close()
+
+    # Workers get the path of one spooled copy, not the PDF bytes each
+    assert [(start, end) for _, start, end in submitted] == [(0, 4), (4, 8), (8, 12)]
+    assert len({path for path, _, _ in submitted}) == 1 and isinstance(submitted[0][0], str)
+    assert not os.path.exists(submitted[0][0])
+    assert serial["format"] == "pdf" and serial["pages"] == 12 and serial["bytes"] == len(pdf)
+    assert parallel["content"] == serial["content"]
+    assert parallel["content"].index("Section 2 ") < parallel["content"].index("Section 11 ")
+
+def test_docx_and_text_extraction():
+    parser = DocumentParser()
+
+    docx = parser.parse(chunked(make_docx(["Privacy notice", "Data retention: 30 days"])), "policy.docx")
+    assert docx["format"] == "docx"
+    assert docx["content"] == "Privacy notice\nData retention: 30 days"
+
+    # Multi-byte characters split across chunk boundaries decode correctly
+    text = "Règlement général sur la protection des données — " * 50
+    parsed = parser.parse(chunked(text.encode("utf-8"), size=7), "gdpr.txt")
+    assert parsed["content"] == text and parsed["format"] == "text"
+
+def test_size_limit_enforced_while_streaming():
+    """Oversized uploads are rejected without reading the rest of the stream"""
+    store = VectorStoreManager(parser=DocumentParser(max_file_size=5000))
+    read = []
+
+    def body():
+        for _ in range(100):
+            read.append(1)
+            yield b"x" * 1000
+
+    result = store.upload_stream(body(), "huge.txt")
+    assert result["status"] == "rejected"
+    assert len(read) == 6
+    assert store.documents == []
+
+def test_concurrent_uploads_get_distinct_documents():
+    store = VectorStoreManager()
+
+    def upload(n):
+        return store.upload_stream(chunked(f"Policy {n} text".encode()), f"policy_{n}.txt")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(upload, range(40)))
+
+    assert all(result["status"] == "uploaded" for result in results)
+    assert len({result["doc_id"] for result in results}) == 40
+    assert store.get_document_stats()["total_documents"] == 40
+
+def test_upload_endpoint_streams_without_temp_files(monkeypatch):
+    import api_server
+    from src.agents.policy_agent import PolicyNavigatorAgent
+
+    agent = PolicyNavigatorAgent(load_data=False)
+    monkeypatch.setattr(api_server, "agent", agent)
+    client = api_server.app.test_client()
+    before = set(os.listdir("."))
+
+    pdf = make_pdf(["Executive Order 14067 digital assets", "Reporting deadlines"])
+    response = client.post("/api/upload", data={"file": (io.BytesIO(pdf), "eo14067.pdf")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 200
+    assert response.get_json()["pages"] == 2
+    assert "digital assets" in agent.search_indexed_content("digital assets")[0]["content"]
+
+    response = client.post("/api/upload", data={"other": "value"}, content_type="multipart/form-data")
+    assert response.status_code == 400
+
+    agent.vector_store.parser.max_file_size = 100
+    response = client.post("/api/upload", data={"file": (io.BytesIO(b"y" * 1000), "big.txt")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 413
+    assert set(os.listdir(".")) == before
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
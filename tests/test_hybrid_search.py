@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test hybrid lexical + dense retrieval, fusion weights and the retrieval evaluation harness
+"""
+
+import importlib.util
+import os
+import pytest
+from src.data_processing.fusion import normalized_score_fusion, reciprocal_rank_fusion
+from src.data_processing.vector_store import VectorStoreManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_store():
+    store = VectorStoreManager()
+    store.add_document("Section 230 of the Communications Decency Act shields interactive computer services "
+                       "from liability for content posted by their users.", {"title": "CDA 230"})
+    store.add_document("Title III prohibits discrimination on the basis of disability in public accommodations.",
+                       {"title": "ADA"})
+    store.add_document("Section 404 requires management to assess internal control over financial reporting.",
+                       {"title": "SOX 404"})
+    return store
+
+def test_fusion_methods():
+    rankings = {"lexical": [("a", 9.0), ("b", 4.0)], "dense": [("b", 0.8), ("c", 0.5)]}
+    assert [item for item, _ in reciprocal_rank_fusion(rankings, {})] == ["b", "a", "c"]
+    assert reciprocal_rank_fusion(rankings, {"dense": 0.0})[0][0] == "a"
+    assert dict(normalized_score_fusion(rankings, {})) == {"a": 1.0, "b": 1.0, "c": 0.0}
+
+def test_hybrid_keeps_citations_and_finds_paraphrases():
+    store = make_store()
+    assert store.search_documents("Section 230", mode="hybrid")[0]["metadata"]["title"] == "CDA 230"
+
+    # No shared word, so BM25 misses it; trigrams of the word forms still match
+    query = "discriminatory treatment of disabled customers"
+    assert store.search_documents(query, mode="lexical") == []
+    assert store.search_documents(query, mode="hybrid")[0]["metadata"]["title"] == "ADA"
+
+    assert store.retrieve_passages("maritime salvage", mode="hybrid") == []
+    with pytest.raises(ValueError):
+        store.search_documents("Section 230", mode="semantic")
+
+def test_fusion_weights_are_exposed_and_tunable():
+    store = make_store()
+    settings = store.set_fusion(method="weighted", weights={"dense": 0.0})
+    assert settings["weights"] == {"lexical": 1.0, "dense": 0.0}
+    assert store.get_document_stats()["fusion"]["method"] == "weighted"
+    assert store.get_document_stats()["embedded_passages"] == 3
+
+    # With the dense retriever weighted out, hybrid ranks exactly like BM25
+    lexical = [chunk_id for chunk_id, _ in store.rank_passages("section management", mode="lexical")]
+    hybrid = [chunk_id for chunk_id, _ in store.rank_passages("section management", mode="hybrid")]
+    assert hybrid[:len(lexical)] == lexical
+
+    with pytest.raises(ValueError):
+        store.set_fusion(method="borda")
+    with pytest.raises(ValueError):
+        store.set_fusion(weights={"sparse": 1.0})
+
+def test_replaced_documents_are_re_embedded():
+    store = make_store()
+    store.replace_document("doc_1", "Overtime pay is due for hours worked over forty in a workweek.")
+    assert store.get_document_stats()["embedded_passages"] == 3
+    assert store.search_documents("disabled customers", mode="dense") == []
+    assert store.search_documents("overtime workers", mode="dense")[0]["doc_id"] == "doc_1"
+
+def test_dense_postings_are_compacted_after_removals():
+    """Removed passages disappear from results at once and from the posting arrays later"""
+    from src.data_processing.dense_index import DenseIndex
+
+    index = DenseIndex()
+    for chunk_id in range(8):
+        index.add(chunk_id, f"overtime pay rule number {chunk_id}")
+    index.remove(3)
+    assert len(index) == 7 and 3 not in dict(index.search("overtime pay", None))
+    assert any(3 in chunk_ids for chunk_ids, _ in index.postings.values())
+
+    index.remove(5)
+    index.remove(6)
+    assert len(index) == 5
+    assert all(3 not in chunk_ids and 6 not in chunk_ids for chunk_ids, _ in index.postings.values())
+    assert sorted(dict(index.search("overtime pay", None))) == [0, 1, 2, 4, 7]
+
+def test_evaluation_harness_reports_recall_and_latency():
+    spec = importlib.util.spec_from_file_location("retrieval_eval", os.path.join(ROOT, "benchmarks", "retrieval_eval.py"))
+    retrieval_eval = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(retrieval_eval)
+
+    report = retrieval_eval.run(weights=[(1.0, 1.0)], methods=["rrf"], ks=(1, 5))
+    configurations = report["configurations"]
+    assert set(configurations) == {"lexical", "dense", "hybrid rrf 1:1"}
+
+    lexical, hybrid = configurations["lexical"], configurations["hybrid rrf 1:1"]
+    assert hybrid["recall@5"] >= lexical["recall@5"]
+    assert hybrid["by_kind"]["citation"]["recall@1"] == 1.0
+    assert hybrid["latency_ms"]["mean"] > 0 and hybrid["latency_ms"]["p95"] > 0
+
+def test_lexical_mode_ranks_paraphrased_questions():
+    spec = importlib.util.spec_from_file_location("retrieval_eval", os.path.join(ROOT, "benchmarks", "retrieval_eval.py"))
+    retrieval_eval = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(retrieval_eval)
+
+    # Plain-word questions must not require every word to appear in a document
+    dataset = retrieval_eval.load_dataset()
+    store = retrieval_eval.build_store(dataset)
+    paraphrases = [query for query in dataset["queries"] if query["kind"] == "paraphrase"]
+    report = retrieval_eval.evaluate(store, paraphrases, "lexical", ks=(5,))
+    assert report["recall@5"] >= 0.75
+
+def test_hybrid_pages_rank_only_the_fusion_candidates(monkeypatch):
+    store = VectorStoreManager()
+    store.add_documents([{"content": f"Rule {n} on reporting financial disclosures", "metadata": {}} for n in range(30)])
+    store.set_fusion(candidates=5)
+    depths = []
+    rank_passages = store._rank_passages
+    def record(query, limit, mode, stats=None):
+        depths.append(limit)
+        return rank_passages(query, limit, mode, stats)
+    monkeypatch.setattr(store, "_rank_passages", record)
+
+    first = store.search_page("financial disclosures", limit=3, mode="hybrid")
+    second = store.search_page("financial disclosures", limit=3, cursor=first["next_cursor"], mode="hybrid")
+    assert depths == [9, 12]
+    assert len(second["results"]) == 3
+    assert not {r["doc_id"] for r in first["results"]} & {r["doc_id"] for r in second["results"]}
+
+    store.search_page("financial disclosures", limit=3)
+    assert depths[-1] is None  # lexical pages stay exact
+
+def test_search_endpoint_accepts_mode(monkeypatch):
+    import api_server
+    from src.agents.policy_agent import PolicyNavigatorAgent
+
+    agent = PolicyNavigatorAgent(load_data=False)
+    agent.vector_store = make_store()
+    monkeypatch.setattr(api_server, "agent", agent)
+    client = api_server.app.test_client()
+
+    response = client.post("/api/search-indexed", json={"query": "disabled customers", "mode": "dense"})
+    assert response.get_json()["results"][0]["metadata"]["title"] == "ADA"
+    assert client.post("/api/search-indexed", json={"query": "x", "mode": "semantic"}).status_code == 400
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
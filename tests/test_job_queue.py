@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the bounded job queue behind /api/jobs
+"""
+
+import threading
+import time
+from src.agents.local_agent import LocalAgentFactory
+from src.agents.policy_agent import PolicyNavigatorAgent
+from src.utils.job_queue import JobQueue, QueueFullError
+
+def wait_for(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_bounded_concurrency_and_backpressure():
+    """Only max_workers jobs run at once and a full queue rejects new jobs"""
+    release = threading.Event()
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def handler(payload):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        release.wait(5)
+        with lock:
+            active[0] -= 1
+        if payload["n"] == 3:
+            raise ValueError("upstream failure")
+        return payload["n"] * 10
+
+    jobs = JobQueue(handler, max_workers=2, max_queue_size=2)
+    submitted = [jobs.submit({"n": n}) for n in range(2)]
+    assert wait_for(lambda: jobs.get_stats()["running"] == 2)
+    submitted += [jobs.submit({"n": n}) for n in range(2, 4)]
+
+    try:
+        jobs.submit({"n": 4})
+        assert False, "expected QueueFullError"
+    except QueueFullError:
+        pass
+
+    stats = jobs.get_stats()
+    assert stats["queue_depth"] == 2 and stats["rejected"] == 1
+
+    release.set()
+    assert wait_for(lambda: jobs.get_stats()["completed"] + jobs.get_stats()["failed"] == 4)
+    assert peak[0] == 2
+    assert jobs.get(submitted[1]["id"])["result"] == 10
+    failed = jobs.get(submitted[3]["id"])
+    assert failed["status"] == "failed" and "upstream failure" in failed["error"]
+
+def test_finished_jobs_expire():
+    """Finished jobs are dropped after their TTL"""
+    jobs = JobQueue(lambda payload: "done", max_workers=1, ttl_seconds=0.05)
+    job_id = jobs.submit({})["id"]
+    assert wait_for(lambda: jobs.get(job_id)["status"] == "completed")
+    time.sleep(0.1)
+    assert jobs.get(job_id) is None
+    assert jobs.get_stats()["expired"] == 1
+
+def test_jobs_api(monkeypatch):
+    """POST /api/jobs returns 202 and the result is polled from GET /api/jobs/<id>"""
+    import api_server
+
+    factory = LocalAgentFactory()
+    agent = PolicyNavigatorAgent(load_data=False, agent_factory=factory)
+    agent.answer_cache = None
+    agent.agent = factory.create(name="test", description="test")
+    monkeypatch.setattr(api_server, "agent", agent)
+    client = api_server.app.test_client()
+
+    response = client.post('/api/jobs', json={"query": "Is EO 14067 in effect?"})
+    assert response.status_code == 202
+    poll_url = response.get_json()["poll_url"]
+
+    assert wait_for(lambda: client.get(poll_url).get_json()["status"] == "completed")
+    assert client.get(poll_url).get_json()["result"]["output"].startswith("Local answer for:")
+    assert client.get('/api/jobs/unknown').status_code == 404
+    assert client.get('/api/stats').get_json()["jobs"]["completed"] >= 1
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
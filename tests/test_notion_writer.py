@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test rate-limited Notion syncing against a local Notion API stand-in
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.tools.external_integrations import NotionIntegration
+from src.tools.notion_writer import NotionWriter
+from src.utils.rate_limit import TokenBucket
+
+class _Notion(BaseHTTPRequestHandler):
+    """Pages, database queries and a strict limit of ``rate`` requests/second"""
+    pages = {}
+    rate = 40.0
+    forced_429 = 0
+    stats = {"requests": 0, "rejected": 0}
+    lock = threading.Lock()
+    next_due = 0.0
+
+    def do_POST(self):
+        self._handle()
+
+    def do_PATCH(self):
+        self._handle()
+
+    def _handle(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not self._admit():
+            return self._reply(429, {"object": "error", "code": "rate_limited"}, {"Retry-After": "0.2"})
+
+        if self.path.endswith("/query"):
+            wanted = body["filter"]["rich_text"]["equals"]
+            results = [{"id": page_id} for page_id, properties in _Notion.pages.items()
+                       if properties["Policy ID"]["rich_text"][0]["text"]["content"] == wanted]
+            return self._reply(200, {"results": results[:body.get("page_size", 100)]})
+        if self.path == "/v1/pages":
+            page_id = str(uuid.uuid4())
+            _Notion.pages[page_id] = body["properties"]
+            return self._reply(200, {"id": page_id})
+        page_id = self.path.rsplit("/", 1)[1]
+        _Notion.pages[page_id].update(body["properties"])
+        return self._reply(200, {"id": page_id})
+
+    def _admit(self):
+        # The same virtual-scheduling limiter, with a little slack for timing jitter
+        with _Notion.lock:
+            _Notion.stats["requests"] += 1
+            if _Notion.forced_429:
+                _Notion.forced_429 -= 1
+                _Notion.stats["rejected"] += 1
+                return False
+            now, interval = time.monotonic(), 1.0 / _Notion.rate
+            due = max(_Notion.next_due, now)
+            if due - now > 5 * interval:
+                _Notion.stats["rejected"] += 1
+                return False
+            _Notion.next_due = due + interval
+            return True
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def start_notion():
+    _Notion.pages = {}
+    _Notion.forced_429 = 0
+    _Notion.next_due = 0.0
+    _Notion.stats = {"requests": 0, "rejected": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Notion)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+def make_notion(url, rate=40.0):
+    return NotionIntegration(token="secret", database_id="db1", base_url=url, rate_per_second=rate, burst=3)
+
+def policies(count, status="active"):
+    return [{"policy_id": f"EO-{14000 + n}", "title": f"Executive Order {14000 + n}", "status": status}
+            for n in range(count)]
+
+def test_token_bucket_spaces_out_callers():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.perf_counter()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 0.35 <= time.perf_counter() - start < 0.7  # 8 tokens beyond the burst at 20/s
+
+def test_bulk_sync_runs_at_the_rate_limit_ceiling():
+    server, url = start_notion()
+    notion = make_notion(url)
+    writer = NotionWriter(notion, workers=4, max_queue_size=10)
+    try:
+        result = writer.sync(policies(40))
+        assert result["created"] == 40 and result["failed"] == 0
+        assert len(_Notion.pages) == 40
+        assert _Notion.stats["rejected"] == 0
+        # One query plus one create per policy, paced at 40 requests/second
+        assert result["requests"] == 80
+        assert 30 <= result["requests_per_second"] <= 42
+
+        # Re-syncing updates the same pages, also from a fresh process with no cached page IDs
+        result = NotionWriter(make_notion(url), workers=4).sync(policies(40, status="amended"))
+        assert result["updated"] == 40 and result["created"] == 0
+        assert len(_Notion.pages) == 40
+        assert {page["Status"]["select"]["name"] for page in _Notion.pages.values()} == {"amended"}
+    finally:
+        writer.close()
+        server.shutdown()
+
+def test_rate_limited_requests_are_retried():
+    server, url = start_notion()
+    _Notion.forced_429 = 2
+    notion = make_notion(url)
+    try:
+        start = time.perf_counter()
+        result = notion.create_policy_page(policies(1)[0])
+        assert result["success"] and result["action"] == "created"
+        assert time.perf_counter() - start >= 0.4  # waited out Retry-After twice
+        stats = notion.get_stats()
+        assert stats["rate_limited"] == 2 and stats["rate_limit"]["pauses"] == 2
+    finally:
+        server.shutdown()
+
+class _SlowNotion:
+    def __init__(self):
+        self.release = threading.Event()
+        self.written = []
+
+    policy_key = staticmethod(NotionIntegration.policy_key)
+
+    def upsert_policy_page(self, policy_data):
+        self.release.wait(5)
+        self.written.append(policy_data)
+        return {"success": True, "action": "created"}
+
+def test_queue_is_bounded_and_coalesces_repeats():
+    notion = _SlowNotion()
+    writer = NotionWriter(notion, workers=1, max_queue_size=2)
+
+    first, second, third, fourth = policies(4)
+    assert writer.submit(first)  # taken by the worker, which blocks
+    time.sleep(0.1)
+    assert writer.submit(second) and writer.submit(third)
+    assert writer.submit(dict(second, status="revoked"))  # still queued: updated in place
+    assert writer.submit(fourth, block=False) is False
+
+    notion.release.set()
+    assert writer.join(timeout=5)
+    assert [policy["status"] for policy in notion.written] == ["active", "revoked", "active"]
+    assert writer.get_stats()["coalesced"] == 1
+    writer.close()
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
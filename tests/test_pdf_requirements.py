@@ -15,6 +15,7 @@ def test_pdf_requirements():
     print("=" * 50)
     
     agent = PolicyNavigatorAgent()
+    agent.wait_until_ready()
     
     # 1. Test RAG Pipeline (Agentic Version) ✅
     print("\n1. ✅ RAG Pipeline (Agentic Version)")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test the synthetic corpus generator and the performance suite's metrics and regression checks
+"""
+
+import importlib.util
+import os
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, "benchmarks", f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+perf_suite = load("perf_suite")
+synthetic_corpus = load("synthetic_corpus")
+
+def test_corpus_is_deterministic_and_regulation_like():
+    first = list(synthetic_corpus.generate_documents(20, seed=5))
+    assert first == list(synthetic_corpus.generate_documents(20, seed=5))
+    assert first != list(synthetic_corpus.generate_documents(20, seed=6))
+    # Any slice can be generated on its own, so large corpora stream in batches
+    assert list(synthetic_corpus.generate_documents(5, seed=5, start=10)) == first[10:15]
+
+    documents = list(synthetic_corpus.generate_documents(200))
+    assert all({"title", "type", "jurisdiction", "effective_date"} <= set(d["metadata"]) for d in documents)
+    assert any("U.S.C." in d["content"] or "CFR part" in d["content"] for d in documents)
+    assert any("hereby revoked" in d["content"] for d in documents)
+
+def test_run_size_reports_every_metric():
+    metrics = perf_suite.run_size(60, single_adds=5, search_repeats=1, csv_rows=20)
+    assert metrics["documents"] == 60 and metrics["load_csv_rows"] == 20
+    for name in ("bulk_load_docs_per_sec", "add_document_p95_us", "search_lexical_p95_ms", "search_hybrid_p95_ms",
+                 "get_document_stats_ms", "load_csv_rows_per_sec"):
+        assert metrics[name] > 0, name
+    assert "memory_bytes_per_document" in metrics
+
+def test_check_flags_limits_and_baseline_regressions():
+    report = {"sizes": {"10000": {"search_lexical_p95_ms": 120.0, "bulk_load_docs_per_sec": 400.0,
+                                  "memory_mb": 500.0}}}
+    thresholds = {"tolerance": 0.25, "sizes": {"10000": {"search_lexical_p95_ms": {"max": 100},
+                                                         "bulk_load_docs_per_sec": {"min": 100}}}}
+    assert [failure["metric"] for failure in perf_suite.check(report, thresholds)] == ["search_lexical_p95_ms"]
+
+    baseline = {"sizes": {"10000": {"search_lexical_p95_ms": 110.0, "bulk_load_docs_per_sec": 600.0,
+                                    "memory_mb": 350.0}}}
+    failures = perf_suite.check(report, {"tolerance": 0.25}, baseline)
+    assert sorted(failure["metric"] for failure in failures) == ["bulk_load_docs_per_sec", "memory_mb"]
+
+def test_thresholds_cover_every_size_and_pass_the_recorded_run():
+    import json
+    with open(perf_suite.THRESHOLDS) as f:
+        thresholds = json.load(f)
+    with open(os.path.join(ROOT, "benchmarks", "perf_baseline.json")) as f:
+        baseline = json.load(f)
+
+    assert set(thresholds["sizes"]) == set(baseline["sizes"])
+    for size, limits in thresholds["sizes"].items():
+        assert {"search_lexical_p95_ms", "search_hybrid_p95_ms", "get_document_stats_ms",
+                "bulk_load_docs_per_sec", "memory_bytes_per_document"} <= set(limits), size
+    assert perf_suite.check(baseline, thresholds, baseline) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
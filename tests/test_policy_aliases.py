@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test citation and acronym normalization, the alias index and local policy resolution
+"""
+
+import pytest
+from src.data_processing.citations import AliasIndex, extract_citations
+from src.data_processing.vector_store import VectorStoreManager
+from src.tools.custom_tools import PolicyStatusChecker
+
+@pytest.mark.parametrize("text, keys", [
+    ("EO-14067", ["eo:14067"]),
+    ("EO 14067", ["eo:14067"]),
+    ("Executive Order 14067", ["eo:14067"]),
+    ("E.O. 14067", ["eo:14067"]),
+    ("Executive Order No. 14110 and EO 13960", ["eo:14110", "eo:13960"]),
+    ("42 U.S.C. § 7401", ["usc:42:7401"]),
+    ("15 USC 78m", ["usc:15:78m"]),
+    ("45 CFR Part 164", ["cfr:45:164"]),
+    ("45 C.F.R. 164.502", ["cfr:45:164", "cfr:45:164.502"]),
+    ("Pub. L. 117-58", ["pl:117-58"]),
+    ("Public Law 117–58", ["pl:117-58"]),
+    ("a video about 14067 things", []),
+])
+def test_citations_normalize_to_one_key(text, keys):
+    assert extract_citations(text) == keys
+
+def test_acronyms_resolve_exactly_learned_or_fuzzily():
+    aliases = AliasIndex()
+    aliases.add("doc_0", "The General Data Protection Regulation (GDPR) governs personal data.")
+    aliases.add("doc_1", "The Infrastructure Investment and Jobs Act (IIJA), Pub. L. 117-58, funds broadband.")
+
+    for spelling in ("GDPR", "gdpr", "General Data Protection Regulation"):
+        assert aliases.resolve(spelling)["key"] == "name:gdpr"
+        assert aliases.resolve(spelling)["doc_ids"] == ["doc_0"]
+
+    learned = aliases.resolve("IIJA")
+    assert learned["name"] == "Infrastructure Investment And Jobs Act" and learned["doc_ids"] == ["doc_1"]
+    assert aliases.resolve("Public Law 117-58")["doc_ids"] == ["doc_1"]
+
+    typo = aliases.resolve("Genral Data Protection Regulaton")
+    assert typo["key"] == "name:gdpr" and typo["match"] == "fuzzy"
+
+    # Numbered citations are exact: a different EO number is a different order
+    assert aliases.resolve("EO 14076")["doc_ids"] == []
+    assert aliases.resolve("maritime salvage") is None
+
+    aliases.remove("doc_0")
+    assert aliases.resolve("GDPR")["doc_ids"] == []
+
+def make_store():
+    store = VectorStoreManager()
+    store.add_document("Executive Order 14067 establishes policy on digital assets.",
+                       {"title": "Ensuring Responsible Development of Digital Assets", "policy_id": "EO-14067"})
+    store.add_document("The GDPR sets rules for processing personal data in the EU.", {"title": "EU data rules"})
+    store.add_document("Guidance on 45 CFR Part 164 disclosures by covered entities.", {"title": "HIPAA guidance"})
+    return store
+
+def test_search_matches_every_spelling_of_a_citation():
+    store = make_store()
+    for spelling in ("EO-14067", "E.O. 14067", "Executive Order 14067", "cite:\"EO 14067\""):
+        assert [result["doc_id"] for result in store.search_documents(spelling)] == ["doc_0"]
+
+    assert [result["doc_id"] for result in store.search_documents("General Data Protection Regulation")] == ["doc_1"]
+    assert [result["doc_id"] for result in store.search_documents("cite:\"45 C.F.R. 164\"")] == ["doc_2"]
+    assert [result["doc_id"] for result in store.search_documents("cite:HIPAA")] == ["doc_2"]  # named in the title
+    assert store.search_documents("cite:CCPA") == []
+
+    # Citation matches are added in every retrieval mode, not only lexical
+    only_full_name = VectorStoreManager()
+    only_full_name.add_document("The General Data Protection Regulation sets rules for personal data.", {})
+    for mode in ("lexical", "hybrid", "dense"):
+        assert [result["doc_id"] for result in only_full_name.search_documents("GDPR", mode=mode)] == ["doc_0"]
+        assert [result["doc_id"] for result in store.search_documents("E.O. 14067", mode=mode)][0] == "doc_0"
+
+    resolution = store.resolve_policy("E.O. 14067")
+    assert resolution["key"] == "eo:14067" and resolution["documents"][0]["doc_id"] == "doc_0"
+
+def test_status_checks_search_upstream_under_the_canonical_name(recording_apis):
+    store = make_store()
+    checker = recording_apis(PolicyStatusChecker(resolver=store.resolve_policy))
+
+    first = checker.check_policy_status("EO-14067")
+    second = checker.check_policy_status("E.O. 14067")
+    assert checker.federal_api.queries == checker.court_api.queries == ["Executive Order 14067"] * 2
+    assert first["policy_id"] == "EO-14067"
+    assert second["resolution"]["documents"][0]["title"] == "Ensuring Responsible Development of Digital Assets"
+
+def test_resolve_endpoint(api_client, monkeypatch):
+    agent, client = api_client(make_store())
+
+    response = client.post("/api/resolve", json={"policy_id": "gdpr"})
+    assert response.status_code == 200 and response.get_json()["documents"][0]["doc_id"] == "doc_1"
+    assert client.post("/api/resolve", json={"policy_id": "maritime salvage"}).status_code == 404
+    assert agent.policy_key("EO-14067") == agent.policy_key("Executive Order 14067") == "eo:14067"
+
+    def broken(policy_id):
+        raise RuntimeError("alias index unavailable")
+    monkeypatch.setattr(agent, "resolve_policy", broken)
+    response = client.post("/api/resolve", json={"policy_id": "gdpr"})
+    assert response.status_code == 500 and response.get_json() == {"error": "alias index unavailable"}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test fingerprint-based change detection for tracked Federal Register documents
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from src.tools.federal_register_api import FederalRegisterAPI
+from src.tools.policy_watcher import PolicyWatcher, classify_change, diff_snapshots
+
+class _FederalRegister(BaseHTTPRequestHandler):
+    documents = {}
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        numbers = url.path.rsplit("/", 1)[1][:-len(".json")].split(",")
+        fields = parse_qs(url.query)["fields[]"]
+        _FederalRegister.requests.append(numbers)
+        results = [{field: self.documents[n].get(field) for field in fields} for n in numbers if n in self.documents]
+        body = json.dumps(results[0] if len(numbers) == 1 else {"count": len(results), "results": results}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_federal_register(count):
+    _FederalRegister.requests = []
+    _FederalRegister.documents = {
+        f"2022-{n:05d}": {
+            "document_number": f"2022-{n:05d}",
+            "title": f"Executive Order {14000 + n}",
+            "type": "Presidential Document",
+            "abstract": "Ensuring responsible development of digital assets.",
+            "executive_order_notes": "See: EO 14067",
+            "effective_on": "2022-03-09",
+            "html_url": f"https://www.federalregister.gov/d/2022-{n:05d}"
+        }
+        for n in range(count)
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FederalRegister)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/v1"
+
+def test_classify_changes():
+    before = {"executive_order_notes": "See: EO 14067", "effective_on": "2022-03-09", "abstract": "Old"}
+    revoked = dict(before, executive_order_notes="See: EO 14067; Revoked by: EO 14148, January 20, 2025")
+    assert classify_change(diff_snapshots(before, revoked)) == "repealed"
+    assert classify_change(diff_snapshots(before, dict(before, effective_on="2023-01-01"))) == "amended"
+    assert classify_change(diff_snapshots(before, dict(before, executive_order_notes="See: EO 14067; Amended by: EO 14100"))) == "amended"
+    assert classify_change(diff_snapshots(before, dict(before, abstract="New wording"))) == "edited"
+
+    # An old revocation note does not make a later, unrelated edit a repeal
+    assert classify_change(diff_snapshots(revoked, dict(revoked, abstract="Typo fixed"))) == "edited"
+
+def test_only_real_changes_alert(tmp_path):
+    server, url = start_federal_register(120)
+    alerts = []
+    watcher = PolicyWatcher(FederalRegisterAPI(url), on_change=alerts.append,
+                            path=str(tmp_path / "watch.db"), batch_size=50)
+    try:
+        for number in _FederalRegister.documents:
+            watcher.track(number)
+
+        # The first pass records baselines, in three batched requests
+        assert watcher.check_all() == {"checked": 120, "changes": [], "alerts": 0}
+        assert len(_FederalRegister.requests) == 3
+
+        assert watcher.check_all()["changes"] == []
+        assert watcher.get_stats()["unchanged"] == 120
+
+        documents = _FederalRegister.documents
+        documents["2022-00001"]["title"] = "  Executive   Order 14001 "  # whitespace only
+        documents["2022-00002"]["abstract"] = "Ensuring the responsible development of digital assets."
+        documents["2022-00003"]["executive_order_notes"] = "See: EO 14067; Revoked by: EO 14148"
+        documents["2022-00004"]["effective_on"] = "2023-01-01"
+        documents["2022-00005"]["html_url"] = "https://example.gov/moved"  # not a watched field
+
+        result = watcher.check_all()
+        assert {change["document_number"]: change["kind"] for change in result["changes"]} == {
+            "2022-00002": "edited", "2022-00003": "repealed", "2022-00004": "amended"
+        }
+        assert result["alerts"] == 2
+        assert [(alert["document_number"], alert["status"]) for alert in alerts] == [
+            ("2022-00003", "repealed"), ("2022-00004", "amended")
+        ]
+        assert alerts[0]["changes"]["executive_order_notes"]["after"] == "See: EO 14067; Revoked by: EO 14148"
+        assert alerts[1]["changes"] == {"effective_on": {"before": "2022-03-09", "after": "2023-01-01"}}
+    finally:
+        server.shutdown()
+
+def test_fingerprints_survive_restart(tmp_path):
+    server, url = start_federal_register(3)
+    path = str(tmp_path / "watch.db")
+    watcher = PolicyWatcher(FederalRegisterAPI(url), path=path)
+    watcher.track("2022-00000", "EO 14000")
+    watcher.check_all()
+
+    alerts = []
+    restarted = PolicyWatcher(FederalRegisterAPI(url), on_change=alerts.append, path=path)
+    try:
+        assert restarted.track("2022-00000") is False
+        _FederalRegister.documents["2022-00000"]["executive_order_notes"] = "Revoked by: EO 14148"
+        assert restarted.refresh() is True
+        assert alerts[0]["policy_id"] == "EO 14000"
+        assert restarted.get_watched()[0]["status"] == "repealed"
+    finally:
+        server.shutdown()
+
+def test_watch_endpoint_tracks_policies(tmp_path, monkeypatch):
+    import api_server
+    from src.agents.policy_agent import PolicyNavigatorAgent
+
+    server, url = start_federal_register(2)
+    agent = PolicyNavigatorAgent(load_data=False)
+    monkeypatch.setattr(api_server, "agent", agent)
+    monkeypatch.setitem(agent._components, "policy_watcher",
+                        PolicyWatcher(FederalRegisterAPI(url), path=str(tmp_path / "watch.db")))
+    client = api_server.app.test_client()
+
+    try:
+        response = client.post("/api/watch", json={"document_number": "2022-00001", "policy_id": "EO 14001"})
+        assert response.status_code == 200 and response.get_json()["status"] == "watching"
+        assert client.post("/api/watch", json={}).status_code == 400
+
+        assert client.post("/api/watch/check").get_json()["checked"] == 1
+        watched = client.get("/api/watch").get_json()["watched"]
+        assert [(entry["policy_id"], entry["status"]) for entry in watched] == [("EO 14001", "active")]
+        assert "policy_watch:federal_register" in agent._reindex_sources()
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
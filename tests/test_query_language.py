@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test the indexed-search query language: phrases, boolean operators, field filters and rarest-first plans
+"""
+
+import threading
+import pytest
+from src.data_processing.vector_store import VectorStoreManager
+
+POLICIES = [
+    ("The GDPR gives small businesses with fewer than 250 employees simplified record keeping.",
+     {"title": "General Data Protection Regulation (GDPR)", "type": "privacy_law", "jurisdiction": "EU",
+      "effective_date": "2018-05-25"}),
+    ("Executive Order 14067 sets policy on digital assets. Small business lenders are consulted.",
+     {"title": "Executive Order 14067 - Digital Assets", "type": "Executive Order", "jurisdiction": "US",
+      "effective_date": "2022-03-09"}),
+    ("Section 230 shields online platforms from liability for user content under the terms of service.",
+     {"title": "Section 230 Communications Decency Act", "type": "federal_law", "jurisdiction": "US",
+      "effective_date": "1996-02-08"}),
+    ("The California privacy act lets consumers opt out of the sale of personal data by a business.",
+     {"title": "California Consumer Privacy Act", "type": "privacy_law", "jurisdiction": "US-CA",
+      "effective_date": "2020-01-01"}),
+]
+
+def make_store():
+    store = VectorStoreManager()
+    store.add_documents([{"content": content, "metadata": metadata} for content, metadata in POLICIES])
+    return store
+
+def titles(store, query, **kwargs):
+    return sorted(result["metadata"]["title"].split(" ")[0] for result in store.search_documents(query, 10, **kwargs))
+
+def test_plain_words_are_ranked_not_required():
+    store = make_store()
+    results = store.search_documents("are online platforms shielded from liability for what users post", 10)
+    assert results[0]["metadata"]["title"].startswith("Section 230")
+    assert store.search_documents("GDPR small business", 10)[0]["metadata"]["title"].startswith("General")
+    assert len(store.search_documents("GDPR small business", 10)) == 3
+
+def test_words_are_anded_with_operators_and_match_plurals():
+    store = make_store()
+    assert titles(store, "GDPR AND small business") == ["General"]
+    assert titles(store, "small AND business") == ["Executive", "General"]
+    assert titles(store, "privacy OR platforms") == ["California", "Section"]
+    assert titles(store, "small business NOT GDPR") == ["Executive"]
+    assert titles(store, "small business -digital") == ["General"]
+    assert titles(store, "(GDPR OR platforms) AND liability") == ["Section"]
+
+def test_phrases_use_positions():
+    store = make_store()
+    assert titles(store, '"terms of service"') == ["Section"]
+    assert titles(store, '"terms service"') == []
+    assert titles(store, '"small businesses"') == ["General"]
+    assert titles(store, '"small business"') == ["Executive"]  # quoted words match exactly
+
+    result = store.search_documents('"digital assets" policy')[0]
+    assert sorted(result["content"][start:end] for start, end in result["highlights"]) == ["assets", "digital", "policy"]
+
+def test_field_filters_and_date_ranges():
+    store = make_store()
+    assert titles(store, "jurisdiction:EU") == ["General"]
+    assert titles(store, 'type:"executive order"') == ["Executive"]
+    assert titles(store, "type:privacy_law -jurisdiction:EU") == ["California"]
+    assert titles(store, 'title:"digital assets"') == ["Executive"]
+    assert titles(store, "title:privacy") == ["California"]
+    assert titles(store, "effective_date:[2018 TO 2020]") == ["California", "General"]
+    assert titles(store, "effective_date:[2019-01-01 TO *]") == ["California", "Executive"]
+    assert titles(store, "effective_date:1996") == ["Section"]
+    assert titles(store, "business effective_date:[2020 TO 2023]") == ["California", "Executive"]
+
+def test_filters_apply_in_hybrid_mode():
+    store = make_store()
+    assert titles(store, "personal data privacy", mode="dense") == ["California"]
+    assert titles(store, "personal data privacy -type:privacy_law", mode="dense") == []
+    assert titles(store, "small business records jurisdiction:EU", mode="hybrid") == ["General"]
+
+def test_plan_intersects_rarest_clause_first():
+    store = VectorStoreManager()
+    store.add_documents([{"content": f"Federal regulation number {n}", "metadata": {"jurisdiction": "US"}}
+                         for n in range(200)])
+    store.add_document("Federal regulation on maritime salvage", {"jurisdiction": "US"})
+
+    explained = store.explain_query("federal regulation jurisdiction:US salvage -repealed")
+    order = [clause.get("term") or clause.get("field") or "not" for clause in explained["plan"]["and"]]
+    assert order == ["salvage", "federal", "regulation", "jurisdiction", "not"]
+    assert explained["plan"]["and"][0]["estimate"] == 1
+    assert explained["matches"] == 1
+
+@pytest.mark.parametrize("query", ['"unclosed', "(GDPR", "GDPR )", "GDPR OR", "GDPR NOT", "author:smith",
+                                   "title:[2020 TO 2021]"])
+def test_syntax_errors_raise(query):
+    with pytest.raises(ValueError):
+        make_store().search_documents(query)
+
+def test_one_parser_is_shared_by_concurrent_searches():
+    parser = make_store().query_parser
+    queries = ['(GDPR OR "privacy act") NOT repealed', "jurisdiction:US AND (liability OR -platforms)",
+               'NOT (section AND "terms of service") OR GDPR']
+    expected = {query: parser.parse(query).words() for query in queries}
+    errors, mismatches = [], []
+
+    def parse(query):
+        for _ in range(300):
+            try:
+                if parser.parse(query).words() != expected[query]:
+                    mismatches.append(query)
+            except ValueError as e:
+                errors.append(str(e))
+
+    threads = [threading.Thread(target=parse, args=(query,)) for query in queries for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == [] and mismatches == []
+
+def test_search_endpoint_explains_and_rejects_bad_queries(monkeypatch):
+    import api_server
+    from src.agents.policy_agent import PolicyNavigatorAgent
+
+    agent = PolicyNavigatorAgent(load_data=False)
+    agent.vector_store = make_store()
+    monkeypatch.setattr(api_server, "agent", agent)
+    client = api_server.app.test_client()
+
+    response = client.post("/api/search-indexed", json={"query": "small business jurisdiction:US", "mode": "lexical",
+                                                        "explain": True}).get_json()
+    assert [result["metadata"]["jurisdiction"] for result in response["results"]] == ["US"]
+    assert [clause.get("term") or clause.get("field") for clause in response["plan"]["and"]][-1] == "business"
+    assert client.post("/api/search-indexed", json={"query": "author:smith"}).status_code == 400
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
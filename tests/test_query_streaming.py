@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test streamed agent queries and the /api/query SSE mode
+"""
+
+import json
+from src.agents.local_agent import LocalAgentFactory
+from src.agents.policy_agent import PolicyNavigatorAgent
+
+STEPS = [{"tool": "federal_register_search"}, {"tool": "web_scraper"}]
+ANSWER = "Executive Order 14067 is still in effect. No amendments or repeals have been filed since it was signed."
+
+def make_agent():
+    factory = LocalAgentFactory(responder=lambda prompt: ANSWER, steps=STEPS)
+    agent = PolicyNavigatorAgent(load_data=False, agent_factory=factory)
+    agent.config = {**agent.config, "streaming": {"poll_interval": 0, "answer_chunk_chars": 30}}
+    agent.answer_cache = None
+    agent.agent = factory.create(name="test", description="test")
+    agent.dataset_loader.load_sample_policy_dataset()
+    return agent, factory
+
+def test_query_stream_events():
+    """Retrieval, tool steps and answer chunks arrive in order before the final result"""
+    agent, _ = make_agent()
+    events = list(agent.query_stream("Is Executive Order 14067 still in effect?"))
+
+    names = [event["event"] for event in events]
+    assert names[0] == "retrieval" and names[-1] == "done"
+    assert [event["step"] for event in events if event["event"] == "step"] == STEPS
+    assert names.count("answer") > 1
+    assert "".join(event["delta"] for event in events if event["event"] == "answer") == ANSWER
+    assert events[-1]["result"]["output"] == ANSWER
+    assert events[0]["citations"] == events[-1]["result"]["citations"]
+
+def test_partial_output_is_forwarded_while_running():
+    """Partial answers in poll responses are streamed between steps, without repeats"""
+    agent, factory = make_agent()
+    factory.partial_output = True
+    events = list(agent.query_stream("Is Executive Order 14067 still in effect?"))
+
+    names = [event["event"] for event in events]
+    assert names.index("answer") < max(i for i, name in enumerate(names) if name == "step")
+    assert "".join(event["delta"] for event in events if event["event"] == "answer") == ANSWER
+    assert events[-1]["result"]["output"] == ANSWER
+
+def test_sse_first_event_before_agent_runs(monkeypatch):
+    """The first SSE event is sent before the remote agent is even started"""
+    import api_server
+
+    agent, factory = make_agent()
+    monkeypatch.setattr(api_server, "agent", agent)
+    client = api_server.app.test_client()
+
+    response = client.post('/api/query', json={"query": "Is EO 14067 in effect?", "stream": True}, buffered=False)
+    assert response.mimetype == 'text/event-stream'
+
+    chunks = iter(response.response)
+    first = next(chunks)
+    first = first.decode() if isinstance(first, bytes) else first
+    assert first.startswith("event: retrieval\n")
+    assert factory.calls["run_async"] == 0
+
+    rest = "".join(chunk.decode() if isinstance(chunk, bytes) else chunk for chunk in chunks)
+    last = rest.strip().split("\n\n")[-1]
+    assert last.startswith("event: done")
+    assert json.loads(last.split("data: ", 1)[1])["result"]["output"] == ANSWER
+
+    response = client.post('/api/query', json={"query": "Is EO 14067 in effect?", "stream": "ndjson"})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines[-1]["event"] == "done"
+
+def test_polling_gives_up_at_timeout():
+    """A run that never completes ends with an error event, or TimeoutError from aquery"""
+    import asyncio
+    import pytest
+
+    agent, factory = make_agent()
+    factory.steps = [{"tool": "web_scraper"}] * 10000
+    agent.config = {**agent.config, "streaming": {"poll_interval": 0, "timeout": 0.05}}
+
+    events = list(agent.query_stream("Is EO 14067 in effect?"))
+    assert events[-2]["event"] == "error" and "did not finish" in events[-2]["error"]
+    assert events[-1]["result"]["error"] == events[-2]["error"]
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(agent.aquery("Is EO 14067 in effect?"))
+    assert factory.calls["poll"] < 10000
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Test the background re-index scheduler and in-place document refreshes
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.agents.policy_agent import PolicyNavigatorAgent
+from src.data_processing.reindex_scheduler import ReindexScheduler
+from src.data_processing.vector_store import VectorStoreManager
+
+def test_intervals_adapt_to_change_rate():
+    """Sources that change are revisited sooner than ones that never do"""
+    scheduler = ReindexScheduler(min_interval=10, max_interval=1000, initial_interval=100)
+    scheduler.add_source("hot", lambda: True, due_in=0)
+    scheduler.add_source("cold", lambda: False, due_in=0)
+
+    assert scheduler.run_pending() == 2
+    stats = scheduler.get_stats()
+    assert [entry["source"] for entry in stats["next_due"]] == ["hot", "cold"]
+    assert [entry["interval_seconds"] for entry in stats["next_due"]] == [50, 150]
+    assert stats["refreshed"] == 2 and stats["changed"] == 1
+
+    # Nothing is due again until its interval has passed
+    assert scheduler.run_pending() == 0
+    assert scheduler.run_pending(now=time.time() + 60) == 1
+    assert scheduler.get_stats()["next_due"][0]["interval_seconds"] == 25
+
+def test_change_history_brings_sources_forward():
+    """Of two sources on the same interval, the one that has changed more is due first"""
+    scheduler = ReindexScheduler(min_interval=10, max_interval=1000, initial_interval=100, smoothing=0.5)
+    changes = iter([True, False])
+    scheduler.add_source("flaky", lambda: next(changes), due_in=0)
+    scheduler.add_source("steady", lambda: False, interval=50, due_in=0)
+    scheduler.run_pending()
+    scheduler.run_pending(now=time.time() + 60)
+
+    flaky, steady = sorted(scheduler.get_stats()["next_due"], key=lambda entry: entry["source"])
+    assert flaky["interval_seconds"] == steady["interval_seconds"] == 75
+    assert flaky["change_rate"] == 0.25 and steady["change_rate"] == 0
+    assert flaky["due_in_seconds"] < steady["due_in_seconds"]
+
+def test_failing_sources_report_their_last_error(capsys):
+    """A refresh that raises is counted and its error kept until the source succeeds again"""
+    scheduler = ReindexScheduler(min_interval=10, max_interval=1000, initial_interval=100)
+    outcomes = iter([ConnectionError("404 Not Found"), False])
+    def refresh():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    scheduler.add_source("https://example.gov/gone", refresh, due_in=0)
+    scheduler.add_source("https://example.gov/fine", lambda: False, due_in=0)
+
+    scheduler.run_pending()
+    stats = scheduler.get_stats()
+    assert stats["failed"] == 1
+    assert [(entry["source"], entry["error"]) for entry in stats["failing"]] == [
+        ("https://example.gov/gone", "ConnectionError: 404 Not Found")]
+    assert "https://example.gov/gone failed: ConnectionError" in capsys.readouterr().out
+
+    scheduler.run_pending(now=time.time() + 1000)
+    assert scheduler.get_stats()["failing"] == []
+
+def test_sources_are_rediscovered_only_on_change():
+    """The provider is consulted when its version changes or the rescan interval passes"""
+    urls, calls = ["a"], []
+
+    def provider():
+        calls.append(1)
+        return {f"url:{url}": lambda: False for url in urls}
+
+    scheduler = ReindexScheduler(sources_provider=provider, sources_version=lambda: len(urls),
+                                 discover_interval=3600)
+    for _ in range(5):
+        scheduler.run_pending()
+    assert len(calls) == 1
+
+    urls.append("b")
+    scheduler.run_pending()
+    assert len(calls) == 2 and scheduler.get_stats()["sources"] == 2
+
+    scheduler.discover_interval = 0
+    scheduler.run_pending()
+    assert len(calls) == 3
+
+def test_bounded_concurrency_and_yielding_to_foreground():
+    running, peak = [], []
+    lock = threading.Lock()
+    busy = threading.Event()
+    busy.set()
+
+    def slow_refresh():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.pop()
+        return False
+
+    scheduler = ReindexScheduler(max_concurrency=2, busy=busy.is_set, idle_wait=0.02)
+    for n in range(6):
+        scheduler.add_source(f"url:{n}", slow_refresh, due_in=0)
+    scheduler.start()
+    try:
+        # Foreground load holds everything back
+        time.sleep(0.2)
+        assert scheduler.get_stats()["refreshed"] == 0
+        assert scheduler.get_stats()["deferred"] > 0
+
+        busy.clear()
+        deadline = time.time() + 5
+        while scheduler.get_stats()["refreshed"] < 6 and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        scheduler.stop()
+
+    assert scheduler.get_stats()["refreshed"] == 6
+    assert max(peak) == 2
+
+def test_replace_document_reindexes_passages():
+    store = VectorStoreManager(chunk_words=5)
+    doc_id = store.add_document("The emissions rule requires annual reporting for all facilities.", {"title": "Rule"})
+    store.add_document("Unrelated guidance on accessibility.", {"title": "ADA"})
+
+    store.replace_document(doc_id, "The emissions rule now requires quarterly reporting.")
+
+    assert store.retrieve_passages("annual") == []
+    passages = store.retrieve_passages("quarterly reporting")
+    assert passages[0]["doc_id"] == doc_id
+    assert all(chunk[0] != doc_id or chunk_id in store.index.doc_chunks[doc_id]
+               for chunk_id, chunk in store.index.chunks.items())
+
+class _Page(BaseHTTPRequestHandler):
+    body = b"<html><title>EPA rules</title><body>Annual reporting applies.</body></html>"
+    etag = '"v1"'
+    requests = []
+
+    def do_GET(self):
+        _Page.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == _Page.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", _Page.etag)
+        self.send_header("Content-Length", str(len(_Page.body)))
+        self.end_headers()
+        self.wfile.write(_Page.body)
+
+    def log_message(self, *args):
+        pass
+
+def test_refresh_url_uses_conditional_requests():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Page)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/rules"
+
+    try:
+        store = VectorStoreManager()
+        assert store.index_url(url)["status"] == "indexed"
+
+        assert store.refresh_url(url) is False
+        assert _Page.requests[-1] == '"v1"'
+
+        _Page.body = _Page.body.replace(b"Annual", b"Quarterly")
+        _Page.etag = '"v2"'
+        assert store.refresh_url(url) is True
+        assert "Quarterly" in store.retrieve_passages("quarterly reporting")[0]["text"]
+        assert store.get_document_stats()["total_documents"] == 1
+    finally:
+        server.shutdown()
+
+def test_scheduler_state_in_system_stats():
+    agent = PolicyNavigatorAgent(load_data=False)
+    agent.vector_store.indexed_urls.add("https://www.epa.gov/laws-regulations")
+
+    agent.reindex_scheduler.run_pending()
+    stats = agent.get_system_stats()["reindex"]
+    assert stats["sources"] == 2
+    assert {entry["source"] for entry in stats["next_due"]} == {
+        "federal_register:recent", "url:https://www.epa.gov/laws-regulations"
+    }
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the persistent, deadline-ordered compliance reminder index
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+from src.tools.external_integrations import CalendarIntegration
+from src.tools.reminders import ReminderIndex, parse_deadline
+
+def test_parse_deadlines():
+    now = datetime(2025, 3, 10, 9, 0)
+    assert parse_deadline("2025-12-31", now) == (datetime(2025, 12, 31), None)
+    assert parse_deadline("12/31/2025", now) == (datetime(2025, 12, 31), None)
+    assert parse_deadline("December 31, 2025", now) == (datetime(2025, 12, 31), None)
+    assert parse_deadline("Quarterly filings starting 2025-01-15", now) == (datetime(2025, 1, 15), "quarterly")
+    assert parse_deadline("Annual review required", now) == (datetime(2026, 3, 10, 9, 0), "annual")
+    assert parse_deadline("Quarterly assessments", now) == (datetime(2025, 6, 10, 9, 0), "quarterly")
+    assert parse_deadline("TBD", now) == (None, None)
+
+def test_upcoming_is_a_range_query_with_lazy_recurrence():
+    calendar = CalendarIntegration()
+    today = datetime.now().replace(microsecond=0)
+    soon = (today + timedelta(days=5)).strftime("%Y-%m-%d")
+    later = (today + timedelta(days=40)).strftime("%Y-%m-%d")
+    started = (today - timedelta(days=400)).strftime("%Y-%m-%d")
+
+    calendar.schedule_compliance_reminder("ADA audit", later)
+    calendar.schedule_compliance_reminder("GDPR report", soon)
+    calendar.schedule_compliance_reminder("Old filing", "2020-01-01")
+    calendar.schedule_compliance_reminder("SOX controls", f"Monthly attestations starting {started}")
+    assert calendar.schedule_compliance_reminder("Unknown", "TBD")["success"] is False
+
+    upcoming = calendar.get_upcoming_reminders(days=30)
+    assert "GDPR report" in [r["policy"] for r in upcoming]
+    assert "ADA audit" not in [r["policy"] for r in upcoming] and "Old filing" not in [r["policy"] for r in upcoming]
+    assert [r["due"] for r in upcoming] == sorted(r["due"] for r in upcoming)
+    assert 1 <= sum(r["policy"] == "SOX controls" for r in upcoming) <= 2
+
+    # A year ahead: the monthly series expands to twelve occurrences
+    year = calendar.get_reminders_between(today, today + timedelta(days=365))
+    monthly = [r["due"] for r in year if r["policy"] == "SOX controls"]
+    assert len(monthly) == 12 and len(set(monthly)) == 12
+    assert len(calendar.index) == 4
+
+def test_reminders_survive_restart(tmp_path):
+    path = str(tmp_path / "reminders.db")
+    calendar = CalendarIntegration(path)
+    first = calendar.schedule_compliance_reminder("EO 14067", "Quarterly assessments")["reminder_id"]
+    second = calendar.schedule_compliance_reminder("Clean Air Act", (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d"))
+    assert calendar.cancel_reminder(second["reminder_id"])
+
+    restarted = CalendarIntegration(path)
+    reminders = restarted.get_reminders_between(datetime.now(), datetime.now() + timedelta(days=100))
+    assert [(r["id"], r["recurrence"]) for r in reminders] == [(first, "quarterly")]
+    assert restarted.schedule_compliance_reminder("ADA", "2030-01-01")["reminder_id"] == first + 2
+
+def test_range_query_matches_scan_at_scale():
+    rng = random.Random(7)
+    now = datetime.now()
+    index = ReminderIndex()
+    dues = {n: now + timedelta(hours=rng.uniform(-24 * 365, 24 * 365)) for n in range(50000)}
+    index.add_many([(n, due, None) for n, due in dues.items()])
+
+    start = time.perf_counter()
+    for _ in range(200):
+        found = index.between(now, now + timedelta(days=7))
+    per_query = (time.perf_counter() - start) / 200
+
+    expected = sorted((due, n) for n, due in dues.items() if now <= due <= now + timedelta(days=7))
+    assert [n for _, n in found] == [n for _, n in expected]
+    assert per_query < 0.01
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test local retrieval-augmented context assembly for agent queries
+"""
+
+from src.agents.context_builder import ContextBuilder
+from src.agents.local_agent import LocalAgentFactory
+from src.agents.policy_agent import PolicyNavigatorAgent
+from src.data_processing.vector_store import VectorStoreManager
+
+GDPR_TEXT = ("The General Data Protection Regulation (GDPR) governs data protection in the EU. "
+             "Small businesses with fewer than 250 employees have simplified record keeping duties.")
+
+def make_store():
+    store = VectorStoreManager(chunk_words=40)
+    store.add_document(GDPR_TEXT, {"title": "GDPR", "source": "sample_dataset"})
+    store.add_document(GDPR_TEXT, {"title": "GDPR copy", "source": "upload"})
+    store.add_document("Executive Order 14067 sets policy on digital assets and crypto markets.",
+                       {"title": "EO 14067", "url": "https://www.federalregister.gov/eo-14067"})
+    store.add_document("Clean Air Act permits for small businesses are handled by state agencies. " * 30,
+                       {"title": "Clean Air Act", "source": "url"})
+    return store
+
+def test_passages_ranked_and_deduplicated():
+    """Duplicate passages are dropped and the relevant one is cited first"""
+    context = ContextBuilder(make_store()).build("GDPR duties for small businesses")
+
+    titles = [citation["title"] for citation in context["citations"]]
+    assert titles[0] in ("GDPR", "GDPR copy")
+    assert not {"GDPR", "GDPR copy"} <= set(titles)
+    assert "Question: GDPR duties for small businesses" in context["prompt"]
+    assert "[1]" in context["prompt"]
+
+def test_token_budget_respected():
+    """Packed context never exceeds the configured token budget"""
+    context = ContextBuilder(make_store(), token_budget=80).build("small businesses permits")
+    assert context["context_tokens"] <= 80
+
+    assert ContextBuilder(make_store()).build("maritime salvage law") is None
+
+def test_agent_query_sends_grounded_prompt():
+    """PolicyNavigatorAgent.query grounds the question and returns citations"""
+    prompts = []
+    factory = LocalAgentFactory(responder=lambda prompt: prompts.append(prompt) or "EO 14067 is active [1]")
+
+    agent = PolicyNavigatorAgent(load_data=False, agent_factory=factory)
+    agent.answer_cache = None
+    agent.vector_store = make_store()
+    agent.context_builder.vector_store = agent.vector_store
+    agent.agent = factory.create(name="test", description="test")
+
+    result = agent.query("Is Executive Order 14067 in effect?")
+    assert "digital assets" in prompts[0]
+    assert result["citations"][0]["source"] == "https://www.federalregister.gov/eo-14067"
+
+if __name__ == "__main__":
+    test_passages_ranked_and_deduplicated()
+    test_token_budget_respected()
+    test_agent_query_sends_grounded_prompt()
+    print("✅ Retrieval context tests passed")
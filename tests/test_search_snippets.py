@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test highlighted search snippets from the positional index and cursor pagination
+"""
+
+import pytest
+from src.data_processing.snippets import best_window
+from src.data_processing.vector_store import VectorStoreManager
+
+FILLER = "The agency reviewed public comments and published guidance for regulated entities. "
+
+def test_best_window_prefers_all_terms_close_together():
+    matches = [(3, "emissions"), (50, "emissions"), (52, "reporting"), (54, "quarterly"), (90, "reporting")]
+    assert best_window(matches, 10) == (50, 54)
+    assert best_window([(7, "only")], 10) == (7, 7)
+
+def test_hit_returns_best_window_with_highlights():
+    store = VectorStoreManager(snippet_words=20)
+    content = FILLER * 30 + "Facilities must file quarterly emissions reporting with the EPA. " + FILLER * 30
+    doc_id = store.add_document(content, {"title": "Clean Air Rule"})
+
+    result = store.search_documents("quarterly emissions reporting")[0]
+    assert result["doc_id"] == doc_id
+    assert "file quarterly emissions reporting" in result["content"]
+    assert len(result["content"]) < 200 and result["document_length"] == len(content)
+    assert content[result["offset"]:result["offset"] + len(result["content"])] == result["content"]
+
+    highlighted = [result["content"][start:end].lower() for start, end in result["highlights"]]
+    assert highlighted == ["quarterly", "emissions", "reporting"]
+
+def test_cursor_pages_are_stable_and_complete():
+    store = VectorStoreManager()
+    for n in range(23):
+        store.add_document(f"Rule {n}: " + "digital asset reporting " * (1 + n % 4) + FILLER, {"n": n})
+
+    everything = [result["doc_id"] for result in store.search_page("digital asset", limit=100)["results"]]
+    assert len(everything) == 23
+
+    seen, cursor = [], None
+    while True:
+        page = store.search_page("digital asset", limit=5, cursor=cursor)
+        seen.extend(result["doc_id"] for result in page["results"])
+        if len(seen) == 10:
+            # New matching documents arriving mid-pagination never repeat earlier results
+            store.add_document("digital asset digital asset digital asset", {"n": "late"})
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert seen[:10] == everything[:10]
+    assert set(everything) <= set(seen)
+
+    with pytest.raises(ValueError):
+        store.search_page("something else", cursor=store.search_page("digital asset", limit=1)["next_cursor"])
+    with pytest.raises(ValueError):
+        store.search_page("digital asset", cursor="not-a-cursor")
+
+def test_search_endpoint_pages(monkeypatch):
+    import api_server
+    from src.agents.policy_agent import PolicyNavigatorAgent
+
+    agent = PolicyNavigatorAgent(load_data=False)
+    monkeypatch.setattr(api_server, "agent", agent)
+    for n in range(4):
+        agent.vector_store.add_document(f"Executive Order 1406{n} covers digital assets. " + FILLER * 20, {"n": n})
+    client = api_server.app.test_client()
+
+    first = client.post("/api/search-indexed", json={"query": "digital assets", "limit": 3}).get_json()
+    assert len(first["results"]) == 3 and first["next_cursor"]
+    assert all(len(result["content"]) < 400 for result in first["results"])
+
+    second = client.post("/api/search-indexed", json={"query": "digital assets", "limit": 3,
+                                                       "cursor": first["next_cursor"]}).get_json()
+    assert len(second["results"]) == 1 and second["next_cursor"] is None
+
+    response = client.post("/api/search-indexed", json={"query": "digital assets", "cursor": "bogus"})
+    assert response.status_code == 400
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test coalescing of identical concurrent requests
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    """Callers with the same key wait for and share one result"""
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"status": "active"}
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda _: flight.do("eo 14067", slow), range(10)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.get_stats() == {"executed": 1, "coalesced": 9, "in_flight": 0}
+
+    # Nothing is cached once the call has finished
+    flight.do("eo 14067", slow)
+    assert len(calls) == 2
+
+def test_errors_reach_every_waiter():
+    """An exception from the shared call is raised to all callers"""
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    def call():
+        try:
+            flight.do("key", failing)
+        except RuntimeError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(call)
+        started.wait()
+        followers = [pool.submit(call) for _ in range(2)]
+        errors = [leader.result()] + [f.result() for f in followers]
+
+    assert errors == ["upstream down"] * 3
+
+def test_status_endpoint_coalesces(monkeypatch):
+    """Concurrent /api/status calls for one policy (any spelling) hit upstream once"""
+    import api_server
+
+    calls = []
+
+    def check_policy_status(policy_id):
+        calls.append(policy_id)
+        time.sleep(0.2)
+        return {"policy_id": policy_id, "federal_status": {"status": "active"}}
+
+    monkeypatch.setattr(api_server.agent, "check_policy_status", check_policy_status)
+    client = api_server.app.test_client()
+    spellings = ["EO-14067", "EO 14067", "E.O. 14067", "eo 14067"] * 3
+
+    with ThreadPoolExecutor(max_workers=len(spellings)) as pool:
+        responses = list(pool.map(lambda policy_id: client.post('/api/status', json={"policy_id": policy_id}), spellings))
+
+    assert all(response.status_code == 200 for response in responses)
+    assert len(calls) == 1
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test the Slack outbox against a local webhook stand-in
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.tools.external_integrations import ExternalToolManager, SlackIntegration
+from src.tools.slack_outbox import SlackOutbox
+
+class _Webhook(BaseHTTPRequestHandler):
+    messages = []
+    responses = []  # (status, headers) to return before accepting
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status, headers = _Webhook.responses.pop(0) if _Webhook.responses else (200, {})
+        _Webhook.messages.append((time.time(), status, body))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+def start_webhook(responses=()):
+    _Webhook.messages = []
+    _Webhook.responses = list(responses)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Webhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/hook"
+
+def alert(n):
+    return {"title": f"Rule {n}", "status": "amended", "source": "Federal Register"}
+
+def test_burst_is_delivered_as_one_digest(tmp_path):
+    server, url = start_webhook()
+    outbox = SlackOutbox(SlackIntegration(url), path=str(tmp_path / "outbox.db"), batch_window=0.3)
+    try:
+        start = time.time()
+        results = [outbox.enqueue(alert(n)) for n in range(5)]
+        assert time.time() - start < 0.3  # enqueueing never waits on the webhook
+        assert all(result["queued"] for result in results)
+
+        assert outbox.flush(timeout=5)
+        assert len(_Webhook.messages) == 1
+        digest = _Webhook.messages[0][2]
+        assert "5 alerts" in digest["text"]
+        assert sum("Rule" in json.dumps(block) for block in digest["blocks"]) == 5
+
+        outbox.enqueue(alert(9))
+        assert outbox.flush(timeout=5)
+        assert _Webhook.messages[-1][2] == SlackIntegration.build_message(alert(9))
+        assert outbox.get_stats()["delivered"] == 6
+    finally:
+        outbox.close()
+        server.shutdown()
+
+def test_rate_limit_honors_retry_after(tmp_path):
+    server, url = start_webhook(responses=[(429, {"Retry-After": "1"})])
+    outbox = SlackOutbox(SlackIntegration(url), path=str(tmp_path / "outbox.db"), batch_window=0)
+    try:
+        outbox.enqueue(alert(1))
+        assert outbox.flush(timeout=5)
+
+        (limited_at, status, _), (delivered_at, retry_status, body) = _Webhook.messages
+        assert (status, retry_status) == (429, 200)
+        assert delivered_at - limited_at >= 1
+        assert body == SlackIntegration.build_message(alert(1))
+        assert outbox.get_stats()["rate_limited"] == 1
+    finally:
+        outbox.close()
+        server.shutdown()
+
+def test_undelivered_alerts_survive_restart(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    server, url = start_webhook(responses=[(503, {})] * 3)
+    outbox = SlackOutbox(SlackIntegration(url), path=path, batch_window=0.2, base_backoff=30)
+    outbox.enqueue(alert(1))
+    outbox.enqueue(alert(2))
+    assert not outbox.flush(timeout=0.8)
+    outbox.close()
+    assert [status for _, status, _ in _Webhook.messages] == [503]
+
+    # A new process picks up the pending alerts and delivers them
+    outbox = SlackOutbox(SlackIntegration(url), path=path, base_backoff=30)
+    try:
+        _Webhook.responses = []
+        with outbox._lock:
+            outbox._db.execute("UPDATE outbox SET next_attempt = 0")
+            outbox._db.commit()
+        assert outbox.resume() == 2
+        assert outbox.flush(timeout=5)
+        assert "2 alerts" in _Webhook.messages[-1][2]["text"]
+    finally:
+        outbox.close()
+        server.shutdown()
+
+def test_rejected_alerts_become_dead_letters(tmp_path):
+    server, url = start_webhook(responses=[(400, {})])
+    outbox = SlackOutbox(SlackIntegration(url), path=str(tmp_path / "outbox.db"), batch_window=0)
+    try:
+        outbox.enqueue(alert(1))
+        assert outbox.flush(timeout=5)
+        stats = outbox.get_stats()
+        assert stats["dead_letters"] == 1 and stats["delivered"] == 0
+    finally:
+        outbox.close()
+        server.shutdown()
+
+def test_policy_update_returns_once_queued(tmp_path, monkeypatch):
+    monkeypatch.delenv("SLACK_WEBHOOK_URL", raising=False)
+    tools = ExternalToolManager({"slack_outbox": {"enabled": True, "path": str(tmp_path / "outbox.db")}})
+    assert tools.handle_policy_update(alert(1))["slack"] is False
+
+    server, url = start_webhook()
+    tools.slack.webhook_url = url
+    try:
+        result = tools.handle_policy_update(alert(1))
+        assert result["slack"]["queued"] is True
+        assert tools.slack_outbox.flush(timeout=5)
+        assert len(_Webhook.messages) == 1
+    finally:
+        tools.slack_outbox.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test that PolicyNavigatorAgent loads initial datasets in the background
+"""
+
+import threading
+import time
+from src.agents.policy_agent import PolicyNavigatorAgent
+from src.data_processing.dataset_loader import DatasetLoader
+
+def test_construction_does_not_wait_for_network(monkeypatch):
+    """The agent is usable while slow website loads are still running"""
+    release = threading.Event()
+
+    def slow_websites(self, urls=None):
+        release.wait(5)
+        return {"dataset": "government_websites", "errors": [], "status": "loaded"}
+
+    monkeypatch.setattr(DatasetLoader, "load_government_websites", slow_websites)
+
+    started = time.time()
+    agent = PolicyNavigatorAgent()
+    assert time.time() - started < 1.0
+    assert not agent.is_ready()
+    assert agent.warmup_status["state"] == "loading"
+
+    # Local work does not depend on warm-up
+    assert agent.analyze_compliance("tech", "small_business")["requirements"]
+
+    import api_server
+    monkeypatch.setattr(api_server, "agent", agent)
+    client = api_server.app.test_client()
+
+    health = client.get('/api/health').get_json()
+    assert health["live"] is True and health["ready"] is False
+    assert client.get('/api/health?check=ready').status_code == 503
+
+    release.set()
+    assert agent.wait_until_ready(5)
+    assert agent.warmup_status["state"] == "ready"
+    assert client.get('/api/health?check=ready').status_code == 200
+
+def test_components_created_lazily():
+    """Tool components are only built when first used"""
+    agent = PolicyNavigatorAgent(load_data=False)
+    assert agent.is_ready()
+    assert "external_tools" not in agent._components
+    assert agent.external_tools is agent.external_tools
+    assert agent.start_warmup() and not agent.start_warmup()
+
+def test_cli_commands_ground_on_local_data(monkeypatch, tmp_path):
+    """CLI agent commands index local datasets synchronously but skip the website crawl"""
+    from click.testing import CliRunner
+    from src.interfaces.cli import cli
+
+    documents = tmp_path / "documents.jsonl"
+    documents.write_text('{"content": "The Maritime Salvage Act sets salvage awards.", '
+                         '"metadata": {"title": "Maritime Salvage Act"}}\n')
+    config = PolicyNavigatorAgent(load_data=False).config
+    monkeypatch.setitem(config['vector_store'], 'documents_path', str(documents))
+
+    def no_websites(self, urls=None):
+        raise AssertionError("the CLI must not crawl websites")
+
+    def answer(self, query):
+        titles = [result["metadata"]["title"] for result in self.search_indexed_content(query, 3, mode="lexical")]
+        return {"output": "; ".join(titles)}
+
+    monkeypatch.setattr(DatasetLoader, "load_government_websites", no_websites)
+    monkeypatch.setattr(PolicyNavigatorAgent, "query", answer)
+    monkeypatch.setenv("AIXPLAIN_API_KEY", "test")
+
+    result = CliRunner().invoke(cli, ["search", "-q", "salvage awards"])
+    assert result.exit_code == 0
+    assert "Maritime Salvage Act" in result.output
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])